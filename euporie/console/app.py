@@ -33,6 +33,7 @@ from euporie.core.layout.mouse import DisableMouseOnScroll
 from euporie.core.widgets.dialog import (
     AboutDialog,
     ConfirmDialog,
+    MsgBoxDialog,
     NoKernelsDialog,
     SaveAsDialog,
     SelectKernelDialog,
@@ -112,6 +113,7 @@ class ConsoleApp(BaseApp):
         self.dialogs["change-kernel"] = SelectKernelDialog(self)
         self.dialogs["shortcuts"] = ShortcutsDialog(self)
         self.dialogs["confirm"] = ConfirmDialog(self)
+        self.dialogs["msgbox"] = MsgBoxDialog(self)
 
         self.tabs = [Console(self)]
 
@@ -355,6 +355,11 @@ class BaseApp(ConfigurableApp, Application, ABC):
         # We delay this until we have terminal responses to allow terminal graphics
         # support to be detected first
         self.layout = Layout(self.load_container(), self.focused_element)
+        # Start kernels in the background so they are ready when first needed
+        if self.config.kernel_pool:
+            from euporie.core.kernel.jupyter_manager import KernelPool
+
+            KernelPool.prefill(self.config.kernel_pool, self.config.kernel_name)
         # Open any files we need to
         self.open_files()
         # Start polling terminal style if configured
@@ -565,8 +570,9 @@ class BaseApp(ConfigurableApp, Application, ABC):
         exception: BaseException | type[BaseException] | None = None,
         style: str = "",
     ) -> None:
-        """Shut down any remaining LSP clients at exit."""
+        """Shut down any remaining LSP clients and pooled kernels at exit."""
         self.shutdown_lsps()
+        self.shutdown_kernel_pool()
         if exception is not None:
             super().exit(exception=exception, style=style)
         elif result is not None:
@@ -581,6 +587,7 @@ class BaseApp(ConfigurableApp, Application, ABC):
         if self.is_running:
             self.exit()
         self.shutdown_lsps()
+        self.shutdown_kernel_pool()
         # Reset terminal state
         output.reset_cursor_key_mode()
         output.enable_autowrap()
@@ -677,8 +684,18 @@ class BaseApp(ConfigurableApp, Application, ABC):
             except Exception:
                 log.exception("Error shutting down LSP client %s", lsp)
 
+    def shutdown_kernel_pool(self) -> None:
+        """Shut down any pre-started kernels which are waiting to be used."""
+        # The kernel pool only exists if its module has been imported
+        if module := sys.modules.get("euporie.core.kernel.jupyter_manager"):
+            module.KernelPool.close_all()
+
     def open_file(
-        self, path: Path, read_only: bool = False, tab_class: type[Tab] | None = None
+        self,
+        path: Path,
+        read_only: bool = False,
+        tab_class: type[Tab] | None = None,
+        focus: bool = True,
     ) -> None:
         """Create a tab for a file.
 
@@ -686,6 +703,7 @@ class BaseApp(ConfigurableApp, Application, ABC):
             path: The file path of the notebook file to open
             read_only: If true, the file should be opened read_only
             tab_class: The tab type to use to open the file
+            focus: If true, the tab is focused once it is opened
 
         """
         from euporie.core.path import parse_path
@@ -697,7 +715,8 @@ class BaseApp(ConfigurableApp, Application, ABC):
                 tab_class is None or isinstance(tab, tab_class)
             ):
                 log.info("File %s already open, activating", path)
-                self.layout.focus(tab)
+                if focus:
+                    self.layout.focus(tab)
                 break
         else:
             if tab_class is None:
@@ -707,10 +726,11 @@ class BaseApp(ConfigurableApp, Application, ABC):
             else:
                 tab = tab_class(self, ppath)
                 self.add_tab(tab)
-                # Ensure the opened tab is focused at app start
-                self.focused_element = tab
-                # Ensure the newly opened tab is selected
-                self.tab_idx = len(self.tabs) - 1
+                if focus:
+                    # Ensure the opened tab is focused at app start
+                    self.focused_element = tab
+                    # Ensure the newly opened tab is selected
+                    self.tab_idx = len(self.tabs) - 1
                 # Save 20 most recent files, deduplicating while keeping order
                 if ppath.exists():
                     self.config.recent_files = list(
@@ -718,9 +738,44 @@ class BaseApp(ConfigurableApp, Application, ABC):
                     )[:20]
 
     def open_files(self) -> None:
-        """Open the files defined in the configuration."""
-        for file in self.config.files:
-            self.open_file(file)
+        """Open the files defined in the configuration.
+
+        The type of tab needed for each file is determined in background threads, as
+        this may require files to be read. The first file's tab is opened and focused
+        as soon as it is ready, and the remaining tabs are added in order from the
+        event loop as they become ready. Tabs load their files in the background.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait
+
+        if not (files := list(self.config.files)):
+            return
+        executor = ThreadPoolExecutor(max_workers=min(len(files), 8))
+        pending = [(file, executor.submit(self.get_file_tab, file)) for file in files]
+        executor.shutdown(wait=False)
+        focus = True
+
+        def _open_ready() -> None:
+            nonlocal focus
+            while pending and pending[0][1].done():
+                file, future = pending.pop(0)
+                try:
+                    tab_class = future.result()
+                except Exception:
+                    log.exception("Unable to open file %s", file)
+                    continue
+                self.open_file(file, tab_class=tab_class, focus=focus)
+                focus = False
+            self.invalidate()
+
+        # Wait for the first file only, so it can be displayed immediately
+        wait([pending[0][1]])
+        _open_ready()
+        if (loop := self.loop) is None:
+            wait([future for _, future in pending])
+            _open_ready()
+            return
+        for _, future in pending:
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(_open_ready))
 
     @property
     def tab(self) -> Tab | None:
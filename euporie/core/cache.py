@@ -1,8 +1,11 @@
-"""Updated version of the prompt_toolkit caches."""
+"""Updated version of the prompt_toolkit caches, and on-disk cache helpers."""
 
 from __future__ import annotations
 
+import logging
 import threading
+from functools import cache
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from prompt_toolkit.cache import _T, _U
@@ -14,8 +17,15 @@ if TYPE_CHECKING:
 
 __all__ = [
     "SimpleCache",
+    "cache_dir",
+    "prune_cache_dir",
 ]
 
+log = logging.getLogger(__name__)
+
+# Cache directories which have been pruned during this session
+_PRUNED: set[Path] = set()
+
 
 class SimpleCache(PtkSimpleCache[_T, _U]):
     """Thread safe version of :py:`SimpleCache`."""
@@ -34,3 +44,55 @@ class SimpleCache(PtkSimpleCache[_T, _U]):
         """Clear cache."""
         with self._lock:
             super().clear()
+
+
+@cache
+def _cache_root() -> Path:
+    """Return euporie's user cache directory."""
+    from platformdirs import user_cache_dir
+
+    from euporie.core import __app_name__
+
+    return Path(user_cache_dir(__app_name__, appauthor=None))
+
+
+def cache_dir(name: str, max_size: int | None = None) -> Path:
+    """Return the directory in which a kind of data is cached on disk.
+
+    Args:
+        name: The name of the cache
+        max_size: If given, the least recently used files in the directory are
+            deleted in the background the first time it is used in a session, until
+            their total size is below this many bytes
+
+    Returns:
+        The path to the cache directory, which might not exist yet
+
+    """
+    path = _cache_root() / name
+    if max_size is not None and path not in _PRUNED:
+        _PRUNED.add(path)
+        threading.Thread(
+            target=prune_cache_dir, args=(path, max_size), daemon=True
+        ).start()
+    return path
+
+
+def prune_cache_dir(path: Path, max_size: int) -> None:
+    """Delete the least recently used files in a directory above a total size.
+
+    Files are ordered by their modification time, so cached files should be touched
+    when they are used.
+    """
+    try:
+        stats = [(child, child.stat()) for child in path.iterdir()]
+    except OSError:
+        return
+    total = 0
+    for child, stat in sorted(stats, key=lambda x: x[1].st_mtime, reverse=True):
+        total += stat.st_size
+        if total > max_size:
+            try:
+                child.unlink()
+            except OSError:
+                log.debug("Could not remove cached file '%s'", child)
@@ -0,0 +1,24 @@
+"""Defines format conversion settings."""
+
+from euporie.core.config import add_setting
+
+# euporie.core.convert.formats.ft
+
+add_setting(
+    name="html_worker",
+    group="euporie.core.convert.formats.ft",
+    flags=["--html-worker"],
+    type_=bool,
+    help_="Render HTML outputs in a separate process",
+    default=False,
+    schema={"type": "boolean"},
+    description="""
+        Whether HTML (and markdown) outputs should be laid out in a separate worker
+        process.
+
+        Rendering HTML is CPU intensive, and when it is performed in the same process
+        as the user interface, laying out large outputs can cause the interface to
+        become unresponsive. HTML containing images or LaTeX maths is always rendered
+        in the main process.
+    """,
+)
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import inspect
 import io
+import json
 import logging
 from hashlib import md5
 from itertools import pairwise
@@ -156,6 +157,8 @@ class Datum(Generic[T], metaclass=_MetaDatum):
             hash_data = data.encode()
         elif isinstance(data, list):
             hash_data = hash(tuple(data)).to_bytes(8)
+        elif isinstance(data, dict):
+            hash_data = json.dumps(data, sort_keys=True, default=str).encode()
         elif isinstance(data, bytes):
             hash_data = data
         else:
@@ -250,7 +253,6 @@ class Datum(Generic[T], metaclass=_MetaDatum):
                                 output = await converter.func(
                                     datum, cols, rows, fg, bg, **kwargs
                                 )
-                                self._conversions[key_stage] = output
                             except Exception:
                                 log.debug(
                                     "Conversion step %s failed",
@@ -258,7 +260,9 @@ class Datum(Generic[T], metaclass=_MetaDatum):
                                     exc_info=True,
                                 )
                                 continue
-                            else:
+                            # Converters return `None` for data they do not handle
+                            if output is not None:
+                                self._conversions[key_stage] = output
                                 break
                         else:
                             log.warning("An error occurred during format conversion")
@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from functools import partial
+from contextlib import suppress
+from functools import cached_property, partial
+from hashlib import md5
 from typing import TYPE_CHECKING
 
 from prompt_toolkit.cache import SimpleCache
 from prompt_toolkit.formatted_text import to_formatted_text
+from prompt_toolkit.formatted_text.utils import split_lines
 
+from euporie.core import __version__
+from euporie.core.app.current import get_app
+from euporie.core.cache import cache_dir
 from euporie.core.convert.registry import register
 from euporie.core.ft.ansi import ANSI
 from euporie.core.ft.utils import strip_one_trailing_newline
 from euporie.core.lexers import detect_lexer
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+    from pathlib import Path
     from typing import Any
 
     from prompt_toolkit.formatted_text.base import StyleAndTextTuples
@@ -38,15 +48,34 @@ async def html_to_ft(
     fg: str | None = None,
     bg: str | None = None,
     extend: bool = True,
+    virtual_rows: bool = False,
     **kwargs: Any,
 ) -> StyleAndTextTuples:
     """Convert HTML to formatted text."""
-    from euporie.core.ft.html import HTML
+    from euporie.core.ft.html import _VIRTUAL_TABLE_ROWS, HTML
 
     data = datum.data
     markup = data.decode() if isinstance(data, bytes) else data
+    # Rows of virtualized tables are rendered on demand, which requires a local DOM
+    virtual_rows = virtual_rows and markup.count("<tr") > _VIRTUAL_TABLE_ROWS
+
+    if not virtual_rows and get_app().config.html_worker:
+        from euporie.core.convert.worker import HTMLWorker
+
+        ft = await HTMLWorker.get().render(
+            datum.hash,
+            markup,
+            base=str(datum.path) if datum.path else None,
+            cols=cols,
+            rows=rows,
+            fill=extend,
+            initial_format=datum.root.format,
+        )
+        if ft is not None:
+            return ft
+
     html = _html_cache.get(
-        (datum.hash, *kwargs.items()),
+        (datum.hash, virtual_rows, *kwargs.items()),
         partial(
             HTML,
             markup,
@@ -54,12 +83,277 @@ async def html_to_ft(
             base=datum.path,
             collapse_root_margin=True,
             fill=extend,
+            virtual_rows=virtual_rows,
             _initial_format=datum.root.format,
         ),
     )
     return await html._render(cols, rows)
 
 
+# The maximum total size of markdown renderings cached on disk, in bytes
+_MARKDOWN_CACHE_SIZE = 32 * 1024 * 1024
+# The time a markdown block must keep its size before it is cached on disk, in seconds
+_MARKDOWN_SAVE_DELAY = 1.0
+
+
+class _MarkdownBlock:
+    """A top-level block of a markdown document, and its most recent rendering.
+
+    Renderings are also cached on disk, so markdown which has not changed does not
+    need to be laid out again when it is next loaded.
+    """
+
+    def __init__(
+        self, key: Hashable, get_html: Callable[[], str], base: Path | None, fill: bool
+    ) -> None:
+        """Create a new markdown block.
+
+        Args:
+            key: A JSON serializable key which identifies the block's HTML
+            get_html: A function which converts the block to HTML
+            base: The base URL of the markdown document
+            fill: Whether remaining space in block elements should be filled
+        """
+        self.key = key
+        self.get_html = get_html
+        self.base = base
+        self.fill = fill
+        self.size: tuple[Any, ...] | None = None
+        self.lines: list[StyleAndTextTuples] = []
+        self.margin_top = self.margin_bottom = 0
+        self._save_task: asyncio.Task[None] | None = None
+        # Blocks are shared between documents, which may render them at other sizes
+        self._lock = asyncio.Lock()
+
+    @cached_property
+    def html(self) -> HTML:
+        """Parse the HTML of the block.
+
+        The block is placed between two empty elements, so its margins are laid out
+        as they would be for a block in the middle of a document.
+        """
+        from euporie.core.ft.html import HTML
+
+        return HTML(
+            f"<div></div>{self.get_html().strip()}<div></div>",
+            base=self.base,
+            collapse_root_margin=True,
+            fill=self.fill,
+            _initial_format="markdown",
+        )
+
+    def cache_path(self, size: tuple[Any, ...]) -> Path:
+        """Return the path at which a rendering of the block is cached on disk."""
+        key = json.dumps(
+            [
+                __version__,
+                self.key,
+                str(self.base),
+                self.fill,
+                size,
+                get_app().config.wrap_cell_outputs,
+            ]
+        )
+        return (
+            cache_dir("markdown", _MARKDOWN_CACHE_SIZE)
+            / md5(key.encode(), usedforsecurity=False).hexdigest()
+        )
+
+    def load(self, size: tuple[Any, ...]) -> bool:
+        """Load a rendering of the block from the disk cache."""
+        path = self.cache_path(size)
+        try:
+            cached = json.loads(path.read_text())
+            self.lines = [
+                [(style, text) for style, text in line] for line in cached["lines"]
+            ]
+            self.margin_top, self.margin_bottom = cached["margin"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        # Mark the file as recently used, so it is kept when the cache is pruned
+        with suppress(OSError):
+            path.touch()
+        return True
+
+    def save(
+        self,
+        size: tuple[Any, ...],
+        lines: list[StyleAndTextTuples],
+        margin: tuple[int, int],
+    ) -> None:
+        """Save a rendering of the block to the disk cache."""
+        path = self.cache_path(size)
+        try:
+            path.parent.mkdir(exist_ok=True, parents=True)
+            path.write_text(
+                json.dumps(
+                    {
+                        "lines": [
+                            [(style, text) for style, text, *_ in line]
+                            for line in lines
+                        ],
+                        "margin": margin,
+                    }
+                )
+            )
+        except (OSError, TypeError, ValueError):
+            log.debug("Could not write markdown cache to '%s'", path)
+
+    async def save_later(self, size: tuple[Any, ...]) -> None:
+        """Save the block's rendering if it is not re-rendered at another size soon."""
+        lines, margin = self.lines, (self.margin_top, self.margin_bottom)
+        await asyncio.sleep(_MARKDOWN_SAVE_DELAY)
+        await asyncio.to_thread(self.save, size, lines, margin)
+
+    async def render(
+        self, cols: int | None, rows: int | None, fg: str | None, bg: str | None
+    ) -> tuple[list[StyleAndTextTuples], int, int]:
+        """Render the block at a given size, if it has not already been rendered.
+
+        Returns:
+            The lines of the rendering, and the block's top and bottom margins
+
+        """
+        async with self._lock:
+            if self.size != (size := (cols, rows, fg, bg)):
+                # Only save renderings at the final size when blocks are being resized
+                if self._save_task is not None:
+                    self._save_task.cancel()
+                    self._save_task = None
+                if not self.load(size):
+                    html = self.html
+                    self.lines = list(split_lines(await html._render(cols, rows)))
+                    elements = html.soup.child_element_list
+                    self.margin_top = elements[1].theme.margin.top
+                    self.margin_bottom = elements[-2].theme.margin.bottom
+                    # Graphics are displayed using data held in memory, so are not
+                    # cached
+                    if not html.graphic_data:
+                        self._save_task = asyncio.create_task(self.save_later(size))
+            self.size = size
+            return self.lines, self.margin_top, self.margin_bottom
+
+
+_markdown_blocks: SimpleCache[tuple[Hashable, Path | None, bool], _MarkdownBlock] = (
+    SimpleCache(maxsize=1000)
+)
+
+
+@register(
+    from_="markdown",
+    to="ft",
+    weight=0,
+)
+async def markdown_to_ft(
+    datum: Datum,
+    cols: int | None = None,
+    rows: int | None = None,
+    fg: str | None = None,
+    bg: str | None = None,
+    extend: bool = True,
+    **kwargs: Any,
+) -> StyleAndTextTuples:
+    """Convert markdown to formatted text, re-using the layout of unchanged blocks.
+
+    Each top-level block of the document is laid out separately and cached, so when
+    markdown is edited, only the blocks which have changed need to be re-rendered.
+    """
+    from euporie.core.convert.datum import Datum
+    from euporie.core.convert.formats.html import markdown_blocks
+
+    # Lay out the whole document via HTML so it can be rendered in the worker process
+    if get_app().config.html_worker:
+        html_datum = Datum(
+            await datum.convert_async("html"),
+            format="html",
+            path=datum.path,
+            source=datum,
+        )
+        return await html_datum.convert_async(
+            "ft", cols, rows, fg, bg, extend=extend, **kwargs
+        )
+
+    data = datum.data
+    markup = data.decode() if isinstance(data, bytes) else data
+    blocks = [
+        await _markdown_blocks.get(
+            (key, datum.path, extend),
+            partial(_MarkdownBlock, key, get_html, datum.path, extend),
+        ).render(cols, rows, fg, bg)
+        for key, get_html in markdown_blocks(markup)
+    ]
+
+    ft: StyleAndTextTuples = []
+    prev_margin = None
+    for i, (lines, margin_top, margin_bottom) in enumerate(blocks):
+        # Margins of adjacent blocks collapse, and the outer margins of the first
+        # and last blocks collapse into the document's root element
+        start = margin_top if prev_margin is None else min(margin_top, prev_margin)
+        end = len(lines)
+        if i == len(blocks) - 1:
+            end -= margin_bottom
+        for line in lines[start:end]:
+            ft.extend(line)
+            ft.append(("", "\n"))
+        prev_margin = margin_bottom
+    if ft:
+        ft.pop()
+    return ft
+
+
+def _dataframe_width(cols: int | None, wrap_lines: bool) -> int | None:
+    """Return the maximum width of a DataFrame table, as the HTML engine would."""
+    return cols if wrap_lines else None
+
+
+@register(
+    from_="html",
+    to="ft",
+    weight=0,
+)
+async def dataframe_html_to_ft(
+    datum: Datum,
+    cols: int | None = None,
+    rows: int | None = None,
+    fg: str | None = None,
+    bg: str | None = None,
+    wrap_lines: bool = True,
+    **kwargs: Any,
+) -> StyleAndTextTuples | None:
+    """Convert HTML DataFrame representations directly to formatted text tables.
+
+    Other HTML is rejected, so is converted by :py:func:`html_to_ft` instead.
+    """
+    from euporie.core.ft.dataframe import parse_html, render_table_data
+
+    data = datum.data
+    markup = data.decode() if isinstance(data, bytes) else data
+    if "dataframe" not in markup or (table_data := parse_html(markup)) is None:
+        return None
+    return render_table_data(table_data, _dataframe_width(cols, wrap_lines))
+
+
+@register(
+    from_="dataresource",
+    to="ft",
+)
+async def dataresource_to_ft(
+    datum: Datum,
+    cols: int | None = None,
+    rows: int | None = None,
+    fg: str | None = None,
+    bg: str | None = None,
+    wrap_lines: bool = True,
+    **kwargs: Any,
+) -> StyleAndTextTuples:
+    """Convert tabular data-resource JSON to a formatted text table."""
+    from euporie.core.ft.dataframe import parse_data_resource, render_table_data
+
+    return render_table_data(
+        parse_data_resource(datum.data), _dataframe_width(cols, wrap_lines)
+    )
+
+
 _WHITELISTED_LEXERS = {
     "python",
     "markdown",
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import logging
-from functools import cache
+from functools import cache, partial
 from typing import TYPE_CHECKING
 
 from euporie.core.app.current import get_app
@@ -11,6 +11,7 @@ from euporie.core.convert.registry import register
 from euporie.core.lexers import detect_lexer
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
     from typing import Any
 
     from markdown_it import MarkdownIt
@@ -45,11 +46,7 @@ def markdown_parser() -> MarkdownIt:
                     HtmlFormatter(
                         nowrap=True,
                         noclasses=True,
-                        style=(
-                            app.syntax_theme
-                            if hasattr((app := get_app()), "syntax_theme")
-                            else "default"
-                        ),
+                        style=_syntax_theme(),
                     ),
                 )
             }
@@ -63,6 +60,58 @@ def markdown_parser() -> MarkdownIt:
     )
 
 
+def _syntax_theme() -> str:
+    """Return the name of the syntax theme used to highlight code blocks."""
+    return (
+        app.syntax_theme if hasattr((app := get_app()), "syntax_theme") else "default"
+    )
+
+
+def markdown_blocks(markup: str) -> list[tuple[Hashable, Callable[[], str]]]:
+    """Split markdown into the document's top-level blocks.
+
+    Args:
+        markup: The markdown text to split
+
+    Returns:
+        A list of top-level blocks (paragraphs, lists, code fences, tables, etc.).
+        Each is given as a key, which identifies the block's HTML, together with a
+        function which converts the block to HTML.
+
+    """
+    parser = markdown_parser()
+    env: dict[str, Any] = {}
+    tokens = parser.parse(markup, env)
+    # Blocks' HTML depends on their source, the document's link reference
+    # definitions, and the syntax theme used to highlight code
+    context = (repr(env.get("references")), _syntax_theme())
+
+    # Raw HTML blocks may contain elements which are closed by later blocks
+    if any(token.type == "html_block" for token in tokens):
+        return [
+            (
+                (markup, *context),
+                partial(parser.renderer.render, tokens, parser.options, env),
+            )
+        ]
+
+    lines = markup.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    blocks: list[tuple[Hashable, Callable[[], str]]] = []
+    start = 0
+    for i, token in enumerate(tokens):
+        if token.level == 0 and token.nesting <= 0:
+            block_tokens = tokens[start : i + 1]
+            source = "\n".join(lines[slice(*block_tokens[0].map or (0, 0))])
+            blocks.append(
+                (
+                    (source, *context),
+                    partial(parser.renderer.render, block_tokens, parser.options, env),
+                )
+            )
+            start = i + 1
+    return blocks
+
+
 @register(from_="markdown", to="html")
 async def markdown_to_html_markdown_it(
     datum: Datum,
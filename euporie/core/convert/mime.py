@@ -25,6 +25,7 @@ MIME_FORMATS = {
     "image/gif": "gif",
     "application/pdf": "pdf",
     "text/html": "html",
+    "application/vnd.dataresource+json": "dataresource",
     "text/latex": "latex",
     "application/x-latex": "latex",
     "text/markdown": "markdown",
@@ -0,0 +1,216 @@
+"""Lay out HTML in a separate worker process.
+
+Rendering HTML is pure Python and CPU intensive. When performed on the conversion
+thread it competes with the user interface for the GIL, so HTML is instead sent to a
+worker process, which keeps a cache of parsed DOMs so outputs can be re-rendered
+quickly at new sizes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import TYPE_CHECKING
+
+from prompt_toolkit.cache import FastDictCache, SimpleCache
+
+from euporie.core.app.current import get_app
+
+if TYPE_CHECKING:
+    from typing import Any, ClassVar
+
+    from prompt_toolkit.formatted_text.base import StyleAndTextTuples
+
+    from euporie.core.ft.html import HTML
+
+log = logging.getLogger(__name__)
+
+# Settings which affect how HTML is rendered
+_SETTINGS = ("wrap_cell_outputs",)
+# Matches markup which might contain graphics (images or LaTeX maths), which are
+# displayed using data held in the main process, so are rendered there
+_GRAPHICS_RE = re.compile(r"<(?:img|svg)\b|\$|\\[(\[]|\bmath\b", re.IGNORECASE)
+
+
+class HTMLWorker:
+    """Render HTML to formatted text in a separate process."""
+
+    _instance: ClassVar[HTMLWorker | None] = None
+
+    def __init__(self, settings: dict[str, Any]) -> None:
+        """Start a new HTML rendering worker process.
+
+        Args:
+            settings: Configuration values to apply in the worker process
+        """
+        self.settings = settings
+        self.executor = ProcessPoolExecutor(
+            max_workers=1,
+            # Forking would copy the threads of the running application
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(settings,),
+        )
+        # Hashes of data which must be rendered in the main process
+        self.local: FastDictCache[tuple[str], bool] = FastDictCache(
+            get_value=lambda data_hash: True, size=1_000
+        )
+
+    @classmethod
+    def get(cls) -> HTMLWorker:
+        """Return the HTML worker, restarting it if relevant settings have changed."""
+        config = get_app().config
+        settings = {name: getattr(config, name) for name in _SETTINGS}
+        if (worker := cls._instance) is None or worker.settings != settings:
+            if worker is not None:
+                worker.close()
+            worker = cls._instance = cls(settings)
+        return worker
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self._instance is self:
+            type(self)._instance = None
+
+    async def render(
+        self,
+        data_hash: str,
+        markup: str,
+        base: str | None = None,
+        cols: int | None = None,
+        rows: int | None = None,
+        fill: bool = True,
+        initial_format: str = "",
+    ) -> StyleAndTextTuples | None:
+        """Render HTML to formatted text in the worker process.
+
+        Args:
+            data_hash: A hash of the data being rendered, used to cache its DOM
+            markup: The HTML to render
+            base: The base URL of the HTML document
+            cols: The width at which to render the HTML
+            rows: The height at which to render the HTML
+            fill: Whether remaining space in block elements should be filled
+            initial_format: The initial format of the data being rendered
+
+        Returns:
+            The rendered formatted text, or :py:const:`None` if the HTML must be
+            rendered in the main process (for example, if it contains graphics)
+
+        """
+        if (data_hash,) in self.local:
+            return None
+        if _GRAPHICS_RE.search(markup):
+            # Looking up the hash adds it to the cache
+            self.local[data_hash,]
+            return None
+        # The size of terminal cells and the terminal's colors are not known by the
+        # worker process, so are sent with each request
+        app = get_app()
+        palette = app.color_palette
+        try:
+            ft = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                partial(
+                    _render,
+                    data_hash,
+                    markup,
+                    base,
+                    cols,
+                    rows,
+                    fill,
+                    initial_format,
+                    app.cell_size_px,
+                    (palette.fg.base_hex, palette.bg.base_hex),
+                ),
+            )
+        except BrokenProcessPool:
+            log.exception("The HTML rendering worker process stopped unexpectedly")
+            self.close()
+            return None
+        if ft is None:
+            # Looking up the hash adds it to the cache
+            self.local[data_hash,]
+        return ft
+
+
+@atexit.register
+def _close_worker() -> None:
+    """Stop the HTML rendering worker process when the application exits."""
+    if (worker := HTMLWorker._instance) is not None:
+        worker.close()
+
+
+# Code run in the worker process
+
+_DOM_CACHE: SimpleCache[tuple[Any, ...], HTML] = SimpleCache(maxsize=20)
+
+
+def _init_worker(settings: dict[str, Any]) -> None:
+    """Set up a dummy application in the worker process with the given settings."""
+    from prompt_toolkit.application.current import get_app_session
+
+    from euporie.core.app.dummy import DummyApp
+
+    # Settings are applied as configuration defaults, as setting configuration values
+    # would save them to the user's configuration file. The size of terminal cells
+    # is set by the main process for each request
+    app_cls = type(
+        "HTMLWorkerApp",
+        (DummyApp,),
+        {
+            "_config_defaults": {**DummyApp._config_defaults, **settings},
+            "cell_size_px": (10, 20),
+        },
+    )
+    get_app_session().app = app_cls()
+
+
+def _render(
+    data_hash: str,
+    markup: str,
+    base: str | None,
+    cols: int | None,
+    rows: int | None,
+    fill: bool,
+    initial_format: str,
+    cell_size_px: tuple[int, int],
+    colors: tuple[str, str],
+) -> StyleAndTextTuples | None:
+    """Render HTML in the worker process."""
+    from prompt_toolkit.application.current import get_app_session
+
+    from euporie.core.async_utils import get_or_create_loop, run_coro_sync
+    from euporie.core.ft.html import HTML
+
+    # Match the main process's terminal, so dimensions and colors are the same
+    app = get_app_session().app
+    app.cell_size_px = cell_size_px  # type: ignore [misc]
+    fg, bg = colors
+    app.color_palette.add_color("fg", fg, "default")
+    app.color_palette.add_color("bg", bg, "default")
+
+    html = _DOM_CACHE.get(
+        (data_hash, base, fill, initial_format, cell_size_px, colors),
+        partial(
+            HTML,
+            markup,
+            width=cols,
+            base=base,
+            collapse_root_margin=True,
+            fill=fill,
+            _initial_format=initial_format,
+        ),
+    )
+    ft = run_coro_sync(html._render(cols, rows), get_or_create_loop("convert"))
+    # Graphics are displayed using data held by the main process
+    if html.graphic_data:
+        return None
+    return [(style, text) for style, text, *_ in ft]
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import subprocess
 from abc import ABCMeta, abstractmethod
+from hashlib import md5
 from typing import TYPE_CHECKING
 
+from euporie.core.async_utils import get_or_create_loop, run_coro_async, run_coro_sync
 from euporie.core.filters import command_exists
 from euporie.core.lsp import range_to_slice
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Sequence
     from pathlib import Path
 
     from euporie.core.lsp import LspClient
@@ -18,6 +23,10 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+_FORMAT_CACHE: dict[tuple[Hashable, str, str], str] = {}
+_FORMAT_CACHE_SIZE = 10_000
+_FORMAT_SEMAPHORE: asyncio.Semaphore | None = None
+
 
 class Formatter(metaclass=ABCMeta):
     """Text formatter class which reformats text."""
@@ -26,6 +35,14 @@ class Formatter(metaclass=ABCMeta):
         """Initialize a new formatter."""
         self.languages = languages or set()
 
+    @property
+    def cache_key(self) -> Hashable | None:
+        """A key identifying this formatter's configuration for result caching.
+
+        Formatters which do not return a cache key do not have their results cached.
+        """
+        return None
+
     def _format(self, text: str, language: str) -> str:
         """Check the language matches, then format the input."""
         log.debug("Formatting using %s", self)
@@ -33,11 +50,41 @@ class Formatter(metaclass=ABCMeta):
             return self.format(text)
         return text
 
+    async def _format_async(self, text: str, language: str) -> str:
+        """Format the input asynchronously, re-using cached results if available."""
+        if self.languages and language not in self.languages:
+            return text
+        if (formatter_key := self.cache_key) is None:
+            return await self.format_async(text)
+
+        key = (
+            formatter_key,
+            language,
+            md5(text.encode(), usedforsecurity=False).digest(),
+        )
+        if (result := _FORMAT_CACHE.get(key)) is None:
+            log.debug("Formatting using %s", self)
+            result = _FORMAT_CACHE[key] = await self.format_async(text)
+            # Formatting formatted code should not change it, so we cache the result
+            # against itself to avoid re-formatting code which was just formatted
+            _FORMAT_CACHE[
+                formatter_key,
+                language,
+                md5(result.encode(), usedforsecurity=False).digest(),
+            ] = result
+            while len(_FORMAT_CACHE) > _FORMAT_CACHE_SIZE:
+                del _FORMAT_CACHE[next(iter(_FORMAT_CACHE))]
+        return result
+
     @abstractmethod
     def format(self, text: str) -> str:
         """Format the string."""
         return text
 
+    async def format_async(self, text: str) -> str:
+        """Format the string without blocking the event loop."""
+        return await asyncio.to_thread(self.format, text)
+
 
 class CliFormatter(Formatter):
     """Format using an external command."""
@@ -48,12 +95,23 @@ class CliFormatter(Formatter):
         self.filter = command_exists(command[0])
         super().__init__(languages=languages)
 
+    @property
+    def cache_key(self) -> Hashable | None:
+        """Cache results by the formatter command."""
+        return tuple(self.command)
+
     def _format(self, text: str, language: str) -> str:
         """Check the filter value early."""
         if self.filter():
             return super()._format(text, language)
         return text
 
+    async def _format_async(self, text: str, language: str) -> str:
+        """Check the filter value early."""
+        if self.filter():
+            return await super()._format_async(text, language)
+        return text
+
     def format(self, text: str) -> str:
         """Pass the text to the command over stdin and return the output."""
         try:
@@ -76,6 +134,23 @@ class CliFormatter(Formatter):
             else:
                 return text
 
+    async def format_async(self, text: str) -> str:
+        """Pass the text to the command over stdin without blocking the event loop."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+            output, _ = await proc.communicate(text.encode())
+        except Exception:
+            return text
+        if output and proc.returncode == 0:
+            return output.decode().rstrip("\r\n")
+        else:
+            return text
+
     def __repr__(self) -> str:
         """Return representation of the formatter as a string."""
         return f"{self.command[0].title()}Formatter()"
@@ -125,3 +200,90 @@ class LspFormatter(Formatter):
     def __repr__(self) -> str:
         """Return representation of the formatter as a string."""
         return f"{self.lsp.name.title()}Formatter()"
+
+
+async def format_text_async(
+    text: str, language: str, formatters: Sequence[Formatter]
+) -> str:
+    """Apply a sequence of formatters to some text.
+
+    Args:
+        text: The text to format
+        language: The language of the text
+        formatters: The formatters to apply, in order
+
+    Returns:
+        The formatted text
+    """
+    global _FORMAT_SEMAPHORE
+
+    if _FORMAT_SEMAPHORE is None:
+        # Limit the number of concurrently running formatter processes
+        _FORMAT_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 4)
+    async with _FORMAT_SEMAPHORE:
+        for formatter in formatters:
+            text = await formatter._format_async(text, language)
+    return text
+
+
+def format_text(text: str, language: str, formatters: Sequence[Formatter]) -> str:
+    """Apply a sequence of formatters to some text, blocking until complete."""
+    return run_coro_sync(
+        format_text_async(text, language, formatters),
+        loop=get_or_create_loop("format"),
+    )
+
+
+async def format_texts_async(
+    inputs: Sequence[tuple[str, str]], formatters: Sequence[Formatter]
+) -> list[str]:
+    """Format multiple texts concurrently.
+
+    Args:
+        inputs: A sequence of (text, language) pairs to format
+        formatters: The formatters to apply to each text, in order
+
+    Returns:
+        The list of formatted texts
+    """
+    return list(
+        await asyncio.gather(
+            *(
+                format_text_async(text, language, formatters)
+                for text, language in inputs
+            )
+        )
+    )
+
+
+def format_texts(
+    inputs: Sequence[tuple[str, str]],
+    formatters: Sequence[Formatter],
+    callback: Callable[[list[str]], None] | None = None,
+    wait: bool = False,
+) -> list[str] | None:
+    """Format multiple texts concurrently in the background.
+
+    Formatting is run in a dedicated event loop, so external formatter commands are
+    run concurrently without blocking the user interface. Results are cached, so
+    unchanged texts are not re-formatted.
+
+    Args:
+        inputs: A sequence of (text, language) pairs to format
+        formatters: The formatters to apply to each text, in order
+        callback: A function to call with the list of formatted texts when complete.
+            If not waiting, this is called in the formatting event loop's thread
+        wait: If :py:const:`True`, block until formatting is complete
+
+    Returns:
+        The list of formatted texts if waiting, otherwise :py:const:`None`
+    """
+    coro = format_texts_async(inputs, formatters)
+    loop = get_or_create_loop("format")
+    if wait:
+        results = run_coro_sync(coro, loop=loop)
+        if callable(callback):
+            callback(results)
+        return results
+    run_coro_async(coro, loop=loop, callback=callback)
+    return None
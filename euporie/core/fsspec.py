@@ -2,23 +2,40 @@
 
 from __future__ import annotations
 
+import json
 import logging
+from contextlib import suppress
+from hashlib import md5
 from typing import TYPE_CHECKING
 
+import aiohttp
 from aiohttp.client_reqrep import ClientResponse
 from fsspec.implementations.http import HTTPFileSystem as FsHTTPFileSystem
-from fsspec.implementations.http import get_client
+
+from euporie.core.cache import cache_dir
 
 if TYPE_CHECKING:
     import asyncio
     from collections.abc import Callable
     from typing import Any
 
-    import aiohttp
-
 
 log = logging.getLogger(__name__)
 
+# The maximum number of simultaneous connections to a single host
+_LIMIT_PER_HOST = 6
+# The default timeouts for HTTP requests, in seconds
+_TIMEOUT = aiohttp.ClientTimeout(total=30, sock_connect=10)
+# The maximum total size of HTTP responses cached on disk, in bytes
+_HTTP_CACHE_SIZE = 128 * 1024 * 1024
+
+
+async def get_client(**kwargs: Any) -> aiohttp.ClientSession:
+    """Create a HTTP client session with per-host connection limits and timeouts."""
+    kwargs.setdefault("connector", aiohttp.TCPConnector(limit_per_host=_LIMIT_PER_HOST))
+    kwargs.setdefault("timeout", _TIMEOUT)
+    return aiohttp.ClientSession(**kwargs)
+
 
 class NoRaiseClientResponse(ClientResponse):
     """An ``aiohttp`` client response which does not raise on >=400 status responses."""
@@ -30,7 +47,12 @@ class NoRaiseClientResponse(ClientResponse):
 
 
 class HTTPFileSystem(FsHTTPFileSystem):
-    """A HTTP filesystem implementation which does not raise on errors."""
+    """A HTTP filesystem implementation which does not raise on errors.
+
+    A single connection-pooled client session is shared by each filesystem instance.
+    Whole-file responses with an ``ETag`` or ``Last-Modified`` header are cached on
+    disk, and are re-validated with a conditional request when next loaded.
+    """
 
     def __init__(
         self,
@@ -70,3 +92,70 @@ class HTTPFileSystem(FsHTTPFileSystem):
     def _raise_not_found_for_status(self, response: ClientResponse, url: str) -> None:
         """Do not raise an exception for 404 errors."""
         response.raise_for_status()
+
+    async def _cat_file(
+        self,
+        url: str,
+        start: int | None = None,
+        end: int | None = None,
+        **kwargs: Any,
+    ) -> bytes:
+        """Load a file, using a cached copy if it has not been modified."""
+        # Do not cache partial file requests
+        if start is not None or end is not None:
+            return await super()._cat_file(url, start, end, **kwargs)
+
+        kw = {**self.kwargs, **kwargs}
+        headers = dict(kw.pop("headers", None) or {})
+
+        # Load cached response metadata and add conditional request headers
+        key = md5(url.encode(), usedforsecurity=False).hexdigest()
+        data_path = cache_dir("http", _HTTP_CACHE_SIZE) / key
+        meta_path = data_path.with_suffix(".json")
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get("url") == url:
+            if etag := meta.get("etag"):
+                headers["If-None-Match"] = etag
+            if last_modified := meta.get("last_modified"):
+                headers["If-Modified-Since"] = last_modified
+
+        session = await self.set_session()
+        async with session.get(self.encode_url(url), headers=headers, **kw) as r:
+            if r.status == 304 and meta.get("url") == url:
+                try:
+                    out = data_path.read_bytes()
+                except OSError:
+                    # The cached data has gone away, so fetch the file again
+                    meta_path.unlink(missing_ok=True)
+                    return await self._cat_file(url, **kwargs)
+                # Mark the files as recently used, so they are kept when pruning
+                with suppress(OSError):
+                    data_path.touch()
+                    meta_path.touch()
+                return out
+            out = await r.read()
+            self._raise_not_found_for_status(r, url)
+
+            # Cache the response if it can be re-validated later
+            etag = r.headers.get("ETag")
+            last_modified = r.headers.get("Last-Modified")
+            if (
+                r.status == 200
+                and (etag or last_modified)
+                and "no-store" not in r.headers.get("Cache-Control", "")
+            ):
+                try:
+                    data_path.parent.mkdir(exist_ok=True, parents=True)
+                    data_path.write_bytes(out)
+                    meta_path.write_text(
+                        json.dumps(
+                            {"url": url, "etag": etag, "last_modified": last_modified}
+                        )
+                    )
+                except OSError:
+                    log.debug("Could not cache response for %s", url)
+
+        return out
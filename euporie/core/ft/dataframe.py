@@ -0,0 +1,399 @@
+"""Render tabular data from :py:mod:`pandas` directly as formatted text tables.
+
+Rendering DataFrames using the HTML engine requires CSS to be matched against every
+cell of the table. The HTML which :py:mod:`pandas` generates for DataFrames has a
+fixed structure, so it can instead be parsed with a few regular expressions and
+drawn directly as a :py:class:`~euporie.core.ft.table.Table`, styled as the HTML
+engine would style it.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from html import unescape
+from typing import TYPE_CHECKING, NamedTuple
+
+from prompt_toolkit.formatted_text.base import to_formatted_text
+from prompt_toolkit.formatted_text.utils import fragment_list_to_text, split_lines
+from prompt_toolkit.layout.dimension import Dimension
+
+from euporie.core.border import NoLine
+from euporie.core.data_structures import DiInt
+from euporie.core.ft.table import Table
+from euporie.core.ft.utils import (
+    FormattedTextAlign,
+    join_lines,
+    max_line_width,
+    truncate,
+    wrap,
+)
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from prompt_toolkit.formatted_text.base import StyleAndTextTuples
+
+log = logging.getLogger(__name__)
+
+_HTML_RE = re.compile(
+    r"\s*(?:<div>\s*)?(?:<style scoped>(?P<style>[^<]*)</style>\s*)?"
+    r'<table[^>]*\bclass="dataframe\b[^"]*"[^>]*>\s*'
+    r"(?:<thead>(?P<head>.*?)</thead>\s*)?<tbody>(?P<body>.*?)</tbody>\s*</table>\s*"
+    r"(?:<p>(?P<caption>[^<]*)</p>\s*)?(?:</div>\s*)?",
+    re.DOTALL,
+)
+_STYLE_SELECTOR_RE = re.compile(r"([^{}]*)\{[^{}]*\}")
+_ROW_RE = re.compile(r"\s*<tr[^>]*>((?:\s*<t[hd][^>]*>[^<]*</t[hd]>)*)\s*</tr>\s*")
+_CELL_RE = re.compile(r"<(t[hd])([^>]*)>([^<]*)</t[hd]>")
+_ATTR_RE = re.compile(r'(\w+)="(\d+)"')
+
+# Values which pandas uses to represent missing or truncated data
+_MISSING = frozenset({"", "NaN", "nan", "NaT", "<NA>", "None", "...", "…"})
+_NUMERIC_TYPES = frozenset({"integer", "number"})
+# The number of rows to draw in each table
+_CHUNK_ROWS = 100
+
+
+class DataCell(NamedTuple):
+    """A cell of tabular data."""
+
+    text: str
+    header: bool = False
+    colspan: int = 1
+    rowspan: int = 1
+
+
+class TableData(NamedTuple):
+    """Tabular data to be drawn as a table."""
+
+    head: list[list[DataCell]]
+    body: list[list[DataCell]]
+    numeric: list[bool]
+    caption: str = ""
+
+
+def _is_number(value: str) -> bool:
+    """Determine if a string formatted by :py:mod:`pandas` represents a number."""
+    try:
+        float(value.replace(",", ""))
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_rows(markup: str) -> list[list[DataCell]]:
+    """Parse the cells from a sequence of HTML table rows."""
+    rows = []
+    pos = 0
+    end = len(markup.rstrip())
+    while pos < end:
+        if (match := _ROW_RE.match(markup, pos)) is None:
+            raise ValueError("Table row could not be parsed")
+        pos = match.end()
+        row = []
+        for tag, attrs, text in _CELL_RE.findall(match[1]):
+            spans = dict(_ATTR_RE.findall(attrs)) if attrs else {}
+            row.append(
+                DataCell(
+                    text=unescape(text) if "&" in text else text,
+                    header=tag == "th",
+                    colspan=int(spans.get("colspan", 1)),
+                    rowspan=int(spans.get("rowspan", 1)),
+                )
+            )
+        rows.append(row)
+    return rows
+
+
+def parse_html(markup: str) -> TableData | None:
+    """Parse a HTML DataFrame representation generated by :py:mod:`pandas`.
+
+    Args:
+        markup: The HTML to parse
+
+    Returns:
+        The parsed tabular data, or :py:const:`None` if the HTML is not a plain
+        DataFrame representation (for example, if it contains additional markup or
+        custom styles)
+
+    """
+    if (match := _HTML_RE.fullmatch(markup)) is None:
+        return None
+    # Only accept the scoped styles pandas adds to DataFrame representations
+    if (style := match["style"]) and not all(
+        selector.strip().startswith(".dataframe")
+        for selector in _STYLE_SELECTOR_RE.findall(style)
+    ):
+        return None
+    try:
+        head = _parse_rows(match["head"] or "")
+        body = _parse_rows(match["body"])
+    except ValueError:
+        return None
+
+    # Data cells are always the last cells in a row, as only index cells span rows
+    numeric: list[bool] = []
+    for row in body:
+        values = [cell.text for cell in row if not cell.header]
+        if len(values) > len(numeric):
+            numeric.extend([True] * (len(values) - len(numeric)))
+        for i, value in enumerate(values):
+            if numeric[i] and value not in _MISSING and not _is_number(value):
+                numeric[i] = False
+
+    return TableData(head, body, numeric, unescape(match["caption"] or ""))
+
+
+def parse_data_resource(data: dict[str, Any]) -> TableData:
+    """Parse tabular data in the frictionless data-resource format.
+
+    Args:
+        data: The ``application/vnd.dataresource+json`` data to parse
+
+    Returns:
+        The parsed tabular data
+
+    """
+    schema = data["schema"]
+    fields = [field["name"] for field in schema["fields"]]
+    index = set(schema.get("primaryKey", ()))
+    # Show index columns first, as pandas does
+    fields = [
+        *(name for name in fields if name in index),
+        *(name for name in fields if name not in index),
+    ]
+    types = {field["name"]: field.get("type") for field in schema["fields"]}
+
+    def _format(value: Any) -> str:
+        if value is None:
+            return "NaN"
+        if isinstance(value, float):
+            return f"{value:g}"
+        return str(value)
+
+    head = [
+        [DataCell("" if name == "index" else str(name), header=True) for name in fields]
+    ]
+    body = [
+        [DataCell(_format(record.get(name)), header=name in index) for name in fields]
+        for record in data["data"]
+    ]
+    numeric = [types[name] in _NUMERIC_TYPES for name in fields if name not in index]
+    return TableData(head, body, numeric)
+
+
+def _text_width(text: str) -> int:
+    """Calculate the display width of a cell's text."""
+    if text.isascii() and "\n" not in text:
+        return len(text)
+    return max_line_width(to_formatted_text(text))
+
+
+def _cell_formats(
+    row: list[DataCell], numeric: list[bool], odd: bool
+) -> list[tuple[str, FormattedTextAlign, DiInt]]:
+    """Calculate the style, alignment and padding of each cell in a row.
+
+    These match the styles the HTML engine applies to DataFrames.
+    """
+    formats = []
+    last = len(row) - 1
+    head = all(cell.header for cell in row)
+    td_style = "class:dataframe,row-odd,td" if odd else "class:dataframe,td"
+    j = 0
+    for i, cell in enumerate(row):
+        padding = DiInt(0, 1 if (i == 0 and cell.header) or i == last else 0, 0, 1)
+        if cell.header:
+            align = FormattedTextAlign.RIGHT if head else FormattedTextAlign.LEFT
+            formats.append(("class:dataframe,th bold", align, padding))
+        else:
+            align = (
+                FormattedTextAlign.RIGHT
+                if j < len(numeric) and numeric[j]
+                else FormattedTextAlign.LEFT
+            )
+            formats.append((td_style, align, padding))
+            j += 1
+    return formats
+
+
+def _column_widths(rows: list[list[DataCell]]) -> list[int]:
+    """Calculate the width of the widest single-column cell in each column.
+
+    Cell padding is included in the widths.
+    """
+    widths: list[int] = []
+    # The number of rows for which each column is occupied by a cell spanning rows
+    spanned: list[int] = []
+    for row in rows:
+        x = 0
+        last = len(row) - 1
+        for i, cell in enumerate(row):
+            while x < len(spanned) and spanned[x]:
+                x += 1
+            if (end := x + cell.colspan) > len(widths):
+                widths.extend([0] * (end - len(widths)))
+                spanned.extend([0] * (end - len(spanned)))
+            if cell.rowspan > 1:
+                for j in range(x, end):
+                    spanned[j] = cell.rowspan
+            if cell.colspan == 1:
+                padding = 2 if (i == 0 and cell.header) or i == last else 1
+                widths[x] = max(widths[x], _text_width(cell.text) + padding)
+            x = end
+        spanned = [max(0, n - 1) for n in spanned]
+    return widths
+
+
+def _draw_row(
+    row: list[DataCell],
+    formats: list[tuple[str, FormattedTextAlign, DiInt]],
+    col_widths: list[int],
+) -> list[StyleAndTextTuples] | None:
+    """Draw a row of tabular data as lines of formatted text.
+
+    Text which does not fit in its column is wrapped, as it would be by
+    :py:class:`~euporie.core.ft.table.Table`.
+
+    Returns:
+        The drawn lines, or :py:const:`None` if the row has cells which span multiple
+        rows or columns
+
+    """
+    if len(row) != len(col_widths):
+        return None
+    cells: list[tuple[list[str], str, FormattedTextAlign, DiInt, int]] = []
+    for cell, (style, align, padding), col_width in zip(row, formats, col_widths):
+        if cell.colspan != 1 or cell.rowspan != 1:
+            return None
+        text = cell.text
+        inner_width = max(0, col_width - padding.left - padding.right)
+        if "\n" not in text and _text_width(text) <= inner_width:
+            texts = [text]
+        elif text.isascii() and not any(c.isspace() for c in text):
+            # Single words which are too long are truncated
+            texts = [text[:inner_width]]
+        else:
+            texts = [
+                fragment_list_to_text(truncate(line, inner_width, placeholder=""))
+                for line in split_lines(wrap([("", text)], inner_width, placeholder=""))
+            ]
+        cells.append((texts, style, align, padding, inner_width))
+
+    lines: list[StyleAndTextTuples] = [
+        [] for _ in range(max((len(texts) for texts, *_ in cells), default=1))
+    ]
+    for texts, style, align, padding, inner_width in cells:
+        pad_style = f"class:dataframe {style} nounderline"
+        text_style = f"class:dataframe {style}"
+        for i, line in enumerate(lines):
+            text = texts[i] if i < len(texts) else ""
+            gap = inner_width - _text_width(text)
+            if align == FormattedTextAlign.RIGHT:
+                before = gap
+            elif align == FormattedTextAlign.CENTER:
+                before = gap // 2
+            else:
+                before = 0
+            line.extend(
+                [
+                    (pad_style, " " * (padding.left + before)),
+                    (text_style, text),
+                    (pad_style, " " * (gap - before + padding.right)),
+                ]
+            )
+    return lines
+
+
+def _add_row(
+    table: Table,
+    row: list[DataCell],
+    formats: list[tuple[str, FormattedTextAlign, DiInt]],
+    col_widths: list[int],
+) -> None:
+    """Add a row of tabular data to a table, fixing the widths of its cells."""
+    table_row = table.new_row()
+    for cell_data, (style, align, padding) in zip(row, formats):
+        cell = table_row.new_cell(
+            text=cell_data.text,
+            colspan=cell_data.colspan,
+            rowspan=cell_data.rowspan,
+            align=align,
+            style=f"{style} nounderline",
+            padding=padding,
+            border_line=NoLine,
+            border_visibility=False,
+        )
+        # Fix the widths of cells so tables drawn separately line up
+        if cell_data.colspan == 1:
+            cell.width = max(
+                0, col_widths[cell._col_index or 0] - padding.left - padding.right
+            )
+
+
+def render_table_data(data: TableData, width: int | None = None) -> StyleAndTextTuples:
+    """Draw tabular data as formatted text.
+
+    The table is styled to match DataFrames rendered by the HTML engine. Numeric
+    columns are right-aligned.
+
+    Column widths are calculated once from the text of every cell. Rows are then
+    drawn directly, except for rows containing cells which span multiple rows or
+    columns, which are drawn in groups using :py:class:`~euporie.core.ft.table.Table`.
+
+    Args:
+        data: The tabular data to draw
+        width: The maximum width of the table, or :py:const:`None` for no limit
+
+    Returns:
+        The formatted text table
+
+    """
+    rows = [*data.head, *data.body]
+    table_width = Dimension(max=width) if width else Dimension()
+
+    # Fit the widest cell in each column into the available width
+    measure = Table(width=table_width, padding=DiInt(0, 0, 0, 0))
+    measure_row = measure.new_row()
+    for col_width in _column_widths(rows):
+        measure_row.new_cell(
+            width=col_width, border_line=NoLine, border_visibility=False
+        )
+    col_widths = measure.calculate_col_widths()
+
+    lines: list[StyleAndTextTuples] = []
+    group: list[tuple[list[DataCell], list]] = []
+
+    def _draw_group() -> None:
+        if group:
+            table = Table(
+                width=table_width, style="class:dataframe", padding=DiInt(0, 0, 0, 0)
+            )
+            for row, formats in group:
+                _add_row(table, row, formats, col_widths)
+            lines.extend(split_lines(table.render()))
+            group.clear()
+
+    n_head = len(data.head)
+    # The number of following rows into which cells in previous rows extend
+    spanned = 0
+    for n, row in enumerate(rows):
+        formats = _cell_formats(row, data.numeric, (n - n_head) % 2 == 0)
+        if (
+            not spanned
+            and (row_lines := _draw_row(row, formats, col_widths)) is not None
+        ):
+            _draw_group()
+            lines.extend(row_lines)
+        else:
+            group.append((row, formats))
+        spanned = max(spanned - 1, *(cell.rowspan - 1 for cell in row), 0)
+        if not spanned and len(group) >= _CHUNK_ROWS:
+            _draw_group()
+    _draw_group()
+
+    ft = join_lines(lines)
+    if data.caption:
+        ft = [*ft, ("", "\n\n"), ("", data.caption)]
+    return ft
@@ -10,13 +10,15 @@ from bisect import bisect_right
 from collections.abc import Mapping
 from functools import cached_property, lru_cache, partial
 from html.parser import HTMLParser
-from itertools import zip_longest
+from itertools import count, zip_longest
 from math import ceil
 from operator import eq, ge, gt, le, lt
+from sys import intern
 from typing import TYPE_CHECKING, NamedTuple, cast, overload
 
 from fsspec.core import url_to_fs
 from prompt_toolkit.application.current import get_app_session
+from prompt_toolkit.cache import SimpleCache
 from prompt_toolkit.data_structures import Size
 from prompt_toolkit.filters.base import Condition
 from prompt_toolkit.filters.utils import _always as always
@@ -25,11 +27,11 @@ from prompt_toolkit.filters.utils import to_filter
 from prompt_toolkit.formatted_text.utils import split_lines
 from prompt_toolkit.layout.containers import WindowAlign
 from prompt_toolkit.layout.dimension import Dimension
-from prompt_toolkit.utils import Event
+from prompt_toolkit.utils import Event, get_cwidth
 from upath import UPath
 
 from euporie.core.app.current import get_app
-from euporie.core.async_utils import get_or_create_loop, run_coro_sync
+from euporie.core.async_utils import get_or_create_loop, run_coro_async, run_coro_sync
 from euporie.core.border import (
     DiLineStyle,
     DoubleLine,
@@ -72,6 +74,7 @@ from euporie.core.ft.utils import (
     pad,
     paste,
     strip,
+    substring,
     truncate,
     valign,
 )
@@ -105,19 +108,31 @@ class CssSelector(NamedTuple):
 
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Generator, Iterator
+    from collections.abc import Callable, Generator, Hashable, Iterator
     from pathlib import Path
     from typing import Any
 
     from fsspec.spec import AbstractFileSystem
     from prompt_toolkit.filters.base import Filter, FilterOrBool
-    from prompt_toolkit.formatted_text.base import StyleAndTextTuples
+    from prompt_toolkit.formatted_text.base import (
+        OneStyleAndTextTuple,
+        StyleAndTextTuples,
+    )
     from prompt_toolkit.key_binding.key_bindings import NotImplementedOrNone
     from prompt_toolkit.mouse_events import MouseEvent
 
     CssSelectors = dict[
         Filter, dict[tuple[tuple[CssSelector, ...], ...], dict[str, str]]
     ]
+    CssRules = dict[tuple[tuple[CssSelector, ...], ...], dict[str, str]]
+    CompiledStyleSheet = tuple[tuple[tuple[tuple[int, str], ...], CssRules], ...]
+    CssRuleEntry = tuple[int, int, tuple[CssSelector, ...], dict[str, str]]
+    CssRuleBuckets = tuple[
+        dict[str, list[CssRuleEntry]],
+        dict[str, list[CssRuleEntry]],
+        dict[str, list[CssRuleEntry]],
+        list[CssRuleEntry],
+    ]
 
 log = logging.getLogger(__name__)
 
@@ -129,6 +144,20 @@ class Direction(NamedTuple):
     y: bool = False
 
 
+# The number of renderings at different sizes to keep for each element
+_RENDER_CACHE_SIZE = 4
+
+# Attributes with short values which are repeated on many elements. Interned strings
+# are never freed, so other values (such as data URIs or inline styles) are not
+_INTERNED_ATTR_VALUES = frozenset({"class"})
+
+# Tables with more rows than this have their rows rendered on demand, if enabled
+_VIRTUAL_TABLE_ROWS = 500
+# The number of rows of virtualized tables which are rendered immediately
+_VIRTUAL_TABLE_SAMPLE_ROWS = 100
+# The number of rendered rows to keep for each virtualized table
+_VIRTUAL_ROW_CACHE_SIZE = 1_000
+
 # Prefer 6-digit hex-colors over 3-digit ones
 _COLOR_RE = re.compile(r"#([a-fA-F0-9]{6}|[a-fA-F0-9]{3})")
 
@@ -142,6 +171,10 @@ _SELECTOR_RE = re.compile(
     re.VERBOSE,
 )
 
+_KEY_SELECTOR_TAG_RE = re.compile(r"[^.#]*")
+_KEY_SELECTOR_ID_RE = re.compile(r"#([^.#]+)")
+_KEY_SELECTOR_CLASS_RE = re.compile(r"\.([^.#]+)")
+
 _AT_RULE_RE = re.compile(
     r"""
     (
@@ -614,10 +647,10 @@ def css_dimension(
         assert available is not None
         return number / 100 * available
 
-    # Get cell pixel dimensions
-    app = get_app()
+    # Get cell pixel dimensions (avoid creating a dummy app if none is running)
+    app = get_app_session().app
     if hasattr(app, "cell_size_px"):
-        cell_px, cell_py = get_app().cell_size_px
+        cell_px, cell_py = app.cell_size_px
     else:
         cell_px, cell_py = 10, 20
 
@@ -836,6 +869,91 @@ def selector_specificity(
     return (identifiers, classes, elements)
 
 
+class CssRuleIndex:
+    """An index of CSS rules, bucketed by the key selector of each selector.
+
+    As in browser engines, each selector is filed under the ID, class, or element name
+    in its right-most compound selector, so only rules which could possibly match an
+    element need to be evaluated for it. Selectors which do not contain any of these
+    are filed under the universal bucket, which is checked for every element.
+    """
+
+    def __init__(self, css: CssSelectors) -> None:
+        """Build an index for a set of CSS rules.
+
+        Args:
+            css: The CSS rules to index
+        """
+        self.css = css
+        self.size = self.get_size(css)
+        self.blocks: list[tuple[Filter, CssRuleBuckets]] = []
+        for condition, css_block in css.items():
+            ids: dict[str, list[CssRuleEntry]] = {}
+            classes: dict[str, list[CssRuleEntry]] = {}
+            tags: dict[str, list[CssRuleEntry]] = {}
+            universal: list[CssRuleEntry] = []
+            for i, (selectors, rule) in enumerate(css_block.items()):
+                for j, selector_parts in enumerate(selectors):
+                    entry = (i, j, selector_parts, rule)
+                    item = (selector_parts[-1].item or "") if selector_parts else ""
+                    tag = cast("re.Match", _KEY_SELECTOR_TAG_RE.match(item))[0]
+                    rest = item[len(tag) :]
+                    if m := _KEY_SELECTOR_ID_RE.search(rest):
+                        ids.setdefault(m[1], []).append(entry)
+                    elif m := _KEY_SELECTOR_CLASS_RE.search(rest):
+                        classes.setdefault(m[1], []).append(entry)
+                    elif tag and tag != "*":
+                        tags.setdefault(tag, []).append(entry)
+                    else:
+                        universal.append(entry)
+            self.blocks.append((condition, (ids, classes, tags, universal)))
+
+    @staticmethod
+    def get_size(css: CssSelectors) -> tuple[int, ...]:
+        """Return a value which changes when rules are added to a set of CSS rules."""
+        return tuple(len(css_block) for css_block in css.values())
+
+    def candidates(self, element: Node) -> Iterator[list[CssRuleEntry]]:
+        """Yield the rules which might apply to an element for each active block.
+
+        Rules are yielded in the order in which they are defined.
+        """
+        attrs = element.attrs
+        name = element.name
+        id_ = attrs.get("id")
+        class_names = set((attrs.get("class") or "").split())
+        for condition, (ids, classes, tags, universal) in self.blocks:
+            if condition():
+                entries = [*universal, *tags.get(name, ())]
+                if id_:
+                    entries.extend(ids.get(id_, ()))
+                for class_name in class_names:
+                    entries.extend(classes.get(class_name, ()))
+                if entries:
+                    entries.sort(key=lambda x: (x[0], x[1]))
+                    yield entries
+
+
+def _may_select(selector: CssSelector, element: Node) -> bool:
+    """Determine if a compound selector's key selector could match an element."""
+    item = selector.item or ""
+    tag = cast("re.Match", _KEY_SELECTOR_TAG_RE.match(item))[0]
+    if tag and tag != "*" and tag != element.name:
+        return False
+    attrs = element.attrs
+    rest = item[len(tag) :]
+    if (m := _KEY_SELECTOR_ID_RE.search(rest)) and m[1] != attrs.get("id"):
+        return False
+    class_names = set((attrs.get("class") or "").split())
+    return all(
+        class_name in class_names for class_name in _KEY_SELECTOR_CLASS_RE.findall(rest)
+    )
+
+
+# Indexes of stylesheets which are shared between documents
+_SHARED_CSS_INDEXES: dict[int, CssRuleIndex] = {}
+
+
 _DEFAULT_ELEMENT_CSS = {
     # Display
     "display": "block",
@@ -892,8 +1010,40 @@ _DEFAULT_ELEMENT_CSS = {
 }
 
 
+_RELATIVE_DIMENSION_KEYS = (
+    *(
+        f"{prop}_{direction}"
+        for prop in ("padding", "margin")
+        for direction in ("top", "right", "bottom", "left")
+    ),
+    "top",
+    "right",
+    "bottom",
+    "left",
+    "column_gap",
+    "row_gap",
+)
+
+
 class Theme(Mapping):
-    """The computed theme of an element."""
+    """The computed theme of an element.
+
+    Most theme values depend only on the DOM and are computed once and cached.
+    Cached box dimensions (listed in :py:attr:`space_dependent`) are discarded
+    when the space available to the element changes if they are given relative
+    to that space.
+    """
+
+    space_dependent = ("padding", "base_margin", "margin", "position", "gap")
+
+    # Cached properties are stored in the instance ``__dict__``
+    __slots__ = (
+        "__dict__",
+        "available_height",
+        "available_width",
+        "element",
+        "parent_theme",
+    )
 
     def __init__(
         self,
@@ -936,7 +1086,7 @@ class Theme(Mapping):
                 if "!important" in v
             },
         }
-        return theme
+        return self.element.dom.share_theme(theme)
 
     def update_space(
         self,
@@ -944,6 +1094,8 @@ class Theme(Mapping):
         available_height: int,
     ) -> None:
         """Set the space available to the element for rendering."""
+        old_space = self.available_width, self.available_height
+
         if self.theme["position"] in {"fixed"}:
             # Space is given by position
             dom = self.element.dom
@@ -957,20 +1109,39 @@ class Theme(Mapping):
             self.available_width = available_width
             self.available_height = available_height
 
+        # Discard cached values which were calculated for a different space
+        if (
+            self.relative_dimensions
+            and (self.available_width, self.available_height) != old_space
+        ):
+            for attr in self.space_dependent:
+                self.__dict__.pop(attr, None)
+
+    @cached_property
+    def relative_dimensions(self) -> bool:
+        """Determine if any box dimensions depend on the available space."""
+        theme = self.theme
+        return any(
+            theme.get(key, "").endswith(("%", "vw", "vh"))
+            for key in _RELATIVE_DIMENSION_KEYS
+        )
+
     # Theme calculation methods
 
     @cached_property
     def inherited_browser_css_theme(self) -> dict[str, str]:
         """Get the inherited parts from the browser CSS."""
         if (parent_theme := self.parent_theme) is not None:
-            return {
-                k: v
-                for k, v in {
-                    **parent_theme.inherited_browser_css_theme,
-                    **parent_theme.browser_css_theme,
-                }.items()
-                if k in _HERITABLE_PROPS or k.startswith("__")
-            }
+            return self.element.dom.share_theme(
+                {
+                    k: v
+                    for k, v in {
+                        **parent_theme.inherited_browser_css_theme,
+                        **parent_theme.browser_css_theme,
+                    }.items()
+                    if k in _HERITABLE_PROPS or k.startswith("__")
+                }
+            )
 
         else:
             return {}
@@ -1011,7 +1182,7 @@ class Theme(Mapping):
             # Keep over-ridden !important items
             theme = {**dict(rules), **{k: v for k, v in rules if "!important" in v}}
 
-        return theme
+        return self.element.dom.share_theme(theme)
 
     @cached_property
     def style_attribute_theme(self) -> dict[str, str]:
@@ -1066,77 +1237,76 @@ class Theme(Mapping):
         element_parent = element.parent
         element_parents_rev = [x for x in element.parents[::-1] if x]
 
-        for condition, css_block in css.items():
-            # TODO - cache CSS within condition blocks
-            if condition():
-                for selectors, rule in css_block.items():
-                    for selector_parts in selectors:
-                        # Last selector item should match the current element
-                        selector = selector_parts[-1]
-                        if not match_css_selector(
-                            selector.item or "",
-                            selector.attr or "",
-                            selector.pseudo or "",
-                            element_name,
-                            element_is_first,
-                            element_is_last,
-                            element_sibling_idx,
-                            **element_attrs,
-                        ):
-                            continue
-
-                        # All of the parent selectors should match a separate parent in order
-                        # TODO - combinators
-                        # https://developer.mozilla.org/en-US/docs/Web/CSS/CSS_Selectors#combinators
-                        unmatched_parents: list[Node]
-                        if element_parent and (
-                            (selector.comb == ">" and element_parent)
-                            # Pseudo-element selectors only match direct ancestors
-                            or ((item := selector.item) and item.startswith("::"))
+        for entries in element.dom.css_index(css).candidates(element):
+            matched_rules: set[int] = set()
+            for rule_index, _, selector_parts, rule in entries:
+                # We have already matched this rule, we don't need to keep checking
+                # the rest of the selectors for this rule
+                if rule_index in matched_rules:
+                    continue
+
+                # Last selector item should match the current element
+                selector = selector_parts[-1]
+                if not match_css_selector(
+                    selector.item or "",
+                    selector.attr or "",
+                    selector.pseudo or "",
+                    element_name,
+                    element_is_first,
+                    element_is_last,
+                    element_sibling_idx,
+                    **element_attrs,
+                ):
+                    continue
+
+                # All of the parent selectors should match a separate parent in order
+                # TODO - combinators
+                # https://developer.mozilla.org/en-US/docs/Web/CSS/CSS_Selectors#combinators
+                unmatched_parents: list[Node]
+                if element_parent and (
+                    (selector.comb == ">" and element_parent)
+                    # Pseudo-element selectors only match direct ancestors
+                    or ((item := selector.item) and item.startswith("::"))
+                ):
+                    unmatched_parents = [element_parent]
+                else:
+                    unmatched_parents = element_parents_rev[:]
+
+                # TODO investigate caching element / selector chains so we don't have to
+                # iterate through every parent every time
+
+                # Iterate through selector items in reverse, skipping the last
+                for selector in selector_parts[-2::-1]:
+                    # Pre-compute selector attributes
+                    item = selector.item or ""
+                    attrs = selector.attr or ""
+                    pseudo = selector.pseudo or ""
+                    parent: Node | None
+                    for i, parent in enumerate(unmatched_parents):
+                        if parent and match_css_selector(
+                            item,
+                            attrs,
+                            pseudo,
+                            parent.name,
+                            parent.is_first_child_element,
+                            parent.is_last_child_element,
+                            parent.sibling_element_index,
+                            **parent.attrs,
                         ):
-                            unmatched_parents = [element_parent]
-                        else:
-                            unmatched_parents = element_parents_rev[:]
-
-                        # TODO investigate caching element / selector chains so we don't have to
-                        # iterate through every parent every time
-
-                        # Iterate through selector items in reverse, skipping the last
-                        for selector in selector_parts[-2::-1]:
-                            # Pre-compute selector attributes
-                            item = selector.item or ""
-                            attrs = selector.attr or ""
-                            pseudo = selector.pseudo or ""
-                            parent: Node | None
-                            for i, parent in enumerate(unmatched_parents):
-                                if parent and match_css_selector(
-                                    item,
-                                    attrs,
-                                    pseudo,
-                                    parent.name,
-                                    parent.is_first_child_element,
-                                    parent.is_last_child_element,
-                                    parent.sibling_element_index,
-                                    **parent.attrs,
-                                ):
-                                    if selector.comb == ">" and (
-                                        parent := parent.parent
-                                    ):
-                                        unmatched_parents = [parent]
-                                    else:
-                                        unmatched_parents = element_parents_rev[i + 1 :]
-                                    break
+                            if selector.comb == ">" and (parent := parent.parent):
+                                unmatched_parents = [parent]
                             else:
-                                break
-
-                        else:
-                            # Calculate selector specificity score
-                            specificity_rules.append(
-                                (selector_specificity(selector_parts), rule)
-                            )
-                            # We have already matched this rule, we don't need to keep checking
-                            # the rest of the selectors for this rule
+                                unmatched_parents = element_parents_rev[i + 1 :]
                             break
+                    else:
+                        break
+
+                else:
+                    # Calculate selector specificity score
+                    specificity_rules.append(
+                        (selector_specificity(selector_parts), rule)
+                    )
+                    matched_rules.add(rule_index)
 
         # Shortcut in case of no rules
         if not specificity_rules:
@@ -1148,10 +1318,12 @@ class Theme(Mapping):
             for rule in sorted(specificity_rules, key=lambda x: x[0])
             for k, v in rule[1].items()
         ]
-        return {
-            **dict(rules),
-            **{k: v for k, v in rules if "!important" in v},
-        }
+        return self.element.dom.share_theme(
+            {
+                **dict(rules),
+                **{k: v for k, v in rules if "!important" in v},
+            }
+        )
 
     @cached_property
     def browser_css_theme(self) -> dict[str, str]:
@@ -2897,6 +3069,22 @@ class Node:
 
     theme: Theme
 
+    # Cached properties are stored in the instance ``__dict__``
+    __slots__ = (
+        "__dict__",
+        "_text",
+        "attrs",
+        "closed",
+        "contents",
+        "dom",
+        "intrinsic_rendering",
+        "marker",
+        "name",
+        "parent",
+        "renderings",
+        "theme",
+    )
+
     def __init__(
         self,
         dom: HTML,
@@ -2908,14 +3096,21 @@ class Node:
     ) -> None:
         """Create a new page element."""
         self.dom = dom
-        self.name = name
+        # Tag names & attributes are repeated many times in large documents
+        self.name = intern(name)
         self.parent = parent
         self._text = text
-        self.attrs: dict[str, Any] = {k: v for k, v in (attrs or []) if v is not None}
+        self.attrs: dict[str, Any] = {
+            intern(k): intern(v) if k in _INTERNED_ATTR_VALUES else v
+            for k, v in (attrs or [])
+            if v is not None
+        }
         self.contents: list[Node] = contents or []
         self.closed = False
         self.marker: Node | None = None
         self.theme = Theme(self, parent_theme=parent.theme if parent else None)
+        self.renderings: dict[tuple[Hashable, ...], StyleAndTextTuples] = {}
+        self.intrinsic_rendering: tuple[int, int, StyleAndTextTuples] | None = None
 
     def reset(self) -> None:
         """Reset the node and all its children."""
@@ -2923,6 +3118,8 @@ class Node:
             if isinstance(Node.__dict__.get(attr), cached_property):
                 delattr(self, attr)
         self.theme.reset()
+        self.renderings.clear()
+        self.intrinsic_rendering = None
         for child in self.contents:
             child.reset()
         self.marker = None
@@ -3098,6 +3295,10 @@ class Node:
     def is_first_child_node(self) -> bool:
         """True if the element if the first child node of its parent element."""
         if (parent := self.parent) and (child_nodes := parent.contents):
+            # Pseudo-elements are only created when needed, but are always considered
+            # to be the first and last nodes of elements which can have them
+            if parent.has_pseudo_elements:
+                return self.name == "::before"
             return child_nodes[0] == self
         return False
 
@@ -3105,9 +3306,16 @@ class Node:
     def is_last_child_node(self) -> bool:
         """True if the element if the last child node of its parent element."""
         if (parent := self.parent) and (child_nodes := parent.contents):
+            if parent.has_pseudo_elements:
+                return self.name == "::after"
             return child_nodes[-1] == self
         return False
 
+    @cached_property
+    def has_pseudo_elements(self) -> bool:
+        """True if the element can have ``::before`` and ``::after`` pseudo-elements."""
+        return not ((name := self.name) in _VOID_ELEMENTS or name.startswith("::"))
+
     @property
     def child_elements(self) -> Generator[Node]:
         """Yield all of the child element nodes."""
@@ -3151,13 +3359,21 @@ class Node:
                     return child == self
         return False
 
+    @cached_property
+    def child_element_list(self) -> list[Node]:
+        """List the child element nodes."""
+        return list(self.child_elements)
+
+    @cached_property
+    def child_element_indices(self) -> dict[Node, int]:
+        """Map each of the child element nodes to its index among its siblings."""
+        return {child: i for i, child in enumerate(self.child_element_list)}
+
     @cached_property
     def sibling_element_index(self) -> int | None:
         """Return the index of this element among its siblings."""
-        if self.parent:
-            for i, child in enumerate(self.parent.child_elements):
-                if child is self:
-                    return i
+        if parent := self.parent:
+            return parent.child_element_indices.get(self)
         return None
 
     @cached_property
@@ -3212,25 +3428,19 @@ class Node:
     @cached_property
     def prev_element(self) -> Node | None:
         """Return the previous sibling element."""
-        if parent := self.parent:
-            prev_element = None
-            for child in parent.child_elements:
-                if child == self:
-                    return prev_element
-                prev_element = child
+        if (index := self.sibling_element_index) and (parent := self.parent):
+            return parent.child_element_list[index - 1]
         return None
 
     @cached_property
     def next_element(self) -> Node | None:
         """Return the next sibling element."""
-        if parent := self.parent:
-            child_elements = parent.child_elements
-            for child in child_elements:
-                if child == self:
-                    try:
-                        return next(child_elements)
-                    except StopIteration:
-                        return None
+        if (index := self.sibling_element_index) is not None and (
+            parent := self.parent
+        ):
+            siblings = parent.child_element_list
+            if index + 1 < len(siblings):
+                return siblings[index + 1]
         return None
 
     def __repr__(self, d: int = 0) -> str:
@@ -3302,9 +3512,43 @@ class CustomHTMLParser(HTMLParser):
             self.curr = self.curr.parent
 
 
-def parse_style_sheet(css_str: str, dom: HTML, condition: Filter = always) -> None:
-    """Collect all CSS styles from style tags."""
-    dom_css = dom.css
+def measure_words(
+    ft: tuple[OneStyleAndTextTuple, ...],
+) -> tuple[tuple[tuple[OneStyleAndTextTuple, ...], int, int], ...]:
+    """Split inline formatted text into words and measure their sizes.
+
+    Args:
+        ft: The formatted text to split
+
+    Returns:
+        A tuple of tuples containing each word with its width and height
+
+    """
+    words = []
+    for word in fragment_list_to_words(list(ft)):
+        lines = list(split_lines(word))
+        words.append(
+            (tuple(word), max(fragment_list_width(line) for line in lines), len(lines))
+        )
+    return tuple(words)
+
+
+@lru_cache(maxsize=256)
+def compile_style_sheet(css_str: str) -> CompiledStyleSheet:
+    """Parse a CSS style sheet into groups of rules.
+
+    The result does not depend on any particular DOM, so is cached and shared between
+    all :py:class:`HTML` instances which use the same style sheet.
+
+    Args:
+        css_str: The CSS style sheet text
+
+    Returns:
+        A tuple of rule groups. Each group consists of the ``@media`` queries which
+        must be satisfied for the rules to apply (each paired with a number uniquely
+        identifying the ``@media`` block), and a mapping of parsed selectors to the
+        rule's content.
+    """
     # Remove whitespace and newlines
     css_str = re.sub(r"\s*\n\s*", " ", css_str)
     # Remove comments
@@ -3313,7 +3557,10 @@ def parse_style_sheet(css_str: str, dom: HTML, condition: Filter = always) -> No
     # for compatibility with old CSS and to make root selector work
     css_str = re.sub("(?<!:):(?=before|after|root)", "::", css_str)
 
-    def parse_part(part_condition: Filter, css_str: str) -> None:
+    groups: dict[tuple[tuple[int, str], ...], CssRules] = {}
+    media_ids = count()
+
+    def parse_part(media: tuple[tuple[int, str], ...], css_str: str) -> None:
         """Parse a group of CSS rules."""
         if css_str:
             css_str = css_str.replace("\n", "").strip()
@@ -3330,55 +3577,82 @@ def parse_style_sheet(css_str: str, dom: HTML, condition: Filter = always) -> No
                             )
                             for selector in map(str.strip, selectors.split(","))
                         )
-                        rules = dom_css.setdefault(part_condition, {})
+                        rules = groups.setdefault(media, {})
                         if parsed_selectors in rules:
                             rules[parsed_selectors].update(rule_content)
                         else:
                             rules[parsed_selectors] = rule_content
 
-    # Split out nested at-rules - we need to process them separately
-    for part in _AT_RULE_RE.split(css_str):
-        if (
-            part
-            and part[0] == "@"
-            and (m := _NESTED_AT_RULE_RE.match(part)) is not None
-        ):
-            m_dict = m.groupdict()
-            # Process '@media' queries
-            if m_dict["identifier"] == "media":
-                # Split each query - separated by "or" or ","
-                queries = re.split("(?: or |,)", m_dict["rule"])
-                query_conditions: Filter = never
-                for query in queries:
-                    # Each query can be the logical sum of multiple targets
-                    target_conditions: Filter = always
-                    for target in query.split(" and "):
-                        if (
-                            target_m := _MEDIA_QUERY_TARGET_RE.match(target)
-                        ) is not None:
-                            target_m_dict = target_m.groupdict()
-                            # Check for media type conditions
-                            if (media_type := target_m_dict["type"]) is not None:
-                                target_conditions &= (
-                                    always if media_type in {"all", "screen"} else never
-                                )
-                            # Check for media feature conditions
-                            elif (
-                                media_feature := target_m_dict["feature"]
-                            ) is not None:
-                                target_conditions &= parse_media_condition(
-                                    media_feature, dom
-                                )
-                            # Check for logical 'NOT' inverting the target condition
-                            if target_m_dict["invert"]:
-                                target_conditions = ~target_conditions
-                    # Logical OR of all media queries
-                    query_conditions |= target_conditions
-                # Parse the @media CSS block (may contain nested at-rules)
-                parse_style_sheet(m_dict["part"], dom, condition & query_conditions)
-        # Parse the CSS and always use it
-        else:
-            parse_part(condition, part)
+    def parse_sheet(css_str: str, media: tuple[tuple[int, str], ...]) -> None:
+        """Split out nested at-rules, which we need to process separately."""
+        for part in _AT_RULE_RE.split(css_str):
+            if (
+                part
+                and part[0] == "@"
+                and (m := _NESTED_AT_RULE_RE.match(part)) is not None
+            ):
+                m_dict = m.groupdict()
+                # Process '@media' queries (may contain nested at-rules)
+                if m_dict["identifier"] == "media":
+                    parse_sheet(
+                        m_dict["part"], (*media, (next(media_ids), m_dict["rule"]))
+                    )
+            # Parse the CSS and always use it
+            else:
+                parse_part(media, part)
+
+    parse_sheet(css_str, ())
+    return tuple(groups.items())
+
+
+def parse_style_sheet(css_str: str, dom: HTML, condition: Filter = always) -> None:
+    """Collect all CSS styles from style tags."""
+    dom_css = dom.css
+    conditions: dict[tuple[tuple[int, str], ...], Filter] = {(): condition}
+    for media, css_rules in compile_style_sheet(css_str):
+        # Convert the group's media queries to a condition for this DOM
+        if (group_condition := conditions.get(media)) is None:
+            group_condition = condition
+            for i in range(1, len(media) + 1):
+                if (part_condition := conditions.get(media[:i])) is None:
+                    part_condition = conditions[media[:i]] = (
+                        group_condition & parse_media_query(media[i - 1][1], dom)
+                    )
+                group_condition = part_condition
+        rules = dom_css.setdefault(group_condition, {})
+        for selectors, rule_content in css_rules.items():
+            if selectors in rules:
+                rules[selectors].update(rule_content)
+            else:
+                # Copy the rule content so shared compiled rules are not modified
+                rules[selectors] = dict(rule_content)
+
+
+def parse_media_query(rule: str, dom: HTML) -> Filter:
+    """Convert a ``@media`` query to a condition."""
+    # Split each query - separated by "or" or ","
+    queries = re.split("(?: or |,)", rule)
+    query_conditions: Filter = never
+    for query in queries:
+        # Each query can be the logical sum of multiple targets
+        target_conditions: Filter = always
+        for target in query.split(" and "):
+            if (target_m := _MEDIA_QUERY_TARGET_RE.match(target)) is not None:
+                target_m_dict = target_m.groupdict()
+                # Check for media type conditions
+                if (media_type := target_m_dict["type"]) is not None:
+                    target_conditions &= (
+                        always if media_type in {"all", "screen"} else never
+                    )
+                # Check for media feature conditions
+                elif (media_feature := target_m_dict["feature"]) is not None:
+                    target_conditions &= parse_media_condition(media_feature, dom)
+                # Check for logical 'NOT' inverting the target condition
+                if target_m_dict["invert"]:
+                    target_conditions = ~target_conditions
+        # Logical OR of all media queries
+        query_conditions |= target_conditions
+    return query_conditions
 
 
 def parse_media_condition(condition: str, dom: HTML) -> Filter:
@@ -3482,6 +3756,247 @@ def parse_media_condition(condition: str, dom: HTML) -> Filter:
     return result
 
 
+async def _cat_urls(
+    fs: AbstractFileSystem, urls: list[str]
+) -> dict[str, bytes | Exception]:
+    """Load multiple files from a filesystem without blocking the event loop.
+
+    Filesystems with an asynchronous implementation are run on fsspec's own event
+    loop, where their client sessions live. Others are run in a worker thread.
+    """
+    if fs.async_impl and not fs.asynchronous:
+        future = asyncio.run_coroutine_threadsafe(
+            fs._cat(urls, recursive=False, on_error="return"), fs.loop
+        )
+        return await asyncio.wrap_future(future)
+    return await asyncio.to_thread(fs.cat, urls, recursive=False, on_error="return")
+
+
+class VirtualRow(NamedTuple):
+    """A reference to a line of a row of a virtualized table.
+
+    Placeholders for the rows of virtualized tables carry one of these as the third
+    item of their fragment, so the row can be found when the placeholder is displayed.
+    """
+
+    table: VirtualTable
+    index: int
+    line: int
+    #: The position of the start of the placeholder's fragment in the row's line
+    x: int = 0
+
+    def __call__(self, mouse_event: MouseEvent) -> NotImplementedOrNone:
+        """Let mouse events on placeholders pass through to the parent control."""
+        return NotImplemented
+
+
+def _virtual_row(fragment: OneStyleAndTextTuple) -> VirtualRow | None:
+    """Return the virtual table row referenced by a fragment, if there is one."""
+    if len(fragment) > 2 and isinstance(row := fragment[2], VirtualRow):
+        return row
+    return None
+
+
+def has_virtual_rows(line: StyleAndTextTuples) -> bool:
+    """Determine if a line of text contains placeholders for virtual table rows."""
+    return any(_virtual_row(fragment) for fragment in line)
+
+
+class VirtualTable:
+    """The rows of a large table, which are rendered when they are displayed.
+
+    The height of each row is estimated from the text in its cells, so the position
+    of every row is known before it is rendered.
+    """
+
+    def __init__(
+        self,
+        dom: HTML,
+        element: Node,
+        rows: list[Node],
+        col_widths: list[int],
+        content_widths: list[int],
+    ) -> None:
+        """Create a new virtual table.
+
+        Args:
+            dom: The DOM to which the table belongs
+            element: The HTML table element
+            rows: The table's row elements, in display order
+            col_widths: The widths of the table's columns
+            content_widths: The widths of the content of the table's cells, used to
+                estimate the height of each row
+
+        """
+        self.dom = dom
+        self.element = element
+        self.rows = rows
+        self.col_widths = col_widths
+        self.content_widths = content_widths
+        self.heights: dict[int, int] = {}
+        self._rows: dict[int, list[StyleAndTextTuples]] = {}
+        self._pending: set[int] = set()
+        self._lock = asyncio.Lock()
+
+    def row_height(self, index: int) -> int:
+        """Estimate the number of lines of content in a row of the table."""
+        if (height := self.heights.get(index)) is None:
+            height = 1
+            for td, width in zip(
+                (td for td in self.rows[index].contents if td.name in {"td", "th"}),
+                self.content_widths,
+            ):
+                text = "".join(
+                    "\n" if node.name == "br" else node._text.replace("\n", " ")
+                    for node in td.descendents
+                    if node.name in {"::text", "br"}
+                )
+                height = max(height, _wrapped_line_count(text, width))
+            self.heights[index] = height
+        return height
+
+    def placeholder(self, index: int, line: int, width: int) -> StyleAndTextTuples:
+        """Create a placeholder for a line of a row which is rendered on demand."""
+        return [("", " " * width, VirtualRow(self, index, line))]
+
+    async def render_row(self, index: int) -> list[StyleAndTextTuples]:
+        """Render a row of the table, caching the result."""
+        # Rows share the DOM, so they must be rendered one at a time
+        async with self._lock:
+            if (lines := self._rows.get(index)) is None:
+                lines = self._rows[index] = await self.dom.render_virtual_row(
+                    self, index
+                )
+                if len(self._rows) > _VIRTUAL_ROW_CACHE_SIZE:
+                    del self._rows[next(iter(self._rows))]
+        return lines
+
+    def get_line(self, index: int, line: int) -> StyleAndTextTuples | None:
+        """Return a line of a row of the table, if the row has been rendered.
+
+        Rows which have not yet been rendered are rendered in the background, and the
+        app is invalidated once they are ready, so displaying a row never blocks.
+
+        Args:
+            index: The index of the row
+            line: The line of the row to return
+
+        Returns:
+            The line of the rendered row, or :py:const:`None` if it is not yet ready
+
+        """
+        if (lines := self._rows.get(index)) is None:
+            if index not in self._pending:
+                self._pending.add(index)
+
+                def _done(lines: list[StyleAndTextTuples]) -> None:
+                    self._pending.discard(index)
+                    get_app().invalidate()
+
+                run_coro_async(
+                    self.render_row(index),
+                    get_or_create_loop("convert"),
+                    callback=_done,
+                )
+            return None
+        return lines[line] if line < len(lines) else []
+
+
+def _wrapped_line_count(text: str, width: int) -> int:
+    """Count the lines needed to display text when word-wrapped at a given width."""
+    width = max(1, width)
+    n_lines = 0
+    for paragraph in text.split("\n"):
+        n_lines += 1
+        x = 0
+        for word in paragraph.split():
+            word_width = get_cwidth(word)
+            if x and x + 1 + word_width > width:
+                n_lines += 1
+                x = 0
+            x += word_width + (1 if x else 0)
+            # Long words are broken across lines
+            while x > width:
+                n_lines += 1
+                x -= width
+    return n_lines
+
+
+def render_virtual_rows(line: StyleAndTextTuples) -> StyleAndTextTuples:
+    """Replace placeholders for the rows of virtualized tables in a line of text.
+
+    Rows which have not yet been rendered are rendered in the background, and their
+    placeholders are left blank until they are ready.
+
+    Args:
+        line: The line of text in which to replace placeholders
+
+    Returns:
+        The line of text with the rendered rows in place of their placeholders
+
+    """
+    if not has_virtual_rows(line):
+        return line
+    output: StyleAndTextTuples = []
+    offsets: dict[VirtualRow, int] = {}
+    for fragment in line:
+        if (row := _virtual_row(fragment)) is None:
+            output.append(fragment)
+            continue
+        # Placeholders might have been split into multiple fragments
+        style, text, *_ = fragment
+        x = offsets.get(row, row.x)
+        offsets[row] = x + (width := fragment_list_width([(style, text)]))
+        if (row_line := row.table.get_line(row.index, row.line)) is None:
+            output.append((style, text))
+            continue
+        # Keep any styles applied to the placeholder by its parent elements
+        output.extend(
+            cast(
+                "OneStyleAndTextTuple",
+                (f"{row_style} {style}" if style else row_style, row_text, *row_rest),
+            )
+            for row_style, row_text, *row_rest in substring(row_line, x, x + width)
+        )
+    return output
+
+
+def wrap_virtual_rows(line: StyleAndTextTuples, width: int) -> list[StyleAndTextTuples]:
+    """Split a line containing placeholders for the rows of virtualized tables.
+
+    The line is split at a fixed width, rather than between words, so each piece of
+    the rendered row will be the same width as the placeholder it replaces.
+
+    Args:
+        line: The line of text to split
+        width: The maximum width of each line
+
+    Returns:
+        A list of lines
+
+    """
+    # Find the start of each placeholder in the line
+    starts: dict[VirtualRow, int] = {}
+    x = 0
+    for fragment in line:
+        if (row := _virtual_row(fragment)) is not None:
+            starts.setdefault(row, x - row.x)
+        x += fragment_list_width([fragment[:2]])
+    lines = []
+    for left in range(0, max(x, 1), max(1, width)):
+        output: StyleAndTextTuples = []
+        x = left
+        for fragment in substring(line, left, left + width):
+            style, text, *_ = fragment
+            if (row := _virtual_row(fragment)) is not None:
+                # Record the position of each piece of a wrapped placeholder
+                fragment = (style, text, row._replace(x=x - starts[row]))
+            output.append(fragment)
+            x += fragment_list_width([(style, text)])
+        lines.append(output)
+    return lines
+
+
 class HTML:
     """A HTML formatted text renderer.
 
@@ -3502,6 +4017,7 @@ class HTML:
         mouse_handler: Callable[[Node, MouseEvent], NotImplementedOrNone] | None = None,
         paste_fixed: bool = True,
         defer_assets: bool = False,
+        virtual_rows: bool = False,
         on_update: Callable[[HTML], None] | None = None,
         on_change: Callable[[HTML], None] | None = None,
         _initial_format: str = "",
@@ -3524,6 +4040,8 @@ class HTML:
             mouse_handler: A mouse handler function to use when links are clicked
             paste_fixed: Whether fixed elements should be pasted over the output
             defer_assets: Whether to render the page before remote assets are loaded
+            virtual_rows: Whether to defer rendering the rows of very large tables until
+                they are displayed (see :py:func:`render_virtual_rows`)
             on_update: An optional callback triggered when the DOM updates
             on_change: An optional callback triggered when the DOM changes
             _initial_format: The initial format of the data being displayed
@@ -3537,6 +4055,7 @@ class HTML:
         self.css: CssSelectors = css or {}
         self.mathjax = to_filter(mathjax)
         self.defer_assets = defer_assets
+        self.virtual_rows = virtual_rows
 
         self.render_count = 0
         self.width = width
@@ -3553,16 +4072,43 @@ class HTML:
         self.formatted_text: StyleAndTextTuples = []
         self.floats: dict[tuple[int, DiBool, DiInt], StyleAndTextTuples] = {}
         self.fixed: dict[tuple[int, DiBool, DiInt], StyleAndTextTuples] = {}
+        # The number of fixed elements rendered, used to avoid caching their parents
+        self._fixed_count = 0
         self.fixed_mask: StyleAndTextTuples = []
+        self.virtual_tables: dict[tuple[Node, tuple[int, ...]], VirtualTable] = {}
         # self.anchors = []
         self.on_update = Event(self, on_update)
         self.on_change = Event(self, on_change)
 
+        self._css_indexes: dict[int, CssRuleIndex] = {}
+        self._themes: dict[tuple[tuple[str, str], ...], dict[str, str]] = {}
+        self._words: SimpleCache[
+            tuple[OneStyleAndTextTuple, ...],
+            tuple[tuple[tuple[OneStyleAndTextTuple, ...], int, int], ...],
+        ] = SimpleCache(maxsize=10_000)
         self._dom_processed = False
         self._assets_loaded = False
         self._url_cbs: dict[Path, Callable[[Any], None]] = {}
         self._url_fs_map: dict[Path, AbstractFileSystem] = {}
 
+    def css_index(self, css: CssSelectors) -> CssRuleIndex:
+        """Return an index of a set of CSS rules, re-building it if rules were added."""
+        # The default browser stylesheet is used by every document, so is indexed once
+        indexes = _SHARED_CSS_INDEXES if css is _BROWSER_CSS else self._css_indexes
+        index = indexes.get(id(css))
+        if index is None or index.css is not css or index.size != index.get_size(css):
+            index = indexes[id(css)] = CssRuleIndex(css)
+        return index
+
+    def share_theme(self, theme: dict[str, str]) -> dict[str, str]:
+        """Return a theme dictionary equal to ``theme`` which is shared between nodes.
+
+        Many elements in large documents have identical themes, so storing one copy of
+        each distinct theme reduces the memory used by the DOM. Shared themes must not
+        be modified.
+        """
+        return self._themes.setdefault(tuple(theme.items()), theme)
+
     # Lazily load attributes
 
     @cached_property
@@ -3685,35 +4231,61 @@ class HTML:
                         index = parent.contents.index(child)
                         parent.contents[index : index + 1] = nodes
 
-            # Add pseudo-elements just before rendering
-            if child.name not in _VOID_ELEMENTS and not child.name.startswith("::"):
-                before_node = Node(dom=self, name="::before", parent=child)
-                before_node.contents.append(
-                    Node(dom=self, name="::text", parent=before_node)
-                )
-                after_node = Node(dom=self, name="::after", parent=child)
-                after_node.contents.append(
-                    Node(dom=self, name="::text", parent=after_node)
-                )
-                child.contents = [before_node, *child.contents, after_node]
-
+        self.add_pseudo_elements()
         self._dom_processed = True
 
+    def add_pseudo_elements(self) -> None:
+        """Add ``::before`` and ``::after`` pseudo-elements to the DOM.
+
+        Pseudo-elements are only created for elements which might be selected by a
+        CSS rule which sets the pseudo-element's ``content``.
+        """
+        hosts: dict[str, list[CssSelector | None]] = {"::before": [], "::after": []}
+        for css in (self.browser_css, self.css):
+            for css_block in css.values():
+                for selectors, rule in css_block.items():
+                    if "content" not in rule:
+                        continue
+                    for selector_parts in selectors:
+                        if (pseudo := selector_parts[-1].item) in hosts:
+                            hosts[pseudo].append(
+                                selector_parts[-2] if len(selector_parts) > 1 else None
+                            )
+        if not any(hosts.values()):
+            return
+
+        for child in self.soup.descendents:
+            if not child.has_pseudo_elements:
+                continue
+            contents = child.contents
+            for pseudo, selectors in hosts.items():
+                if any(
+                    selector is None or _may_select(selector, child)
+                    for selector in selectors
+                ) and not any(node.name == pseudo for node in contents):
+                    node = Node(dom=self, name=pseudo, parent=child)
+                    node.contents.append(Node(dom=self, name="::text", parent=node))
+                    if pseudo == "::before":
+                        contents.insert(0, node)
+                    else:
+                        contents.append(node)
+
     async def load_assets(self) -> None:
         """Load remote assets asynchronously."""
         self._assets_loaded = True
 
-        # Load all remote assets for each protocol using fsspec (where they are loaded
-        # asynchronously in their own thread) and trigger callbacks if the file is
-        # loaded successfully
+        # Load all remote assets for each protocol concurrently using fsspec and
+        # trigger callbacks if the file is loaded successfully
         fs_url_map = {
             fs: [url for url, f in self._url_fs_map.items() if f == fs]
             for fs in set(self._url_fs_map.values())
         }
-        for fs, urls in fs_url_map.items():
-            try:
-                results = fs.cat(urls, recursive=False, on_error="return")
-            except Exception:
+        fs_results = await asyncio.gather(
+            *(_cat_urls(fs, urls) for fs, urls in fs_url_map.items()),
+            return_exceptions=True,
+        )
+        for fs, results in zip(fs_url_map, fs_results):
+            if isinstance(results, BaseException):
                 log.warning("Error connecting to %s", fs)
             else:
                 # for url, result in zip(urls, results.values()):
@@ -3724,9 +4296,15 @@ class HTML:
                     else:
                         log.warning("Error loading %s", url)
 
+        # Add any pseudo-elements required by the new CSS from assets
+        self.add_pseudo_elements()
+
         # Reset all nodes so they will update with the new CSS from assets
         if self.defer_assets:
             self.soup.reset()
+            self.virtual_tables.clear()
+            # Themes are re-computed, so previously shared themes are discarded
+            self._themes.clear()
 
     def render(self, width: int | None, height: int | None) -> StyleAndTextTuples:
         """Render the current markup at a given size."""
@@ -3759,6 +4337,9 @@ class HTML:
         if not self.defer_assets and not self._assets_loaded:
             await self.load_assets()
 
+        # Fixed elements are collected afresh during each render
+        self.fixed.clear()
+
         ft = await self.render_element(
             self.soup,
             available_width=self.width,
@@ -3839,11 +4420,28 @@ class HTML:
         fill: bool = True,
         align_content: bool = True,
     ) -> StyleAndTextTuples:
-        """Render a Node."""
+        """Render a Node.
+
+        Renderings are cached on the element by the space they were rendered in, so
+        only elements whose available space has changed are laid out again.
+        """
         # Update the element theme with the available space
         theme = element.theme
         theme.update_space(available_width, available_height)
 
+        # Re-use a previous rendering if one exists for this space. The rendering of
+        # inline text does not depend on the available space
+        if (
+            element.name == "::text"
+            and theme.d_inline
+            and not theme.relative_dimensions
+        ):
+            key: tuple[Hashable, ...] = (left, fill, align_content)
+        else:
+            key = (available_width, available_height, left, fill, align_content)
+        if (ft := element.renderings.get(key)) is not None:
+            return list(ft)
+
         # Render the contents
         if theme.d_table:
             render_func = self.render_table_content
@@ -3864,12 +4462,54 @@ class HTML:
             )
 
         # Render the element
+        fixed_count = self._fixed_count
         ft = await render_func(element, left, fill, align_content)
 
         # Format the contents
         ft = await self.format_element(ft, element, left, fill, align_content)
 
-        return ft
+        self._cache_rendering(element, key, ft, fixed_count)
+        return list(ft)
+
+    def _cache_rendering(
+        self,
+        element: Node,
+        key: tuple[Hashable, ...],
+        ft: StyleAndTextTuples,
+        fixed_count: int,
+    ) -> None:
+        """Cache an element's rendering, keeping only the most recent sizes.
+
+        Renderings of fixed elements are not returned to the parent, so elements
+        containing them (i.e. those during which the count of rendered fixed elements
+        changed) must always be re-rendered.
+        """
+        if self._fixed_count == fixed_count:
+            renderings = element.renderings
+            renderings[key] = ft
+            while len(renderings) > _RENDER_CACHE_SIZE:
+                del renderings[next(iter(renderings))]
+
+    async def render_intrinsic_content(self, element: Node) -> StyleAndTextTuples:
+        """Render an element's content without filling or aligning it.
+
+        This is used to measure the intrinsic size of the element's content. If the
+        content fitted within the space available for a previous rendering without
+        wrapping, it is not affected by width and the previous rendering is re-used.
+        """
+        theme = element.theme
+        available_width = theme.available_width
+        if (previous := element.intrinsic_rendering) is not None:
+            previous_width, content_width, ft = previous
+            if content_width < previous_width and content_width <= available_width:
+                return list(ft)
+        fixed_count = self._fixed_count
+        ft = await self.render_node_content(
+            element, left=0, align_content=False, fill=False
+        )
+        if self._fixed_count == fixed_count:
+            element.intrinsic_rendering = (available_width, max_line_width(ft), ft)
+        return list(ft)
 
     async def render_text_content(
         self,
@@ -3979,8 +4619,10 @@ class HTML:
         bullet = list_style
         if list_style == "decimal":
             bullet = f"{element.attrs['value']}."
-        # Add bullet element
-        if bullet:
+        # Add bullet element, unless it was added by a previous rendering
+        if bullet and not (
+            (contents := element.contents) and contents[0].name == "::marker"
+        ):
             bullet_element = Node(dom=self, name="::marker", parent=element)
             bullet_element.contents.append(
                 Node(dom=self, name="::text", parent=bullet_element, text=bullet)
@@ -4021,104 +4663,48 @@ class HTML:
         ft = []
 
         table_theme = element.theme
-        table_x_dim = Dimension(
-            min=table_theme.min_width,
-            preferred=table_theme.content_width if "width" in table_theme else None,
-            max=table_theme.max_width,
-        )
 
-        table = Table(
-            width=table_x_dim,
-            expand="width" in table_theme,
-            align=table_theme.text_align,
-            style=table_theme.style,
-            padding=DiInt(0, 0, 0, 0),
-            border_line=table_theme.border_line,
-            border_style=table_theme.border_style,
-            border_visibility=table_theme.border_visibility,
-        )
+        # Collect the table's rows in the order in which they are displayed: the table
+        # head, the table body, rows not in a head / body / foot as part of the body,
+        # and finally the table foot
+        trs = [
+            tr
+            for group in (
+                *element.find_all("thead", recursive=False),
+                *element.find_all("tbody", recursive=False),
+                element,
+                *element.find_all("tfoot", recursive=False),
+            )
+            for tr in group.contents
+            if tr.name == "tr"
+        ]
 
-        td_map = {}
+        ft_table = None
+        if self.virtual_rows and len(trs) > _VIRTUAL_TABLE_ROWS:
+            ft_table = await self.render_virtual_table(element, trs)
 
-        # Stack the elements in the shape of the table
-        async def render_rows(elements: list[Node]) -> None:
-            for tr in elements:
-                if tr.name == "tr":
-                    tr_theme = tr.theme
-                    # tr_theme.update_space(available_width, available_height)
-                    row = table.new_row(
-                        align=tr_theme.text_align,
-                        style=tr_theme.style,
-                        border_line=tr_theme.border_line,
-                        border_style=tr_theme.border_style,
-                        border_visibility=tr_theme.border_visibility,
-                    )
-                    for td in tr.contents:
-                        if td.name in ("th", "td"):
-                            td_theme = td.theme
-                            td_theme.update_space(
-                                table_theme.content_width
-                                or table_theme.available_width,
-                                table_theme.content_height
-                                or table_theme.available_width,
-                            )
-                            cell = row.new_cell(
-                                text=await self.render_node_content(
-                                    td,
-                                    left=0,
-                                    align_content=False,
-                                    fill=False,
-                                ),
-                                padding=td_theme.padding,
-                                border_line=td_theme.border_line,
-                                border_style=td_theme.border_style,
-                                align=td_theme.text_align,
-                                colspan=try_eval(td.attrs.get("colspan", 1)),
-                                rowspan=try_eval(td.attrs.get("rowspan", 1)),
-                                style=td_theme.style + " nounderline",
-                                width=td_theme.width if "width" in td_theme else None,
-                                border_visibility=td_theme.border_visibility,
+        if ft_table is None:
+            table = self._new_table(element)
+
+            # Stack the elements in the shape of the table
+            td_map: dict[Cell, Node] = {}
+            for tr in trs:
+                td_map.update(await self._add_table_row(element, table, tr))
+
+            # TODO - process <colgroup> elements
+
+            # Add cell contents
+            if td_map:
+                col_widths = table.calculate_col_widths()
+                for row in table.rows:
+                    for col_width, cell in zip(col_widths, row.cells):
+                        if td := td_map.get(cell):
+                            cell.text = await self._render_table_cell(
+                                element, td, cell, col_width
                             )
-                            # Save for later so we can add the contents once all the
-                            # cells are created and we can calculate the cell widths
-                            td_map[cell] = td
-
-        # Render the table head
-        for child in element.find_all("thead", recursive=False):
-            await render_rows(child.contents)
-        # Render the table body
-        for child in element.find_all("tbody", recursive=False):
-            await render_rows(child.contents)
-        # Render rows not in a head / body / foot as part of the body
-        await render_rows(element.contents)
-        for child in element.find_all("tfoot", recursive=False):
-            await render_rows(child.contents)
-
-        # TODO - process <colgroup> elements
-
-        # Add cell contents
-        if td_map:
-            col_widths = table.calculate_col_widths()
-            for row in table.rows:
-                for col_width, cell in zip(col_widths, row.cells):
-                    if td := td_map.get(cell):
-                        cell_padding = compute_padding(cell)
-                        available_width = (
-                            table_x_dim.max
-                            if cell.colspan > 1
-                            else col_width - cell_padding.left - cell_padding.right
-                        )
-                        td.theme.update_space(
-                            available_width, table_theme.available_height
-                        )
-                        cell.text = await self.render_node_content(
-                            td,
-                            # TODO - get actual colspan cell widths properly
-                            left=0,
-                        )
 
-        # Render the table
-        ft_table = table.render()
+            # Render the table
+            ft_table = table.render()
 
         # Render the caption
         # TODO - support "caption-side" css
@@ -4140,6 +4726,226 @@ class HTML:
 
         return ft
 
+    def _new_table(self, element: Node) -> Table:
+        """Create an empty table for a HTML table element."""
+        table_theme = element.theme
+        return Table(
+            width=Dimension(
+                min=table_theme.min_width,
+                preferred=table_theme.content_width if "width" in table_theme else None,
+                max=table_theme.max_width,
+            ),
+            expand="width" in table_theme,
+            align=table_theme.text_align,
+            style=table_theme.style,
+            padding=DiInt(0, 0, 0, 0),
+            border_line=table_theme.border_line,
+            border_style=table_theme.border_style,
+            border_visibility=table_theme.border_visibility,
+        )
+
+    async def _add_table_row(
+        self, element: Node, table: Table, tr: Node, measure: bool = True
+    ) -> dict[Cell, Node]:
+        """Add a HTML table row element to a table.
+
+        Args:
+            element: The HTML table element
+            table: The table to which the row should be added
+            tr: The table row element
+            measure: Whether to render the intrinsic content of the row's cells so it
+                can be used to calculate the table's column widths
+
+        Returns:
+            A mapping of the row's new cells to their table cell elements
+
+        """
+        table_theme = element.theme
+        tr_theme = tr.theme
+        row = table.new_row(
+            align=tr_theme.text_align,
+            style=tr_theme.style,
+            border_line=tr_theme.border_line,
+            border_style=tr_theme.border_style,
+            border_visibility=tr_theme.border_visibility,
+        )
+        td_map = {}
+        for td in tr.contents:
+            if td.name in ("th", "td"):
+                td_theme = td.theme
+                td_theme.update_space(
+                    table_theme.content_width or table_theme.available_width,
+                    table_theme.content_height or table_theme.available_width,
+                )
+                cell = row.new_cell(
+                    text=await self.render_intrinsic_content(td) if measure else "",
+                    padding=td_theme.padding,
+                    border_line=td_theme.border_line,
+                    border_style=td_theme.border_style,
+                    align=td_theme.text_align,
+                    colspan=try_eval(td.attrs.get("colspan", 1)),
+                    rowspan=try_eval(td.attrs.get("rowspan", 1)),
+                    style=td_theme.style + " nounderline",
+                    width=td_theme.width if "width" in td_theme else None,
+                    border_visibility=td_theme.border_visibility,
+                )
+                # Save for later so we can add the contents once all the cells are
+                # created and we can calculate the cell widths
+                td_map[cell] = td
+        return td_map
+
+    async def _render_table_cell(
+        self, element: Node, td: Node, cell: Cell, col_width: int
+    ) -> StyleAndTextTuples:
+        """Render the contents of a table cell element to fit in its column."""
+        table_theme = element.theme
+        cell_padding = compute_padding(cell)
+        available_width = (
+            table_theme.max_width
+            if cell.colspan > 1
+            else col_width - cell_padding.left - cell_padding.right
+        )
+        td.theme.update_space(available_width, table_theme.available_height)
+        # TODO - get actual colspan cell widths properly
+        key = (available_width, table_theme.available_height, 0)
+        if (text := td.renderings.get(key)) is None:
+            fixed_count = self._fixed_count
+            text = await self.render_node_content(td, left=0)
+            self._cache_rendering(td, key, text, fixed_count)
+        return list(text)
+
+    async def render_virtual_table(
+        self, element: Node, trs: list[Node]
+    ) -> StyleAndTextTuples | None:
+        """Render a large table, deferring the rendering of most of its rows.
+
+        The table's column widths are calculated from a sample of its rows. The first
+        rows and the last row of the table are rendered immediately, and the remaining
+        rows are replaced with placeholders which are rendered when they are displayed.
+
+        Args:
+            element: The HTML table element
+            trs: The table's row elements, in display order
+
+        Returns:
+            The rendered table, or :py:const:`None` if the table cannot be virtualized
+
+        """
+        n_sample = _VIRTUAL_TABLE_SAMPLE_ROWS
+        last = len(trs) - 1
+
+        # Cells spanning multiple rows would cross the boundaries between virtual rows
+        if any(
+            "rowspan" in td.attrs and try_eval(td.attrs["rowspan"]) != 1
+            for tr in trs[n_sample:]
+            for td in tr.contents
+        ):
+            return None
+
+        # Calculate column widths from a sample of rows spread throughout the table
+        stride = max(1, (last - n_sample) // n_sample)
+        sample = trs[n_sample:last:stride]
+        table = self._new_table(element)
+        for tr in (*trs[:n_sample], *sample, trs[last]):
+            await self._add_table_row(element, table, tr)
+        col_widths = table.calculate_col_widths()
+        for tr in sample:
+            tr.reset()
+
+        chunks = await self._draw_table_rows(
+            element, trs[:n_sample], col_widths, following=trs[n_sample]
+        )
+        key = (element, tuple(col_widths))
+        if (virtual_table := self.virtual_tables.get(key)) is None:
+            content_widths = [
+                col_width - (padding := td.theme.padding).left - padding.right
+                for td, col_width in zip(
+                    (td for td in trs[n_sample].contents if td.name in {"td", "th"}),
+                    col_widths,
+                )
+            ]
+            virtual_table = self.virtual_tables[key] = VirtualTable(
+                self, element, trs, col_widths, content_widths
+            )
+
+        lines = [line for chunk in chunks for line in chunk]
+        width = max(map(fragment_list_width, lines), default=0)
+        # Render the first deferred row to find the number of lines in each border
+        border = len(
+            await virtual_table.render_row(n_sample)
+        ) - virtual_table.row_height(n_sample)
+        for index in range(n_sample, last):
+            lines.extend(
+                virtual_table.placeholder(index, line, width)
+                for line in range(border + virtual_table.row_height(index))
+            )
+        last_chunks = await self._draw_table_rows(element, trs[last:], col_widths)
+        lines.extend(line for chunk in last_chunks[1:] for line in chunk)
+
+        return join_lines(lines)
+
+    async def render_virtual_row(
+        self, table: VirtualTable, index: int
+    ) -> list[StyleAndTextTuples]:
+        """Render a row of a virtualized table, including the border below it."""
+        rows = table.rows
+        chunks = await self._draw_table_rows(
+            table.element,
+            rows[index : index + 1],
+            table.col_widths,
+            following=rows[index + 1],
+            height=table.row_height(index),
+        )
+        # Free the memory used to render the row's elements
+        rows[index].reset()
+        return chunks[1]
+
+    async def _draw_table_rows(
+        self,
+        element: Node,
+        trs: list[Node],
+        col_widths: list[int],
+        following: Node | None = None,
+        height: int | None = None,
+    ) -> list[list[StyleAndTextTuples]]:
+        """Draw the rows of a table using fixed column widths.
+
+        Args:
+            element: The HTML table element
+            trs: The table row elements to draw
+            col_widths: The widths of the table's columns
+            following: The row element after the last row to draw, used to draw the
+                border below the last row
+            height: If given, the cells of each row are truncated or padded to contain
+                this many lines
+
+        Returns:
+            The lines of the table's top border followed by the lines of each row
+            (including the border below each row)
+
+        """
+        table = self._new_table(element)
+        for tr in (*trs, following) if following is not None else trs:
+            td_map = await self._add_table_row(element, table, tr, measure=False)
+            for cell, col_width in zip(table.rows[-1].cells, col_widths):
+                if (td := td_map.get(cell)) is None:
+                    continue
+                if cell.colspan == 1:
+                    padding = compute_padding(cell)
+                    cell.width = max(0, col_width - padding.left - padding.right)
+                if tr is following:
+                    continue
+                text = await self._render_table_cell(element, td, cell, col_width)
+                if height is not None:
+                    cell_lines = list(split_lines(text))[:height]
+                    cell_lines += [[]] * (height - len(cell_lines))
+                    text = join_lines(cell_lines)
+                cell.text = text
+        chunks = list(table.render_rows())
+        if following is not None:
+            chunks.pop()
+        return chunks
+
     async def render_grid_content(
         self,
         element: Node,
@@ -4632,6 +5438,7 @@ class HTML:
             # If the rendering was a positioned absolutely or fixed, store it and draw it later
             if theme.theme["position"] == "fixed":
                 self.fixed[(theme.z_index, theme.anchors, theme.position)] = rendering
+                self._fixed_count += 1
 
             # if theme.theme["position"] == "absolute":
             #     self.floats[(theme.z_index, theme.anchors, theme.position)] = rendering
@@ -4672,15 +5479,21 @@ class HTML:
 
             elif d_inline or d_inline_block:
                 if d_inline:
-                    tokens = list(fragment_list_to_words(rendering))
+                    # Word measurements are cached per document, as fragments can
+                    # hold mouse handlers which reference the document's nodes
+                    key = tuple(rendering)
+                    tokens = self._words.get(key, partial(measure_words, key))
                 else:
-                    tokens = [rendering]
-
-                for token in tokens:
-                    token_lines = list(split_lines(token))
-                    token_width = max(fragment_list_width(line) for line in token_lines)
-                    token_height = len(token_lines)
+                    token_lines = list(split_lines(rendering))
+                    tokens = (
+                        (
+                            tuple(rendering),
+                            max(fragment_list_width(line) for line in token_lines),
+                            len(token_lines),
+                        ),
+                    )
 
+                for token, token_width, token_height in tokens:
                     # Deal with floats
 
                     float_width_right = (
@@ -4764,7 +5577,7 @@ class HTML:
                     else:
                         new_line, baseline = concat(
                             ft_a=new_line,
-                            ft_b=token,
+                            ft_b=list(token),
                             baseline_a=baseline,
                             baseline_b=int(theme.vertical_align * (token_height - 1)),
                             style=parent_theme.style,
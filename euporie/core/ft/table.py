@@ -1498,6 +1498,18 @@ class Table:
 
     def render(self, width: AnyDimension | None = None) -> StyleAndTextTuples:
         """Draw the table, optionally at a given character width."""
+        return join_lines(
+            [line for row_lines in self.render_rows(width) for line in row_lines]
+        )
+
+    def render_rows(
+        self, width: AnyDimension | None = None
+    ) -> Iterable[list[StyleAndTextTuples]]:
+        """Draw the table row by row, optionally at a given character width.
+
+        The first item yielded contains the lines of the table's top border. Each
+        subsequent item contains the lines of a row followed by the border below it.
+        """
         self.render_count += 1
         width = self.width if width is None else to_dimension(width)
 
@@ -1520,13 +1532,11 @@ class Table:
         col_widths = self.calculate_col_widths(width)
         cell_widths = self.calculate_cell_widths(width)
 
-        lines: list[StyleAndTextTuples] = []
-
         if self.rows:
             for i, (row_above, row_below) in enumerate(
                 pairwise([None, *self.rows, None])
             ):
-                lines.extend(
+                yield list(
                     self.draw_table_row(
                         row_above,
                         row_below,
@@ -1537,8 +1547,6 @@ class Table:
                     )
                 )
 
-        return join_lines(lines)
-
     def __pt_formatted_text__(self) -> StyleAndTextTuples:
         """Render the table as formatted text."""
         return self.render()
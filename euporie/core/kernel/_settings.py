@@ -1,5 +1,7 @@
 """Defines kernel settings."""
 
+import json
+
 from euporie.core.config import add_setting
 
 add_setting(
@@ -22,3 +24,34 @@ add_setting(
     Disable this setting if you prefer not to see these warnings.
     """,
 )
+
+add_setting(
+    name="kernel_pool",
+    group="euporie.core.kernel",
+    flags=["--kernel-pool"],
+    type_=json.loads,
+    default={},
+    schema={
+        "type": "object",
+        "additionalProperties": {"type": "integer", "minimum": 0},
+    },
+    help_="Number of pre-started kernels to keep ready per kernelspec",
+    description="""
+    A JSON object mapping Jupyter kernelspec names to the number of idle kernels of
+    that type which should be kept running in the background. The ``*`` key sets the
+    number for kernelspecs which are not listed.
+
+    Pooled kernels are started when euporie starts, for the listed kernelspecs and
+    the default kernel. When a notebook is opened or its kernel is restarted, a
+    kernel is taken from the pool if one is ready, avoiding the delay of waiting for
+    a new kernel to start. The pool is then replenished in the background. Idle
+    pooled kernels are shut down when euporie exits.
+
+    e.g.:
+
+    .. code-block:: json
+
+       { "python3": 2, "*": 0 }
+
+    """,
+)
@@ -5,14 +5,18 @@ from __future__ import annotations
 import asyncio
 import concurrent
 import logging
+import time
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
 from typing import TYPE_CHECKING, NamedTuple, TypedDict, overload
 
 from euporie.core.async_utils import get_or_create_loop, run_coro_async, run_coro_sync
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Coroutine
-    from typing import Any, Literal, Protocol, TypeVar, Unpack
+    from typing import Any, ClassVar, Literal, Protocol, TypeVar, Unpack
+
+    from prompt_toolkit.application import Application
 
     from euporie.core.tabs.kernel import KernelTab
 
@@ -64,9 +68,89 @@ class MsgCallbacks(TypedDict, total=False):
     ask_exit: Callable[[bool], None] | None
 
 
+class ExecutionTiming:
+    """Records when each stage of a code execution request is reached.
+
+    Times are recorded on the client side, so include any messaging latency.
+    """
+
+    stages: ClassVar[dict[str, str]] = {
+        "request_sent": "Request sent",
+        "busy": "Busy",
+        "first_output": "First output",
+        "execute_reply": "Reply",
+        "idle": "Idle",
+        "first_paint": "First paint",
+    }
+
+    def __init__(
+        self,
+        source: str,
+        set_metadata: Callable[[tuple[str, ...], Any], None] | None = None,
+    ) -> None:
+        """Create a new execution timing record.
+
+        Args:
+            source: The code being executed
+            set_metadata: If given, a callback used to record each stage's timestamp
+                in the cell's metadata
+        """
+        self.source = source
+        self.set_metadata = set_metadata
+        self.times: dict[str, float] = {}
+
+    def mark(self, stage: str) -> None:
+        """Record the time at which a stage is first reached."""
+        if stage in self.times:
+            return
+        self.times[stage] = now = time.time()
+        if callable(self.set_metadata):
+            self.set_metadata(
+                ("execution", "euporie.client", stage),
+                datetime.fromtimestamp(now, timezone.utc).isoformat(),
+            )
+
+    def mark_output(self, app: Application[Any]) -> None:
+        """Record the arrival of the first output, and when it is first painted.
+
+        This may be called from the kernel's thread, so the render handler is added
+        and removed on the application's event loop.
+        """
+        if "first_output" in self.times:
+            return
+        self.mark("first_output")
+        # Nothing is painted if the application is not running
+        if (loop := app.loop) is None:
+            return
+
+        def _remove() -> None:
+            app.after_render -= _painted
+
+        def _painted(sender: Application[Any]) -> None:
+            self.mark("first_paint")
+            # Handlers are being iterated over, so this one is removed afterwards
+            loop.call_soon(_remove)
+
+        def _add() -> None:
+            app.after_render += _painted
+
+        loop.call_soon_threadsafe(_add)
+
+    def elapsed(self, stage: str) -> float | None:
+        """Return the time in seconds from sending the request to reaching a stage."""
+        if (start := self.times.get("request_sent")) is not None and (
+            end := self.times.get(stage)
+        ) is not None:
+            return end - start
+        return None
+
+
 class BaseKernel(ABC):
     """Abstract base class for euporie kernels."""
 
+    # The number of recent executions for which timing data is retained
+    max_timings = 50
+
     @classmethod
     def variants(cls) -> list[KernelInfo]:
         """Return a list of parameterized variants of this kernel."""
@@ -97,6 +181,7 @@ class BaseKernel(ABC):
         self.status_change_event = asyncio.Event()
         self.coros: dict[str, concurrent.futures.Future] = {}
         self.msg_id_callbacks: dict[str, MsgCallbacks] = {}
+        self.timings: dict[str, ExecutionTiming] = {}
 
         self.default_callbacks = MsgCallbacks(
             {
@@ -112,6 +197,34 @@ class BaseKernel(ABC):
         if default_callbacks is not None:
             self.default_callbacks.update(default_callbacks)
 
+    def new_timing(
+        self,
+        key: str,
+        source: str,
+        set_metadata: Callable[[tuple[str, ...], Any], None] | None = None,
+    ) -> ExecutionTiming:
+        """Start recording the timing of a new code execution request.
+
+        Args:
+            key: A unique identifier for the execution request
+            source: The code being executed
+            set_metadata: The callback used to set the executing cell's metadata.
+                Timestamps are only recorded in the metadata if the
+                ``record_cell_timing`` setting is enabled
+
+        Returns:
+            A new execution timing record
+        """
+        if not self.kernel_tab.app.config.record_cell_timing:
+            set_metadata = None
+        timing = ExecutionTiming(source, set_metadata)
+        timing.mark("request_sent")
+        timings = self.timings
+        timings[key] = timing
+        while len(timings) > self.max_timings:
+            del timings[next(iter(timings))]
+        return timing
+
     @property
     @abstractmethod
     def spec(self) -> dict[str, str]:
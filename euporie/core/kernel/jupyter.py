@@ -3,11 +3,15 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import os
+import sys
 import threading
 from collections import defaultdict
 from functools import partial
+from hashlib import md5
+from importlib.util import find_spec
 from subprocess import PIPE, STDOUT  # S404 - Security implications considered
 from typing import TYPE_CHECKING, cast
 from uuid import uuid4
@@ -25,6 +29,7 @@ if TYPE_CHECKING:
     from jupyter_client import KernelClient
     from jupyter_client.kernelspec import KernelSpecManager
 
+    from euporie.core.kernel.jupyter_manager import EuporieKernelManager
     from euporie.core.tabs.kernel import KernelTab
 
 
@@ -39,17 +44,69 @@ class JupyterKernel(BaseKernel):
 
     _client_id = f"euporie-{os.getpid()}"
     _spec_manager: KernelSpecManager
+    _spec_cache: dict[str, Any] | None = None
+
+    @staticmethod
+    def _mtime(path: str) -> int | None:
+        """Return the modification time of a path, or `None` if it does not exist."""
+        try:
+            return UPath(path).stat().st_mtime_ns
+        except OSError:
+            return None
 
     @classmethod
-    def variants(cls) -> list[KernelInfo]:
-        """Return available kernel specifications."""
-        from jupyter_core.paths import jupyter_runtime_dir
+    def _spec_cache_valid(cls, cache: dict[str, Any], dirs: list[str]) -> bool:
+        """Check if cached kernelspecs are still valid.
+
+        The cache is invalidated if any kernelspec directory has been modified (a
+        kernelspec has been added or removed), if any of the cached kernelspec files has
+        been modified, or if the availability of the native kernel has changed.
+        """
+        return (
+            cache.get("dirs") == [[path, cls._mtime(path)] for path in dirs]
+            and cache.get("native") == (find_spec("ipykernel") is not None)
+            and all(
+                cls._mtime(path) == mtime
+                for path, mtime in cache.get("files", {}).items()
+            )
+        )
+
+    @classmethod
+    def _get_all_specs(cls) -> dict[str, dict[str, Any]]:
+        """Return all kernelspecs, using cached results if they are still valid.
+
+        Discovered kernelspecs are cached in memory and on disk, so the kernelspec
+        directories do not need to be scanned (and :py:mod:`jupyter_client` does not
+        need to be imported) every time the list of kernels is required.
+        """
+        from jupyter_core.paths import jupyter_path
+
+        from euporie.core.cache import cache_dir
+
+        dirs = jupyter_path("kernels")
+        # Kernelspec search paths depend on the environment, so cache per prefix
+        prefix_hash = md5(sys.prefix.encode(), usedforsecurity=False).hexdigest()[:8]
+        cache_path = cache_dir("kernelspecs") / f"{prefix_hash}.json"
+
+        # Check the in-memory cache, then the on-disk cache
+        if (cache := cls._spec_cache) is not None and cls._spec_cache_valid(
+            cache, dirs
+        ):
+            return cache["specs"]
+        try:
+            cache = json.loads(cache_path.read_text())
+        except (OSError, ValueError):
+            pass
+        else:
+            if isinstance(cache, dict) and cls._spec_cache_valid(cache, dirs):
+                cls._spec_cache = cache
+                return cache["specs"]
 
+        # Scan the kernelspec directories
         try:
             manager = cls._spec_manager
         except AttributeError:
             from jupyter_client.kernelspec import KernelSpecManager
-            from jupyter_core.paths import jupyter_path
 
             manager = cls._spec_manager = KernelSpecManager()
             # Set the kernel folder list to prevent the default method from running.
@@ -59,7 +116,32 @@ class JupyterKernel(BaseKernel):
             # import race condition error where IPython was imported in the main thread for
             # displaying LaTeX and in the kernel thread to discover kernel paths.
             # Also this speeds up launch since importing IPython is pretty slow.
-            manager.kernel_dirs = jupyter_path("kernels")
+            manager.kernel_dirs = dirs
+        log.debug("Scanning for kernelspecs")
+        specs = manager.get_all_specs()
+
+        cls._spec_cache = cache = {
+            "dirs": [[path, cls._mtime(path)] for path in dirs],
+            "native": find_spec("ipykernel") is not None,
+            "files": {
+                (path := str(UPath(info["resource_dir"]) / "kernel.json")): (
+                    cls._mtime(path)
+                )
+                for info in specs.values()
+            },
+            "specs": specs,
+        }
+        try:
+            cache_path.parent.mkdir(exist_ok=True, parents=True)
+            cache_path.write_text(json.dumps(cache))
+        except (OSError, TypeError, ValueError):
+            log.debug("Could not write kernelspec cache to '%s'", cache_path)
+        return specs
+
+    @classmethod
+    def variants(cls) -> list[KernelInfo]:
+        """Return available kernel specifications."""
+        from jupyter_core.paths import jupyter_runtime_dir
 
         return [
             KernelInfo(
@@ -69,7 +151,7 @@ class JupyterKernel(BaseKernel):
                 kind="new",
                 type=cls,
             )
-            for name, info in manager.get_all_specs().items()
+            for name, info in cls._get_all_specs().items()
         ] + [
             KernelInfo(
                 name=path.name,
@@ -116,8 +198,6 @@ class JupyterKernel(BaseKernel):
         set_default_provisioner()
 
         if kernel_name is None and connection_file is not None:
-            import json
-
             try:
                 connection_info = json.loads(connection_file.read_text())
             except json.decoder.JSONDecodeError:
@@ -214,6 +294,14 @@ class JupyterKernel(BaseKernel):
         log.debug("Starting kernel")
         self.status = "starting"
 
+        # Use a pre-started kernel from the kernel pool if one is ready
+        if self.connection_file is None and (km := await self._take_pooled_kernel()):
+            log.info("Using pre-started kernel %s", km.kernel_name)
+            self.km = km
+            self.kc = km.client()
+            await self.post_start()
+            return
+
         # If we are connecting to an existing kernel, create a kernel client using
         # the given connection file
         runtime_dir = UPath(jupyter_runtime_dir())
@@ -260,6 +348,14 @@ class JupyterKernel(BaseKernel):
 
         await self.post_start()
 
+    async def _take_pooled_kernel(self) -> EuporieKernelManager | None:
+        """Take a running kernel from the kernel pool if the pool is enabled."""
+        from euporie.core.kernel.jupyter_manager import KernelPool
+
+        if not (sizes := self.kernel_tab.app.config.kernel_pool) or self.missing:
+            return None
+        return await KernelPool.get(self.loop).take(self.km.kernel_name, sizes)
+
     @property
     def spec(self) -> dict[str, str]:
         """The kernelspec metadata for the current kernel instance."""
@@ -401,6 +497,9 @@ class JupyterKernel(BaseKernel):
         msg_id = rsp.get("parent_header", {}).get("msg_id")
         content = rsp.get("content", {})
 
+        if timing := self.timings.get(msg_id):
+            timing.mark("execute_reply")
+
         if self.kernel_tab.app.config.record_cell_timing and callable(
             set_metadata := self.msg_id_callbacks[msg_id]["set_metadata"]
         ):
@@ -506,6 +605,9 @@ class JupyterKernel(BaseKernel):
         if callable(set_status := self.msg_id_callbacks[msg_id].get("set_status")):
             set_status(status)
 
+        if status in {"busy", "idle"} and (timing := self.timings.get(msg_id)):
+            timing.mark(status)
+
         if status == "idle":
             if self.kernel_tab.app.config.record_cell_timing and callable(
                 set_metadata := self.msg_id_callbacks[msg_id].get("set_metadata")
@@ -552,21 +654,38 @@ class JupyterKernel(BaseKernel):
         if callable(add_input := self.msg_id_callbacks[msg_id].get("add_input")):
             add_input(content, own)
 
+    def _mark_output(self, msg_id: str) -> None:
+        """Record the receipt of an output for an execution request."""
+        if timing := self.timings.get(msg_id):
+            timing.mark_output(self.kernel_tab.app)
+
     def on_iopub_display_data(self, rsp: dict[str, Any], own: bool) -> None:
         """Call callbacks for an iopub display data response."""
         msg_id = rsp.get("parent_header", {}).get("msg_id")
+        self._mark_output(msg_id)
         if callable(add_output := self.msg_id_callbacks[msg_id]["add_output"]):
-            add_output(output_from_msg(rsp), own)
+            output_json = output_from_msg(rsp)
+            # Retain the display ID so the output can be updated later
+            if transient := rsp.get("content", {}).get("transient"):
+                output_json["transient"] = transient
+            add_output(output_json, own)
 
     def on_iopub_update_display_data(self, rsp: dict[str, Any], own: bool) -> None:
-        """Call callbacks for an iopub update display data response."""
-        msg_id = rsp.get("parent_header", {}).get("msg_id")
-        if callable(add_output := self.msg_id_callbacks[msg_id]["add_output"]):
-            add_output(output_from_msg(rsp), own)
+        """Update outputs in-place for an iopub update display data response."""
+        content = rsp.get("content", {})
+        self.kernel_tab.update_display(
+            {
+                "output_type": "display_data",
+                "data": content.get("data", {}),
+                "metadata": content.get("metadata", {}),
+                "transient": content.get("transient", {}),
+            }
+        )
 
     def on_iopub_execute_result(self, rsp: dict[str, Any], own: bool) -> None:
         """Call callbacks for an iopub execute result response."""
         msg_id = rsp.get("parent_header", {}).get("msg_id")
+        self._mark_output(msg_id)
         if callable(add_output := self.msg_id_callbacks[msg_id]["add_output"]):
             add_output(output_from_msg(rsp), own)
 
@@ -582,6 +701,7 @@ class JupyterKernel(BaseKernel):
     def on_iopub_error(self, rsp: dict[str, Any], own: bool) -> None:
         """Call callbacks for an iopub error response."""
         msg_id = rsp.get("parent_header", {}).get("msg_id", "")
+        self._mark_output(msg_id)
         if callable(add_output := self.msg_id_callbacks[msg_id].get("add_output")):
             add_output(output_from_msg(rsp), own)
         if callable(done := self.msg_id_callbacks[msg_id].get("done")):
@@ -590,6 +710,7 @@ class JupyterKernel(BaseKernel):
     def on_iopub_stream(self, rsp: dict[str, Any], own: bool) -> None:
         """Call callbacks for an iopub stream response."""
         msg_id = rsp.get("parent_header", {}).get("msg_id")
+        self._mark_output(msg_id)
         if callable(add_output := self.msg_id_callbacks[msg_id]["add_output"]):
             add_output(output_from_msg(rsp), own)
 
@@ -671,6 +792,7 @@ class JupyterKernel(BaseKernel):
             store_history=True,
             allow_stdin=self.allow_stdin,
         )
+        self.new_timing(msg_id, source, local_callbacks.get("set_metadata"))
 
         if done := local_callbacks.get("done"):
 
@@ -908,11 +1030,26 @@ class JupyterKernel(BaseKernel):
             task.cancel()
         self.error = None
         self.status = "starting"
-        try:
-            await self.km.restart_kernel(now=True)
+        # Replace the kernel with a pre-started kernel from the pool if one is ready
+        if (
+            self.connection_file is None
+            and self.km.has_kernel
+            and (km := await self._take_pooled_kernel())
+        ):
+            from euporie.core.kernel.jupyter_manager import KernelPool
+
+            if self.kc is not None:
+                self.kc.stop_channels()
+            KernelPool.get(self.loop).retire(self.km)
+            self.km = km
+            self.kc = km.client()
             await self.post_start()
-        except asyncio.exceptions.InvalidStateError:
-            await self.start_async()
+        else:
+            try:
+                await self.km.restart_kernel(now=True)
+                await self.post_start()
+            except asyncio.exceptions.InvalidStateError:
+                await self.start_async()
         log.debug("Kernel %s restarted", self.id)
 
     def stop(self, cb: Callable | None = None, wait: bool = False) -> None:
@@ -2,19 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
 import sys
 import threading
+from collections import defaultdict
+from subprocess import PIPE, STDOUT  # S404 - Security implications considered
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from jupyter_client import AsyncKernelManager
 from jupyter_client.provisioning.local_provisioner import LocalProvisioner
+from upath import UPath
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
-    from typing import Any, TextIO
+    from collections.abc import Callable, Mapping
+    from typing import Any, ClassVar, TextIO
 
     from jupyter_client.connect import KernelConnectionInfo
 
@@ -114,3 +119,185 @@ class EuporieKernelManager(AsyncKernelManager):
             return ns.get(match.group(1), match.group())
 
         return [pat.sub(_from_ns, arg) for arg in cmd]
+
+
+class KernelPool:
+    """Keep a number of pre-started kernels ready to be handed out.
+
+    Starting a kernel and waiting for it to respond to a ``kernel_info`` request can
+    take several seconds. The pool starts kernels in the background so that new
+    notebooks and kernel restarts can use a kernel which is already running.
+
+    All methods should be called from within the pool's event loop, except for
+    :py:meth:`prefill` and :py:meth:`close_all`, which are called by the application
+    as it starts and exits.
+    """
+
+    _instances: ClassVar[dict[asyncio.AbstractEventLoop, KernelPool]] = {}
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Create a new kernel pool.
+
+        Args:
+            loop: The event loop in which kernels are started
+        """
+        self.loop = loop
+        self.idle: dict[str, list[EuporieKernelManager]] = defaultdict(list)
+        self.starting: dict[str, int] = defaultdict(int)
+        self.tasks: set[asyncio.Task] = set()
+        self.closed = False
+
+    @classmethod
+    def get(cls, loop: asyncio.AbstractEventLoop) -> KernelPool:
+        """Return the kernel pool for an event loop, creating it if necessary."""
+        if (pool := cls._instances.get(loop)) is None:
+            pool = cls._instances[loop] = cls(loop)
+        return pool
+
+    @classmethod
+    def prefill(cls, sizes: Mapping[str, int], default_kernel_name: str = "") -> None:
+        """Start filling the kernel pool on the kernel event loop.
+
+        Args:
+            sizes: A mapping of kernelspec names to pool sizes
+            default_kernel_name: The name of the kernelspec used by default, which is
+                filled according to the ``*`` size if it is not listed
+        """
+        from euporie.core.async_utils import get_or_create_loop
+
+        loop = get_or_create_loop("kernel")
+        pool = cls.get(loop)
+        names = {name for name in sizes if name != "*"}
+        if default_kernel_name:
+            names.add(default_kernel_name)
+        for name in sorted(names):
+            loop.call_soon_threadsafe(pool.fill, name, sizes)
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Shut down the kernels in all kernel pools."""
+        for pool in list(cls._instances.values()):
+            pool.close()
+
+    @staticmethod
+    def size(kernel_name: str, sizes: Mapping[str, int]) -> int:
+        """Return the number of kernels to keep ready for a kernelspec.
+
+        Args:
+            kernel_name: The name of the kernelspec
+            sizes: A mapping of kernelspec names to pool sizes. The ``*`` key sets the
+                size for kernelspecs which are not listed
+
+        Returns:
+            The number of idle kernels to keep running
+        """
+        return max(0, sizes.get(kernel_name, sizes.get("*", 0)))
+
+    def fill(self, kernel_name: str, sizes: Mapping[str, int]) -> None:
+        """Start new kernels in the background until the pool is full."""
+        if self.closed:
+            return
+        missing = (
+            self.size(kernel_name, sizes)
+            - len(self.idle[kernel_name])
+            - self.starting[kernel_name]
+        )
+        for _ in range(missing):
+            self.starting[kernel_name] += 1
+            self._add_task(self._start(kernel_name))
+
+    async def take(
+        self, kernel_name: str, sizes: Mapping[str, int]
+    ) -> EuporieKernelManager | None:
+        """Remove a running kernel from the pool and replenish the pool.
+
+        Args:
+            kernel_name: The name of the kernelspec of the required kernel
+            sizes: A mapping of kernelspec names to pool sizes
+
+        Returns:
+            The manager of a running kernel, or :py:const:`None` if no kernel is ready
+        """
+        km = None
+        idle = self.idle[kernel_name]
+        while idle and km is None:
+            km = idle.pop(0)
+            # Discard kernels which have died while waiting in the pool
+            if not await km.is_alive():
+                self.retire(km)
+                km = None
+        self.fill(kernel_name, sizes)
+        return km
+
+    def retire(self, km: EuporieKernelManager) -> None:
+        """Shut down a kernel in the background."""
+        self._add_task(self._shutdown(km))
+
+    def _add_task(self, coro: Any) -> None:
+        task = self.loop.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _start(self, kernel_name: str) -> None:
+        """Start a kernel and wait for it to become ready."""
+        from jupyter_core.paths import jupyter_runtime_dir
+
+        km = EuporieKernelManager(kernel_name=kernel_name)
+        runtime_dir = UPath(jupyter_runtime_dir())
+        runtime_dir.mkdir(exist_ok=True, parents=True)
+        km.connection_file = str(runtime_dir / f"kernel-euporie-{uuid4().hex[:8]}.json")
+        try:
+            await km.start_kernel(stdout=PIPE, stderr=STDOUT, text=True)
+            kc = km.client()
+            try:
+                await kc._async_wait_for_ready(timeout=30)
+            finally:
+                kc.stop_channels()
+        except asyncio.CancelledError:
+            await self._shutdown(km)
+            raise
+        except Exception:
+            log.exception("Could not start pooled kernel '%s'", kernel_name)
+            await self._shutdown(km)
+        else:
+            if self.closed:
+                await self._shutdown(km)
+            else:
+                log.debug("Pooled kernel '%s' ready", kernel_name)
+                self.idle[kernel_name].append(km)
+        finally:
+            self.starting[kernel_name] -= 1
+
+    @staticmethod
+    async def _shutdown(km: EuporieKernelManager) -> None:
+        """Shut down a kernel."""
+        try:
+            if km.has_kernel:
+                await km.shutdown_kernel(now=True)
+        except Exception:
+            log.exception("Error shutting down kernel")
+        km.cleanup_connection_file()
+
+    async def shutdown(self) -> None:
+        """Shut down all kernels in the pool."""
+        self.closed = True
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(
+            *(self._shutdown(km) for kms in self.idle.values() for km in kms),
+            *self.tasks,
+            return_exceptions=True,
+        )
+        self.idle.clear()
+
+    def close(self) -> None:
+        """Shut down all kernels in the pool from outside the pool's event loop."""
+        try:
+            if self.loop.is_running():
+                asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result(
+                    timeout=10
+                )
+            elif not self.loop.is_closed():
+                self.loop.run_until_complete(self.shutdown())
+        except Exception:
+            log.exception("Error shutting down kernel pool")
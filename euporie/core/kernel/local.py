@@ -17,6 +17,7 @@ from functools import update_wrapper
 from linecache import cache as line_cache
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
+from uuid import uuid4
 
 from pygments import highlight
 from pygments.formatters import Terminal256Formatter
@@ -398,7 +399,17 @@ class LocalPythonKernel(BaseKernel):
             }
         )
 
+        timing = self.new_timing(uuid4().hex, source, callbacks.get("set_metadata"))
+        if callable(add_output := callbacks.get("add_output")):
+
+            def _add_output(output_json: dict[str, Any], own: bool) -> None:
+                timing.mark_output(self.kernel_tab.app)
+                add_output(output_json, own)
+
+            callbacks["add_output"] = _add_output
+
         self.status = "busy"
+        timing.mark("busy")
 
         # Handle magics before normal execution
         handled = await self._handle_magic(source, callbacks)
@@ -437,7 +448,9 @@ class LocalPythonKernel(BaseKernel):
             # Execute the code
             await to_thread(self._execute_code, body, last, filename, callbacks)
 
+        timing.mark("execute_reply")
         self.status = "idle"
+        timing.mark("idle")
 
         if callable(done := callbacks.get("done")):
             done({"status": "ok"})
@@ -680,6 +693,7 @@ class DisplayGlobal(BaseHook):
         metadata: dict[str, Any] | None = None,
         transient: dict[str, Any] | None = None,
         display_id: str | None = None,
+        update: bool = False,
         raw: bool = False,
         clear: bool = False,
         **kwargs: Any,
@@ -697,6 +711,8 @@ class DisplayGlobal(BaseHook):
                 in the notebook document.
             display_id: Unique identifier for the display. Can be used to update
                 this display output later.
+            update: If True, update the existing outputs with the given
+                ``display_id`` in-place rather than creating a new output.
             raw: If True, skip MIME type transformation/formatting of the objects.
             clear: If True, clear the output before displaying new content.
             **kwargs: Additional display arguments passed to the frontend.
@@ -722,16 +738,20 @@ class DisplayGlobal(BaseHook):
             if metadata:
                 obj_metadata.update(metadata)
 
-            add_output(
-                {
-                    "output_type": "display_data",
-                    "data": data,
-                    "metadata": obj_metadata,
-                    "transient": transient,
-                    "display_id": display_id,
-                },
-                True,
-            )
+            output_json: dict[str, Any] = {
+                "output_type": "display_data",
+                "data": data,
+                "metadata": obj_metadata,
+            }
+            if display_id is not None:
+                transient = {**(transient or {}), "display_id": display_id}
+            if transient:
+                output_json["transient"] = transient
+
+            if update and display_id is not None:
+                self._kernel.kernel_tab.update_display(output_json)
+            else:
+                add_output(output_json, True)
 
 
 class InputBuiltin(BaseHook):
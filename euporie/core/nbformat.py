@@ -1,7 +1,8 @@
 """A simple, fast, version of `nbformat` which avoids validation at start-up.
 
 Implements fast versions of `new_notebook` and `new_code_cell` functions which do not
-perform validation, so do not require `jsonschema` to be imported.
+perform validation, so do not require `jsonschema` to be imported, and a fast reader
+and writer for `.ipynb` files.
 
 Other functions are provided as shims which lazily import from the `nbformat`
 library, so they do not affect application start-up time.
@@ -9,15 +10,31 @@ library, so they do not affect application start-up time.
 
 from __future__ import annotations
 
+import codecs
+import contextlib
+import copy
+import hashlib
 import json
 import logging
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
 from collections.abc import Mapping
+from contextvars import ContextVar
+from functools import cache, partial
 from importlib.util import find_spec
+from itertools import chain, count, groupby
+from json.encoder import encode_basestring
+from pathlib import Path, PosixPath, WindowsPath
+from types import GeneratorType
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Callable, Iterator
     from typing import IO, Any
 
 log = logging.getLogger(__name__)
@@ -77,6 +94,32 @@ if find_spec("jupytext") is not None:
         ]
     )
 
+# Mime-bundle values larger than this many bytes are read from the file when needed
+_LAZY_PAYLOAD_SIZE = 2**16
+
+# Mime-types other than ``text/*`` with values which are split into lines in files
+_SPLIT_MIMES = {"application/javascript", "image/svg+xml"}
+
+# Transient notebook metadata which is not saved to files
+_TRANSIENT_METADATA = {"orig_nbformat", "orig_nbformat_minor", "signature"}
+
+# The directory next to notebooks in which external output data is stored
+OUTPUT_STORE_DIR = ".ipynb_outputs"
+
+# The maximum size of encoded cells which are cached when notebooks are written
+_MAX_CACHED_CELL_SIZE = 2**20
+
+# Used to release memory mapped pages of notebook files once they have been parsed
+_MADV_DONTNEED = getattr(mmap, "MADV_DONTNEED", None)
+
+# The size of chunks of text read when notebooks are read progressively
+_CHUNK_SIZE = 2**20
+_KEY_END_RE = re.compile(r"\s*:\s*(?=\S)")
+_WHITESPACE_RE = re.compile(r"\s*")
+
+# Matches the start of string values in mime-bundles
+_MIME_STRING_RE = re.compile(rb'"[a-z]+/[-\w.+]+"\s*:\s*"')
+
 # ################################# Fast Implementations #################################
 
 
@@ -129,10 +172,290 @@ class NotebookNode(dict):
         return d
 
 
-def _rejoin_mimebundle(data: dict[str, Any]) -> dict[str, Any]:
-    """Rejoin the multi-line string fields in a mimebundle in-place."""
+class _PayloadFile:
+    """A notebook file from which lazy payloads are read."""
+
+    def __init__(self, fileno: int, name: str) -> None:
+        """Keep a handle to an open notebook file.
+
+        Args:
+            fileno: The file descriptor of the open notebook file
+            name: The name of the notebook file
+        """
+        self.name = name
+        self.file = open(os.dup(fileno), "rb")  # noqa: PTH123, SIM115
+        stat = os.fstat(self.file.fileno())
+        self.stamp = (stat.st_size, stat.st_mtime_ns)
+        self.lock = threading.Lock()
+
+    def read(self, start: int, end: int) -> bytes:
+        """Read a range of bytes from the file."""
+        with self.lock:
+            stat = os.fstat(self.file.fileno())
+            if (stat.st_size, stat.st_mtime_ns) != self.stamp:
+                raise OSError(f"{self.name} was modified after it was loaded")
+            self.file.seek(start)
+            return self.file.read(end - start)
+
+    def __del__(self) -> None:
+        """Close the file when it is no longer needed."""
+        self.file.close()
+
+
+class LazyPayload:
+    """A large mime-bundle value which is only read from a notebook file when needed.
+
+    The file is kept open, so the value can still be read if the file is replaced.
+    """
+
+    __slots__ = ("end", "file", "start")
+
+    def __init__(self, file: _PayloadFile, start: int, end: int) -> None:
+        """Create a reference to the value of a JSON string in a notebook file.
+
+        Args:
+            file: The file containing the value
+            start: The offset of the first byte of the string's content
+            end: The offset of the closing quote of the string
+        """
+        self.file = file
+        self.start = start
+        self.end = end
+
+    def raw(self) -> str:
+        """Read the JSON encoded value from the file, without its quotes."""
+        return self.file.read(self.start, self.end).decode()
+
+    def load(self) -> str:
+        """Read and decode the value from the file."""
+        return json.loads(f'"{self.raw()}"')
+
+    def __copy__(self) -> LazyPayload:
+        """Lazy payloads are immutable, so are not copied."""
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> LazyPayload:
+        """Lazy payloads are immutable, so are not copied."""
+        return self
+
+    def __repr__(self) -> str:
+        """Return a representation of the payload."""
+        return f"{type(self).__name__}({self.file.name!r}, {self.start}, {self.end})"
+
+
+class StoredPayload(LazyPayload):
+    """An output value which is stored in an :py:class:`OutputStore`."""
+
+    __slots__ = ("digest", "path")
+
+    def __init__(self, path: Path, digest: str) -> None:
+        """Create a reference to a value in an output store.
+
+        Args:
+            path: The path of the file containing the value
+            digest: The SHA-256 hash of the value
+        """
+        self.path = path
+        self.digest = digest
+
+    def raw(self) -> str:
+        """Return the JSON encoded value, without its quotes."""
+        return encode_basestring(self.load())[1:-1]
+
+    def load(self) -> str:
+        """Read the value from the output store."""
+        return self.path.read_text(encoding="utf-8")
+
+    def __repr__(self) -> str:
+        """Return a representation of the payload."""
+        return f"{type(self).__name__}({str(self.path)!r})"
+
+
+class OutputStore:
+    """A content-addressed directory in which large output values are stored.
+
+    Values are stored in files named by the SHA-256 hash of their content, so a value
+    is only stored once, even if it is used by several notebooks.
+    """
+
+    def __init__(self, path: Path, min_size: int) -> None:
+        """Create a new output store.
+
+        Args:
+            path: The path of the directory in which values are stored
+            min_size: The minimum size of values which are added to the store
+        """
+        self.path = path
+        self.min_size = min_size
+
+    def should_store(self, value: Any) -> bool:
+        """Determine if an output value is large enough to be stored."""
+        if isinstance(value, StoredPayload):
+            return True
+        if isinstance(value, LazyPayload):
+            return value.end - value.start >= self.min_size
+        return isinstance(value, str) and len(value) >= self.min_size
+
+    def add(self, value: str | LazyPayload) -> str:
+        """Add a value to the store if it is not already present.
+
+        Returns:
+            The hash of the value, which can be used to retrieve it from the store
+
+        """
+        if isinstance(value, StoredPayload) and value.path.parent == self.path:
+            return value.digest
+        data = load_payload(value).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path / digest
+        if not path.exists():
+            self.path.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so incomplete values are never stored
+            temp = self.path / f".{digest}.{uuid4().hex}.tmp"
+            try:
+                temp.write_bytes(data)
+                temp.replace(path)
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    temp.unlink()
+                raise
+        return digest
+
+    def get(self, digest: str) -> StoredPayload | None:
+        """Return a stored value, or :py:const:`None` if it is not in the store."""
+        path = self.path / digest
+        if path.is_file():
+            return StoredPayload(path, digest)
+        return None
+
+
+def load_payload(value: Any) -> Any:
+    """Return a mime-bundle value, reading it from the file if it was loaded lazily."""
+    if isinstance(value, LazyPayload):
+        return value.load()
+    return value
+
+
+def _load_payloads(
+    node: Any, placeholders: dict[str, LazyPayload] | None = None
+) -> None:
+    """Replace lazy payloads with their values in-place.
+
+    If ``placeholders`` are given, only placeholders for lazy payloads are replaced.
+    """
+    if isinstance(node, dict):
+        items: Any = node.items()
+    elif isinstance(node, list):
+        items = enumerate(node)
+    else:
+        return
+    for key, value in list(items):
+        if isinstance(value, (dict, list)):
+            _load_payloads(value, placeholders)
+        elif placeholders is None:
+            if isinstance(value, LazyPayload):
+                node[key] = value.load()
+        elif isinstance(value, str) and (payload := placeholders.get(value)):
+            node[key] = payload.load()
+
+
+def _lazy_fileno(fp: IO[str]) -> int | None:
+    """Return the file descriptor of a file which large values can be left in."""
+    try:
+        fileno = fp.fileno()
+        size = os.fstat(fileno).st_size
+        encoding = codecs.lookup(getattr(fp, "encoding", None) or "utf-8").name
+    except (AttributeError, OSError, ValueError):
+        return None
+    # Remote and small files, and unusual encodings, are parsed normally. Files which
+    # are held open cannot be replaced on Windows, so are also parsed normally there
+    if size < _LAZY_PAYLOAD_SIZE or encoding != "utf-8" or os.name == "nt":
+        return None
+    return fileno
+
+
+def _scan(
+    fp: IO[str], fileno: int, placeholders: dict[str, LazyPayload]
+) -> Iterator[str]:
+    """Decode a notebook file, replacing large mime-bundle values with placeholders.
+
+    The text of the file is yielded in chunks. Placeholders are added to
+    ``placeholders`` before the text containing them is yielded.
+    """
+    file: _PayloadFile | None = None
+    token = uuid4().hex
+    counter = count()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as data:
+
+        def _decode(start: int, end: int) -> Iterator[str]:
+            for i in range(start, end, _CHUNK_SIZE):
+                yield decoder.decode(data[i : min(i + _CHUNK_SIZE, end)])
+
+        pos = released = 0
+        for match in _MIME_STRING_RE.finditer(data):
+            # The key's opening quote must not be escaped, so cannot be in a string
+            if data[match.start() - 1] == ord("\\"):
+                continue
+            # Find the closing quote of the value, skipping any escaped quotes
+            start = end = match.end()
+            while (end := data.find(b'"', end)) != -1:
+                escapes = 0
+                while data[end - escapes - 1] == ord("\\"):
+                    escapes += 1
+                if not escapes % 2:
+                    break
+                end += 1
+            if end - start < _LAZY_PAYLOAD_SIZE:
+                continue
+            if file is None:
+                file = _PayloadFile(fileno, str(getattr(fp, "name", "")))
+            placeholder = f"{token}{next(counter)}"
+            placeholders[placeholder] = LazyPayload(file, start, end)
+            yield from _decode(pos, start)
+            yield placeholder
+            pos = end
+            # Release pages of the file which have already been scanned
+            if (
+                _MADV_DONTNEED is not None
+                and (done := pos - pos % mmap.PAGESIZE) - released >= 2**24
+            ):
+                data.madvise(_MADV_DONTNEED, released, done - released)
+                released = done
+        yield from _decode(pos, len(data))
+        yield decoder.decode(b"", final=True)
+
+
+def _parse(fp: IO[str], **kwargs: Any) -> tuple[Any, dict[str, LazyPayload]]:
+    """Parse a notebook file, leaving large mime-bundle values in the file.
+
+    Large values are replaced with unique placeholder strings before the JSON is
+    parsed. These are returned, mapped to :py:class:`LazyPayload` objects which can
+    be used to load the values later.
+    """
+    if (fileno := _lazy_fileno(fp)) is None:
+        return json.load(fp, object_pairs_hook=NotebookNode, **kwargs), {}
+    placeholders: dict[str, LazyPayload] = {}
+    text = "".join(_scan(fp, fileno, placeholders))
+    return json.loads(text, object_pairs_hook=NotebookNode, **kwargs), placeholders
+
+
+def _rejoin_mimebundle(
+    data: dict[str, Any], placeholders: dict[str, LazyPayload] | None = None
+) -> dict[str, Any]:
+    """Rejoin the multi-line string fields in a mimebundle in-place.
+
+    Any placeholders for lazily loaded values found are replaced with their
+    :py:class:`LazyPayload`, and removed from ``placeholders``.
+    """
     for key, value in list(data.items()):
         if (
+            placeholders
+            and isinstance(value, str)
+            and (payload := placeholders.pop(value, None)) is not None
+        ):
+            data[key] = payload
+        elif (
             key != "application/json"
             and not (key.startswith("application/") and key.endswith("+json"))
             and isinstance(value, list)
@@ -142,23 +465,104 @@ def _rejoin_mimebundle(data: dict[str, Any]) -> dict[str, Any]:
     return data
 
 
-def _rejoin_lines(nb: NotebookNode) -> NotebookNode:
-    """Rejoin multiline text into strings, reversing effects of :py:func:`split_lines`."""
-    for cell in nb.cells:
-        if "source" in cell and isinstance(cell.source, list):
-            cell.source = "".join(cell.source)
+def _resolve_external_data(output: dict[str, Any], store: OutputStore) -> None:
+    """Replace references to values in an output store with the stored values."""
+    metadata = output.get("metadata", {})
+    external = metadata.get("euporie", {}).get("external_data", {})
+    data = output.get("data", {})
+    for mime, digest in list(external.items()):
+        if (payload := store.get(digest)) is not None:
+            data[mime] = payload
+            del external[mime]
+        else:
+            log.warning("Output data `%s` was not found in %s", digest, store.path)
+    # References which could not be resolved are kept, so they are saved again
+    if not external:
+        euporie_metadata = metadata["euporie"]
+        del euporie_metadata["external_data"]
+        if not euporie_metadata:
+            del metadata["euporie"]
 
-        attachments = cell.get("attachments", {})
-        for _, attachment in attachments.items():
-            _rejoin_mimebundle(attachment)
 
-        if cell.get("cell_type", None) == "code":
-            for output in cell.get("outputs", []):
-                output_type = output.get("output_type", "")
-                if output_type in {"execute_result", "display_data"}:
-                    _rejoin_mimebundle(output.get("data", {}))
-                elif output_type and isinstance(output.get("text", ""), list):
-                    output.text = "".join(output.text)
+def _resolve_external_streams(cell: dict[str, Any], store: OutputStore) -> None:
+    """Replace references to stream text in an output store with the stored text.
+
+    Stream outputs cannot have metadata, so references to their text are kept in the
+    cell's metadata, by output index.
+    """
+    metadata = cell["metadata"]
+    external = metadata["euporie"]["external_streams"]
+    outputs = cell.get("outputs", [])
+    for index, digest in list(external.items()):
+        if (payload := store.get(digest)) is not None:
+            if int(index) < len(outputs):
+                outputs[int(index)]["text"] = payload.load()
+            del external[index]
+        else:
+            log.warning("Output data `%s` was not found in %s", digest, store.path)
+    # References which could not be resolved are kept, so they are saved again
+    if not external:
+        euporie_metadata = metadata["euporie"]
+        del euporie_metadata["external_streams"]
+        if not euporie_metadata:
+            del metadata["euporie"]
+
+
+def _rejoin_cell(
+    cell: NotebookNode,
+    placeholders: dict[str, LazyPayload],
+    store: OutputStore | None = None,
+) -> None:
+    """Rejoin multi-line strings and strip transient values in a cell in-place."""
+    if isinstance(source := cell.get("source"), list):
+        cell["source"] = "".join(source)
+    cell.get("metadata", {}).pop("trusted", None)
+
+    for attachment in cell.get("attachments", {}).values():
+        _rejoin_mimebundle(attachment, placeholders)
+
+    for output in cell.get("outputs", []):
+        output.pop("transient", None)
+        if cell.get("cell_type") != "code":
+            continue
+        output_type = output.get("output_type", "")
+        if output_type in {"execute_result", "display_data"}:
+            _rejoin_mimebundle(output.get("data", {}), placeholders)
+            if store is not None and "external_data" in output.get("metadata", {}).get(
+                "euporie", {}
+            ):
+                _resolve_external_data(output, store)
+        elif output_type and isinstance(text := output.get("text", ""), list):
+            output["text"] = "".join(text)
+    if store is not None and "external_streams" in cell.get("metadata", {}).get(
+        "euporie", {}
+    ):
+        _resolve_external_streams(cell, store)
+
+
+def _rejoin_lines_and_strip_transient(
+    nb: NotebookNode,
+    placeholders: dict[str, LazyPayload] | None = None,
+    store: OutputStore | None = None,
+) -> NotebookNode:
+    """Rejoin multi-line strings and strip transient values in a single pass.
+
+    This reverses the effects of :py:func:`split_lines` and
+    :py:func:`_strip_transient` on a notebook which has been read from a file.
+    Placeholders for lazily loaded values in output and attachment mime-bundles are
+    replaced with their :py:class:`LazyPayload`, and any others found elsewhere in
+    the notebook are replaced with their values. References to output data in
+    ``store`` are replaced with :py:class:`StoredPayload` objects.
+    """
+    placeholders = dict(placeholders or {})
+    metadata = nb.get("metadata", {})
+    metadata.pop("orig_nbformat", None)
+    metadata.pop("orig_nbformat_minor", None)
+    metadata.pop("signature", None)
+    for cell in nb.get("cells", []):
+        _rejoin_cell(cell, placeholders, store)
+    if placeholders:
+        _load_payloads(nb, placeholders)
     return nb
 
 
@@ -172,9 +576,23 @@ def _strip_transient(nb: NotebookNode) -> NotebookNode:
     nb.metadata.pop("signature", None)
     for cell in nb.cells:
         cell.metadata.pop("trusted", None)
+        for output in cell.get("outputs", []):
+            output.pop("transient", None)
     return nb
 
 
+def _output_store(fp: IO[str]) -> OutputStore | None:
+    """Return the output store for a local notebook file."""
+    try:
+        fp.fileno()
+        name = fp.name
+    except (AttributeError, OSError, ValueError):
+        return None
+    if not isinstance(name, str):
+        return None
+    return OutputStore(Path(name).absolute().parent / OUTPUT_STORE_DIR, 0)
+
+
 def read(
     fp: IO[str],
     as_version: int,
@@ -183,27 +601,139 @@ def read(
 ) -> NotebookNode:
     """Read a notebook from a file, without validation."""
     try:
-        nb_dict = json.load(fp, **kwargs)
+        # Notebook nodes are created as the JSON is parsed, rather than by copying the
+        # parsed data afterwards
+        nb, placeholders = _parse(fp, **kwargs)
 
         # Fallback for non-v4 notebooks
-        if nb_dict.get("nbformat") != 4:
+        if nb.get("nbformat") != 4:
             raise ValueError("Not a v4 notebook")
 
-        nb = NotebookNode._from_dict(nb_dict)
-        nb = _rejoin_lines(nb)
-        nb = _strip_transient(nb)
-        return nb
+        return _rejoin_lines_and_strip_transient(nb, placeholders, _output_store(fp))
     except Exception:
-        try:
-            from jupytext import read as read_orig
-        except ModuleNotFoundError:
-            from nbformat import read as read_orig
-
         # Reset file pointer and use original implementation
         fp.seek(0)
+        if find_spec("jupytext") is not None:
+            return _read_text(fp, as_version)
+        from nbformat import read as read_orig
+
         return read_orig(fp, as_version, capture_validation_error, **kwargs)
 
 
+def iter_read(fp: IO[str], as_version: int, **kwargs: Any) -> Iterator[NotebookNode]:
+    """Read a notebook from a file progressively, without validation.
+
+    Parts of the notebook are yielded as the file is parsed: first notebooks
+    containing batches of cells, then a notebook containing the remaining top-level
+    values. Files which cannot be parsed progressively (for example, notebooks in
+    other formats) are read using :py:func:`read` and yielded whole.
+    """
+    placeholders: dict[str, LazyPayload] = {}
+    if (fileno := _lazy_fileno(fp)) is None:
+        chunks: Iterator[str] = iter(lambda: fp.read(_CHUNK_SIZE), "")
+    else:
+        chunks = _scan(fp, fileno, placeholders)
+    decoder = json.JSONDecoder(object_pairs_hook=NotebookNode, **kwargs)
+    store = _output_store(fp)
+
+    nb = NotebookNode()
+    cells: list[NotebookNode] = []
+    text = ""
+    pending: list[str] = []
+    # The amount of new text needed before parsing is attempted again
+    needed = pending_size = pos = 0
+    # The part of the top-level JSON object expected next
+    state = "start"
+    key = ""
+    # The end of the file is marked with `None`, so any remaining text is parsed
+    for chunk in chain(chunks, [None]):
+        if chunk is not None:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size < needed:
+                continue
+        text = text[pos:] + "".join(pending)
+        pending.clear()
+        needed = pending_size = pos = 0
+
+        batch = []
+        while state not in {"done", "invalid"}:
+            pos = _WHITESPACE_RE.match(text, pos).end()  # type: ignore [union-attr]
+            if pos == len(text):
+                break
+            char = text[pos]
+            if state == "start":
+                state = "key" if char == "{" else "invalid"
+                pos += 1
+            elif state in {"key", "sep"} and char == "}":
+                state = "done"
+            elif state == "sep":
+                state = "key" if char == "," else "invalid"
+                pos += 1
+            elif state == "cell" and char == "]":
+                state = "sep"
+                pos += 1
+            elif state == "cell" and char == "," and (batch or cells):
+                pos += 1
+            else:
+                try:
+                    value, end = decoder.raw_decode(text, pos)
+                except json.JSONDecodeError:
+                    # The value is incomplete, so wait until there is at least as
+                    # much text again, so large values are not parsed too many times
+                    needed = len(text) - pos
+                    break
+                if state == "cell":
+                    if not isinstance(value, dict):
+                        state = "invalid"
+                        break
+                    _rejoin_cell(value, placeholders, store)
+                    batch.append(value)
+                    pos = end
+                elif state == "value":
+                    nb[key] = value
+                    state = "sep"
+                    pos = end
+                    # Other versions of notebooks are converted by `nbformat`
+                    if key == "nbformat" and value != 4:
+                        state = "invalid"
+                elif not isinstance(value, str):
+                    state = "invalid"
+                elif match := _KEY_END_RE.match(text, end):
+                    key = value
+                    pos = match.end()
+                    state = "value"
+                    if key == "cells" and text.startswith("[", pos):
+                        state = "cell"
+                        pos += 1
+                else:
+                    break
+        if batch:
+            cells.extend(batch)
+            yield NotebookNode(cells=batch)
+        if state in {"done", "invalid"}:
+            break
+
+    if state != "done":
+        if cells:
+            raise ValueError("The notebook could not be parsed")
+        # The file cannot be read progressively
+        if isinstance(chunks, GeneratorType):
+            chunks.close()
+        fp.seek(0)
+        yield read(fp, as_version, **kwargs)
+        return
+
+    if nb.get("nbformat") != 4:
+        raise ValueError("Not a v4 notebook")
+    _rejoin_lines_and_strip_transient(nb)
+    # Load any large values which were not in mime-bundles
+    if placeholders:
+        _load_payloads(cells, placeholders)
+        _load_payloads(nb, placeholders)
+    yield nb
+
+
 def new_notebook(**kwargs: Any) -> NotebookNode:
     """Create a new notebook, without validation."""
     nb = NotebookNode(
@@ -230,6 +760,525 @@ def new_code_cell(source: str = "", **kwargs: Any) -> NotebookNode:
     return cell
 
 
+def _encode(value: Any, parts: list[str | LazyPayload], indent: str) -> None:
+    """Append the JSON encoding of a value to a list of strings.
+
+    The output matches that of :py:func:`json.dumps` with ``indent=1``,
+    ``sort_keys=True`` and ``ensure_ascii=False``, as used by :py:mod:`nbformat`.
+    Lazily loaded values are added to the list as they are, so they can be copied from
+    their file when the encoded value is written.
+    """
+    if isinstance(value, str):
+        parts.append(encode_basestring(value))
+    elif isinstance(value, dict):
+        if not value:
+            parts.append("{}")
+            return
+        inner = indent + " "
+        sep = "{\n" + inner
+        for key in sorted(value):
+            parts.append(f"{sep}{encode_basestring(key)}: ")
+            _encode(value[key], parts, inner)
+            sep = ",\n" + inner
+        parts.append(f"\n{indent}}}")
+    elif isinstance(value, (list, tuple)):
+        if not value:
+            parts.append("[]")
+            return
+        inner = indent + " "
+        sep = "[\n" + inner
+        for item in value:
+            parts.append(sep)
+            _encode(item, parts, inner)
+            sep = ",\n" + inner
+        parts.append(f"\n{indent}]")
+    elif isinstance(value, LazyPayload):
+        parts.append(value)
+    elif isinstance(value, bytes):
+        parts.append(f'"{value.decode("ascii")}"')
+    else:
+        parts.append(json.dumps(value))
+
+
+def _split_mimebundle(data: dict[str, Any]) -> dict[str, Any]:
+    """Return a copy of a mimebundle with multi-line string fields split into lines."""
+    data = dict(data)
+    for key, value in data.items():
+        if key.startswith("text/") or key in _SPLIT_MIMES:
+            if isinstance(value, LazyPayload):
+                value = value.load()
+            if isinstance(value, str):
+                data[key] = value.splitlines(True)
+    return data
+
+
+def _store_external_data(output: dict[str, Any], store: OutputStore) -> None:
+    """Move large values in an output's mime-bundle to an output store."""
+    external = {}
+    data = output["data"] = dict(output["data"])
+    for mime, value in data.items():
+        if store.should_store(value):
+            external[mime] = store.add(value)
+            data[mime] = ""
+    if external:
+        metadata = output["metadata"] = dict(output.get("metadata", {}))
+        metadata["euporie"] = {**metadata.get("euporie", {}), "external_data": external}
+
+
+def _encode_cell(
+    cell: dict[str, Any], store: OutputStore | None = None
+) -> list[str | LazyPayload]:
+    """Encode a notebook cell as it is stored in ``.ipynb`` files.
+
+    Multi-line strings are split into lines and transient values are removed, without
+    modifying the cell. If an output store is given, large output values are moved to
+    the store and replaced with references.
+    """
+    cell = dict(cell)
+    if isinstance(source := cell.get("source"), str):
+        cell["source"] = source.splitlines(True)
+    if "trusted" in (metadata := cell.get("metadata", {})):
+        cell["metadata"] = {k: v for k, v in metadata.items() if k != "trusted"}
+    if attachments := cell.get("attachments"):
+        cell["attachments"] = {
+            name: _split_mimebundle(data) for name, data in attachments.items()
+        }
+    if outputs := cell.get("outputs"):
+        cell["outputs"] = outputs = [
+            {k: v for k, v in output.items() if k != "transient"} for output in outputs
+        ]
+        if cell.get("cell_type") == "code":
+            external: dict[str, str] = {}
+            for i, output in enumerate(outputs):
+                output_type = output.get("output_type")
+                if output_type in {"execute_result", "display_data"}:
+                    if "data" in output:
+                        if store is not None:
+                            _store_external_data(output, store)
+                        output["data"] = _split_mimebundle(output["data"])
+                elif output_type == "stream" and isinstance(
+                    text := output.get("text"), str
+                ):
+                    if store is not None and store.should_store(text):
+                        external[str(i)] = store.add(text)
+                        text = ""
+                    output["text"] = text.splitlines(True)
+            if external:
+                # Stream outputs cannot have metadata, so references are kept in
+                # the cell's metadata
+                metadata = cell["metadata"] = dict(cell.get("metadata", {}))
+                metadata["euporie"] = {
+                    **metadata.get("euporie", {}),
+                    "external_streams": external,
+                }
+    parts: list[str | LazyPayload] = []
+    _encode(cell, parts, "  ")
+    return _join(parts)
+
+
+def _join(parts: list[str | LazyPayload]) -> list[str | LazyPayload]:
+    """Join consecutive strings in a list of encoded parts."""
+    fragment: list[str | LazyPayload] = []
+    for is_str, group in groupby(parts, key=lambda part: isinstance(part, str)):
+        if is_str:
+            fragment.append("".join(group))  # type: ignore [arg-type]
+        else:
+            fragment.extend(group)
+    return fragment
+
+
+def _write(fp: IO[str], fragment: list[str | LazyPayload]) -> None:
+    """Write encoded parts to a file."""
+    for part in fragment:
+        if isinstance(part, str):
+            fp.write(part)
+        else:
+            # Copy lazily loaded values to the file without decoding them
+            fp.write(f'"{part.raw()}"')
+
+
+def _fingerprint(value: Any) -> Any:
+    """Return a hashable representation of a JSON value for detecting changes.
+
+    Strings are not copied, so comparing the fingerprints of unchanged values is fast.
+    """
+    if type(value) is str:
+        return value
+    if isinstance(value, dict):
+        return (dict, *((key, _fingerprint(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, *map(_fingerprint, value))
+    # Distinguish between values which compare equal, such as ``1`` and ``True``
+    return (type(value), value)
+
+
+def dump_ipynb(
+    nb: Mapping[str, Any],
+    fp: IO[str],
+    fragments: dict[Any, list[str | LazyPayload]] | None = None,
+    store: OutputStore | None = None,
+) -> None:
+    """Write a notebook to a file object in the ``.ipynb`` format.
+
+    This is equivalent to :py:func:`nbformat.write`, but does not copy or validate
+    the notebook, and the JSON is written one cell at a time.
+
+    Args:
+        nb: The notebook to write
+        fp: The file object to write to
+        fragments: A cache of encoded cells. Cells which have not changed since the
+            cache was last used are not encoded again. The cache is updated to
+            contain only the notebook's current cells once the notebook is written.
+            Cells containing large values which are not loaded lazily are not cached,
+            to limit the memory used by the cache.
+        store: An output store to which large output values are moved. If not given,
+            all output values are written to the notebook file.
+    """
+    metadata = {
+        key: value
+        for key, value in nb.get("metadata", {}).items()
+        if key not in _TRANSIENT_METADATA
+    }
+    # Jupytext's text-representation metadata is not saved in ``.ipynb`` files
+    if isinstance(jupytext := metadata.get("jupytext"), Mapping):
+        jupytext = {k: v for k, v in jupytext.items() if k != "text_representation"}
+        if jupytext:
+            metadata["jupytext"] = jupytext
+        else:
+            del metadata["jupytext"]
+
+    new_fragments: dict[Any, list[str | LazyPayload]] = {}
+    # Cells are encoded differently when output data is moved to an output store
+    store_key = None if store is None else (store.path, store.min_size)
+    sep = "{\n "
+    for key in sorted(nb):
+        fp.write(f"{sep}{encode_basestring(key)}: ")
+        if key == "cells" and (cells := nb["cells"]):
+            cell_sep = "[\n  "
+            for cell in cells:
+                fp.write(cell_sep)
+                if fragments is None:
+                    _write(fp, _encode_cell(cell, store))
+                else:
+                    # The fingerprint is taken first, so if the cell is modified
+                    # while it is being encoded, it will be encoded again next time
+                    cell_key = (store_key, _fingerprint(cell))
+                    if (fragment := fragments.get(cell_key)) is None:
+                        fragment = _encode_cell(cell, store)
+                    _write(fp, fragment)
+                    if (
+                        sum(len(part) for part in fragment if isinstance(part, str))
+                        < _MAX_CACHED_CELL_SIZE
+                    ):
+                        new_fragments[cell_key] = fragment
+                cell_sep = ",\n  "
+            fp.write("\n ]")
+        else:
+            parts: list[str | LazyPayload] = []
+            _encode(metadata if key == "metadata" else nb[key], parts, " ")
+            _write(fp, _join(parts))
+        sep = ",\n "
+    fp.write("\n}\n")
+    if fragments is not None:
+        fragments.clear()
+        fragments.update(new_fragments)
+
+
+def _replace_file(path: Path, write: Callable[[IO[str]], None]) -> None:
+    """Write to a path, replacing existing local files only once writing succeeds.
+
+    Existing local files are replaced with a temporary file once it has been written,
+    so the original file is left intact if writing fails.
+    """
+    # Remote paths are not subclasses of the concrete local path classes
+    if not isinstance(path, (PosixPath, WindowsPath)) or not path.exists():
+        with path.open("w", encoding="utf-8") as f:
+            write(f)
+        return
+
+    target = path.resolve()
+    fd, name = tempfile.mkstemp(
+        dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+    )
+    temp = Path(name)
+    try:
+        with open(fd, "w", encoding="utf-8") as f:  # noqa: PTH123
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep the permissions of the existing file
+        shutil.copymode(target, temp)
+        temp.replace(target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            temp.unlink()
+        raise
+
+
+def write_ipynb(
+    nb: Mapping[str, Any],
+    path: Path,
+    fragments: dict[Any, list[str | LazyPayload]] | None = None,
+    store: OutputStore | None = None,
+) -> None:
+    """Write a notebook to a path in the ``.ipynb`` format.
+
+    Existing local files are replaced with a temporary file once it has been written,
+    so the original file is left intact if writing fails.
+
+    Args:
+        nb: The notebook to write
+        path: The path to which the notebook should be written
+        fragments: A cache of encoded cells (see :py:func:`dump_ipynb`)
+        store: An output store to which large output values are moved
+    """
+    _replace_file(path, lambda f: dump_ipynb(nb, f, fragments, store))
+
+
+# ################################ Jupytext notebooks ################################
+
+
+# The cache of converted cells in use by the current thread, and the cache to which
+# the cells being converted are added
+_CELL_TEXTS: ContextVar[tuple[dict[Any, Any], dict[Any, Any]] | None] = ContextVar(
+    "cell_texts", default=None
+)
+# The maximum total size of notebooks converted by jupytext cached on disk, in bytes
+_JUPYTEXT_CACHE_SIZE = 64 * 1024 * 1024
+# The range of jupytext versions whose internals converted cells can be cached with
+_JUPYTEXT_VERSIONS = ((1, 14), (2, 0))
+
+
+def _jupytext_config(path: Path | None) -> tuple[Any, str]:
+    """Load the jupytext configuration which applies to a local notebook file.
+
+    Returns:
+        The jupytext configuration, and the contents of the file it was loaded from
+
+    """
+    if path is None or not isinstance(path, (PosixPath, WindowsPath)):
+        return None, ""
+    from jupytext.config import (
+        find_jupytext_configuration_file,
+        load_jupytext_configuration_file,
+    )
+
+    try:
+        if (config_file := find_jupytext_configuration_file(str(path.parent))) is None:
+            return None, ""
+        text = Path(config_file).read_text()
+        return load_jupytext_configuration_file(config_file), text
+    except Exception:
+        log.exception("Could not load the jupytext configuration for %s", path)
+        return None, ""
+
+
+def _read_text(fp: IO[str], as_version: int) -> NotebookNode:
+    """Read a text-based notebook using jupytext.
+
+    Converted notebooks are cached on disk, keyed by the file's contents and the
+    jupytext configuration, so unchanged files do not need to be converted again.
+    """
+    import jupytext
+
+    from euporie.core import __version__
+    from euporie.core.cache import cache_dir
+
+    text = fp.read()
+    path = Path(name) if isinstance(name := getattr(fp, "name", None), str) else None
+    fmt = None
+    if (
+        path is not None
+        and path.suffix != ".ipynb"
+        and path.suffix in NOTEBOOK_EXTENSIONS
+    ):
+        fmt = {"extension": path.suffix}
+    config, config_text = _jupytext_config(path)
+
+    key = json.dumps(
+        [
+            __version__,
+            jupytext.__version__,
+            as_version,
+            fmt,
+            config_text,
+            hashlib.sha256(text.encode()).hexdigest(),
+        ]
+    )
+    cache_path = (
+        cache_dir("jupytext", _JUPYTEXT_CACHE_SIZE)
+        / hashlib.sha256(key.encode()).hexdigest()
+    )
+    try:
+        nb = json.loads(cache_path.read_text(), object_pairs_hook=NotebookNode)
+    except (OSError, ValueError):
+        pass
+    else:
+        # Mark the file as recently used, so it is kept when the cache is pruned
+        with contextlib.suppress(OSError):
+            cache_path.touch()
+        return nb
+
+    nb = NotebookNode._from_dict(
+        jupytext.reads(text, fmt, as_version=as_version, config=config)
+    )
+    try:
+        cache_path.parent.mkdir(exist_ok=True, parents=True)
+        _replace_file(cache_path, lambda f: json.dump(nb, f))
+    except (OSError, TypeError, ValueError):
+        log.debug("Could not write jupytext cache to '%s'", cache_path)
+    return nb
+
+
+class _CachedCellExporter:
+    """Create jupytext cell exporters, re-using the text of unchanged cells.
+
+    This replaces the cell exporter classes of jupytext's formats. Text is only
+    re-used while a cache is set by :py:func:`write_text`.
+    """
+
+    def __init__(self, exporter_class: type) -> None:
+        """Wrap a jupytext cell exporter class."""
+        self.exporter_class = exporter_class
+
+    def __call__(
+        self, cell: NotebookNode, default_language: str, fmt: dict, **kwargs: Any
+    ) -> Any:
+        """Create a cell exporter, re-using a previous one if the cell is unchanged.
+
+        Metadata keys which jupytext reports as unsupported while creating an exporter
+        are recorded, and added to the caller's ``unsupported_keys`` set when a cached
+        exporter is re-used.
+        """
+        unsupported_keys = kwargs.pop("unsupported_keys", None)
+        # Other arguments are not part of the cache key, so cells are not cached
+        if (caches := _CELL_TEXTS.get()) is None or kwargs:
+            return self.exporter_class(
+                cell, default_language, fmt, unsupported_keys=unsupported_keys, **kwargs
+            )
+        old, new = caches
+        key = (
+            self.exporter_class,
+            default_language,
+            json.dumps(fmt, sort_keys=True, default=str),
+            _fingerprint(cell),
+        )
+        if (cached := old.get(key) or new.get(key)) is None:
+            # A new set is used, so the cached exporter does not keep the caller's set
+            unsupported: set[str] = set()
+            exporter = self.exporter_class(
+                cell, default_language, fmt, unsupported_keys=unsupported
+            )
+            lines = exporter.cell_to_text()
+            # Exporters can be modified as they are joined, so a copy is kept
+            cached = (copy.copy(exporter), lines, frozenset(unsupported))
+        new[key] = cached
+        exporter, lines, unsupported_found = cached
+        if unsupported_keys is not None:
+            unsupported_keys.update(unsupported_found)
+        exporter = copy.copy(exporter)
+        exporter.cell_to_text = partial(list, lines)
+        return exporter
+
+
+@cache
+def _cache_jupytext_conversions() -> bool:
+    """Wrap the cell exporters of all jupytext formats.
+
+    Checking whether a cell ends with a function or class definition (to determine the
+    number of blank lines which follow it) requires the cell to be parsed, so the
+    result of this check is also cached.
+
+    jupytext looks these up from its module globals while writing notebooks, so they
+    are replaced for the whole process. The wrappers only use cached results while a
+    cache is set by :py:func:`write_text`, and otherwise call the originals.
+
+    Returns:
+        Whether conversions can be cached with the installed version of jupytext
+
+    """
+    import jupytext
+    import jupytext.pep8
+    from jupytext.formats import JUPYTEXT_FORMATS
+
+    try:
+        version = tuple(int(part) for part in jupytext.__version__.split(".")[:2])
+    except ValueError:
+        version = ()
+    if not (
+        _JUPYTEXT_VERSIONS[0] <= version < _JUPYTEXT_VERSIONS[1]
+        and hasattr(jupytext.pep8, "cell_ends_with_function_or_class")
+        and all(hasattr(fmt, "cell_exporter_class") for fmt in JUPYTEXT_FORMATS)
+    ):
+        log.debug(
+            "Converted cells are not cached with jupytext %s", jupytext.__version__
+        )
+        return False
+
+    for implementation in JUPYTEXT_FORMATS:
+        if isinstance(exporter_class := implementation.cell_exporter_class, type):
+            implementation.cell_exporter_class = _CachedCellExporter(exporter_class)
+
+    ends_with_function_or_class = jupytext.pep8.cell_ends_with_function_or_class
+
+    def _cell_ends_with_function_or_class(lines: list[str]) -> bool:
+        if (caches := _CELL_TEXTS.get()) is None:
+            return ends_with_function_or_class(lines)
+        old, new = caches
+        key = ("pep8", *lines)
+        if (result := old.get(key, new.get(key))) is None:
+            result = ends_with_function_or_class(lines)
+        new[key] = result
+        return result
+
+    jupytext.pep8.cell_ends_with_function_or_class = _cell_ends_with_function_or_class
+    return True
+
+
+def write_text(
+    nb: Mapping[str, Any], path: Path, cell_texts: dict[Any, Any] | None = None
+) -> None:
+    """Write a notebook to a path in a text-based format using jupytext.
+
+    The format is determined by the path's extension and the notebook's metadata.
+
+    Args:
+        nb: The notebook to write
+        path: The path to which the notebook should be written
+        cell_texts: A cache of converted cells from the last time the notebook was
+            written. Cells which have not changed since are not converted again.
+    """
+    import jupytext
+
+    # Outputs are not saved in text-based formats, so are not copied
+    nb = from_dict(
+        {
+            **nb,
+            "cells": [
+                {k: [] if k == "outputs" else v for k, v in cell.items()}
+                for cell in nb.get("cells", [])
+            ],
+        }
+    )
+    config, _ = _jupytext_config(path)
+    new: dict[Any, Any] = {}
+    if cell_texts is not None and not _cache_jupytext_conversions():
+        cell_texts = None
+    token = _CELL_TEXTS.set(None if cell_texts is None else (cell_texts, new))
+    try:
+        text = jupytext.writes(
+            _strip_transient(nb), fmt={"extension": path.suffix}, config=config
+        )
+    finally:
+        _CELL_TEXTS.reset(token)
+    if not text.endswith("\n"):
+        text += "\n"
+    _replace_file(path, lambda f: f.write(text))
+    if cell_texts is not None:
+        cell_texts.clear()
+        cell_texts.update(new)
+
+
 # ############################ Lazy-loaded nbformat shims ############################
 
 
@@ -240,14 +1289,16 @@ def write(nb: NotebookNode, fp: IO[str] | str | Path, **kwargs: Any) -> None:
     except ModuleNotFoundError:
         from nbformat import write as write_orig
 
-    write_orig(nb, fp, **kwargs)
+    write_orig(_strip_transient(nb), fp, **kwargs)
 
 
 def from_dict(d: Any) -> Any:
-    """Convert a dictionary to a NotebookNode."""
+    """Convert a dictionary to a NotebookNode, loading any lazily loaded values."""
     from nbformat import from_dict as from_dict_orig
 
-    return from_dict_orig(d)
+    nb = from_dict_orig(d)
+    _load_payloads(nb)
+    return nb
 
 
 def new_markdown_cell(source: str = "", **kwargs: Any) -> NotebookNode:
@@ -100,6 +100,31 @@ add_setting(
     """,
 )
 
+add_setting(
+    name="external_output_size",
+    group="euporie.core.tabs.notebook",
+    flags=["--external-output-size"],
+    type_=int,
+    help_="Store output data larger than this size outside of notebook files",
+    default=0,
+    schema={
+        "minimum": 0,
+    },
+    description="""
+        When set to a value greater than zero, output data and stream text of at least
+        this many characters will be saved to a ``.ipynb_outputs`` directory next to
+        the notebook instead of in the notebook file, and a reference to the data will
+        be saved in the output's metadata (or for streams, in the cell's metadata).
+        Files in this directory are named by the hash of their
+        contents, so identical outputs are only stored once, even if they are used in
+        several notebooks.
+
+        Notebooks saved in this way can only be opened with their outputs by euporie;
+        use the :command:`save-with-inline-outputs` command to save a copy of the
+        notebook which contains all of its output data.
+    """,
+)
+
 add_setting(
     name="max_notebook_width",
     group="euporie.core.tabs.notebook",
@@ -143,6 +143,8 @@ class Tab(metaclass=ABCMeta):
                         raise
 
             # Write new content directly to original file
+            self.saving = True
+            self.app.invalidate()
             try:
                 self.write_file(path)
             except Exception as e:
@@ -163,9 +165,19 @@ class Tab(metaclass=ABCMeta):
                 cb()
 
         except Exception:
+            self.saving = False
             log.exception("An error occurred while saving the file")
-            if dialog := self.app.get_dialog("save-as"):
-                dialog.show(tab=self, cb=cb)
+            self.save_failed(cb)
+
+    def save_failed(self, cb: Callable | None = None) -> None:
+        """Ask the user where to save the file after a failed save.
+
+        Args:
+            cb: A function to call if the file is then saved
+
+        """
+        if dialog := self.app.get_dialog("save-as"):
+            dialog.show(tab=self, cb=cb)
 
     def write_file(self, path: Path) -> None:
         """Write the tab's data to a path.
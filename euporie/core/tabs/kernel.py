@@ -8,7 +8,7 @@ from abc import ABCMeta
 from collections import deque
 from functools import lru_cache, partial
 from typing import TYPE_CHECKING
-from weakref import WeakKeyDictionary
+from weakref import WeakKeyDictionary, WeakSet
 
 from prompt_toolkit.auto_suggest import DummyAutoSuggest, DynamicAutoSuggest
 from prompt_toolkit.completion.base import (
@@ -49,6 +49,7 @@ if TYPE_CHECKING:
     from euporie.core.inspection import Inspector
     from euporie.core.kernel.base import BaseKernel, KernelFactory, MsgCallbacks
     from euporie.core.lsp import LspClient
+    from euporie.core.widgets.cell_outputs import CellOutput
     from euporie.core.widgets.inputs import KernelInput
 
 log = logging.getLogger(__name__)
@@ -109,6 +110,9 @@ class KernelTab(Tab, metaclass=ABCMeta):
 
         # The client-side comm states
         self.comms: dict[str, Comm] = {}
+        # Rendered outputs indexed by display ID
+        self.displays: dict[str, WeakSet[CellOutput]] = {}
+        self._displays_limit = 64
         # The current kernel input
         self._current_input: KernelInput | None = None
 
@@ -439,6 +443,71 @@ class KernelTab(Tab, metaclass=ABCMeta):
         if comm_id in self.comms:
             del self.comms[comm_id]
 
+    def register_display(self, display_id: str, output: CellOutput) -> None:
+        """Record a rendered output so it can be updated by its display ID."""
+        displays = self.displays
+        if display_id not in displays and len(displays) >= self._displays_limit:
+            # Forget display IDs for which all outputs have since been removed
+            for key in [key for key, outputs in displays.items() if not outputs]:
+                del displays[key]
+            self._displays_limit = max(64, 2 * len(displays))
+        displays.setdefault(display_id, WeakSet()).add(output)
+
+    def update_display(self, output_json: dict[str, Any]) -> None:
+        """Update all rendered outputs sharing a display ID in-place.
+
+        Args:
+            output_json: The updated output's JSON, including a ``transient`` field
+                containing the display ID
+        """
+        display_id = output_json.get("transient", {}).get("display_id")
+        if not (outputs := list(self.displays.get(display_id, ()))):
+            self.displays.pop(display_id, None)
+            return
+        for output in outputs:
+            output.update_display(output_json)
+        # Outputs displayed in cells are saved with the notebook
+        if any(output.parent is not None for output in outputs):
+            self.dirty = True
+
+    def show_execution_timing(self) -> None:
+        """Display a breakdown of the latency of recent code executions.
+
+        Times are shown in milliseconds, relative to when each execution request was
+        sent to the kernel.
+        """
+        from prompt_toolkit.formatted_text.base import to_formatted_text
+
+        from euporie.core.border import ThinLine
+        from euporie.core.ft.table import Table
+        from euporie.core.ft.utils import FormattedTextAlign
+        from euporie.core.kernel.base import ExecutionTiming
+
+        timings = list(self.kernel.timings.values())[-10:]
+        if not timings:
+            message: Any = "No code has been executed yet"
+        else:
+            stages = list(ExecutionTiming.stages)[1:]
+            table = Table(border_line=ThinLine, border_style="class:dim")
+            row = table.new_row(style="bold")
+            row.new_cell("Code")
+            for stage in stages:
+                row.new_cell(ExecutionTiming.stages[stage])
+            for timing in timings:
+                row = table.new_row()
+                code = timing.source.strip().partition("\n")[0]
+                row.new_cell(code if len(code) <= 20 else f"{code[:19]}…")
+                for stage in stages:
+                    elapsed = timing.elapsed(stage)
+                    row.new_cell(
+                        "-" if elapsed is None else f"{elapsed * 1000:.1f}",
+                        align=FormattedTextAlign.RIGHT,
+                    )
+            message = to_formatted_text(table)
+
+        if dialog := self.app.get_dialog("msgbox"):
+            dialog.show(title="Execution Timing (ms)", message=message)
+
     def lsp_open_handler(self, lsp: LspClient) -> None:
         """Tell the LSP we opened a file."""
         lsp.open_doc(
@@ -483,3 +552,10 @@ class KernelTab(Tab, metaclass=ABCMeta):
         """Change the notebook's kernel."""
         if isinstance(kt := get_app().tab, KernelTab):
             kt.change_kernel()
+
+    @staticmethod
+    @add_cmd(filter=kernel_tab_has_focus)
+    def _show_execution_timing() -> None:
+        """Show the latency of recent code executions."""
+        if isinstance(kt := get_app().tab, KernelTab):
+            kt.show_execution_timing()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from abc import ABCMeta, abstractmethod, abstractproperty
 from base64 import standard_b64decode
 from functools import partial
@@ -13,9 +14,16 @@ from prompt_toolkit.filters import Never
 from euporie.core.comm.registry import open_comm
 from euporie.core.io import edit_in_editor
 from euporie.core.kernel.base import MsgCallbacks
-from euporie.core.nbformat import from_dict, new_code_cell, new_notebook
+from euporie.core.nbformat import (
+    NOTEBOOK_EXTENSIONS,
+    OUTPUT_STORE_DIR,
+    OutputStore,
+    new_code_cell,
+    new_notebook,
+    write_ipynb,
+    write_text,
+)
 from euporie.core.nbformat import read as read_nb
-from euporie.core.nbformat import write as write_nb
 from euporie.core.tabs.kernel import KernelTab
 from euporie.core.widgets.cell import Cell, get_cell_id
 
@@ -31,16 +39,32 @@ if TYPE_CHECKING:
     from euporie.core.comm.base import Comm
     from euporie.core.kernel.base import BaseKernel
     from euporie.core.lsp import LspClient
+    from euporie.core.nbformat import LazyPayload
     from euporie.core.widgets.inputs import KernelInput
 
 log = logging.getLogger(__name__)
 
 
+def _copy_json(value: Any) -> Any:
+    """Copy the containers of a JSON value, sharing the strings and other values.
+
+    This is much cheaper than a deep copy, as the large values in notebooks are
+    strings, which are not copied.
+    """
+    if isinstance(value, dict):
+        return type(value)((key, _copy_json(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+    return value
+
+
 class BaseNotebook(KernelTab, metaclass=ABCMeta):
     """The main notebook container class."""
 
     allow_stdin = False
     edit_mode = False
+    # A copy of the notebook taken when a background save starts
+    _save_json: dict[str, Any] | None = None
 
     def __init__(
         self,
@@ -79,9 +103,15 @@ class BaseNotebook(KernelTab, metaclass=ABCMeta):
         )
         self.json = json or new_notebook()
         self._rendered_cells: dict[str, Cell] = {}
+        # Encoded cells from the last save, re-used for cells which have not changed
+        self._cell_fragments: dict[Any, list[str | LazyPayload]] = {}
+        # Converted cells from the last save in a text-based format
+        self._cell_texts: dict[Any, Any] = {}
         self.multiple_cells_selected: Filter = Never()
         self.loaded = path is None
         self._really_init_kernel: Callable[[], None] | None = None
+        # The notebook file and the kernel may be loaded in different threads
+        self._load_lock = threading.Lock()
 
         super().__init__(
             app, path, kernel=kernel, comms=comms, use_kernel_history=use_kernel_history
@@ -110,12 +140,17 @@ class BaseNotebook(KernelTab, metaclass=ABCMeta):
         connection_file: Path | None = None,
     ) -> None:
         """Defer loading kernel until after notebook file is loaded."""
-        if self.loaded:
-            super().init_kernel(kernel, comms, use_kernel_history, connection_file)
-        else:
-            self._really_init_kernel = partial(
-                super().init_kernel, kernel, comms, use_kernel_history, connection_file
-            )
+        with self._load_lock:
+            if not self.loaded:
+                self._really_init_kernel = partial(
+                    super().init_kernel,
+                    kernel,
+                    comms,
+                    use_kernel_history,
+                    connection_file,
+                )
+                return
+        super().init_kernel(kernel, comms, use_kernel_history, connection_file)
 
     def post_init_kernel(self) -> None:
         """Load the notebook container after the kernel has been loaded."""
@@ -149,14 +184,20 @@ class BaseNotebook(KernelTab, metaclass=ABCMeta):
         if self.path is not None and self.path.exists():
             with self.path.open() as f:
                 self.json = read_nb(f, as_version=4)
+        self.finish_loading()
+
+    def finish_loading(self) -> None:
+        """Mark the notebook as loaded, and start the kernel if it is waiting."""
         # Ensure there is always at least one cell
         if not self.json.setdefault("cells", []):
             self.json["cells"] = [new_code_cell()]
-        self.loaded = True
-        if callable(self._really_init_kernel):
+        with self._load_lock:
+            self.loaded = True
             # Only call this once
-            self._really_init_kernel()
+            really_init_kernel = self._really_init_kernel
             self._really_init_kernel = None
+        if callable(really_init_kernel):
+            really_init_kernel()
 
     def set_status(self, status: str) -> None:
         """Call when kernel status changes."""
@@ -212,7 +253,11 @@ class BaseNotebook(KernelTab, metaclass=ABCMeta):
                 cells[cell_id] = self._rendered_cells[cell_id]
             else:
                 cells[cell_id] = Cell(
-                    i, cell_json, self, is_new=bool(self._rendered_cells)
+                    i,
+                    cell_json,
+                    self,
+                    # Cells displayed while the notebook is loading are not new
+                    is_new=self.loaded and bool(self._rendered_cells),
                 )
             cells[cell_id].index = i
         # These cells will be removed
@@ -265,15 +310,21 @@ class BaseNotebook(KernelTab, metaclass=ABCMeta):
         else:
             super().close(cb)
 
-    def write_file(self, path: Path) -> None:
-        """Write the notebook's JSON to the current notebook's file.
+    def _save(self, path: Path | None = None, cb: Callable | None = None) -> None:
+        """Save the notebook in a background thread.
 
-        Additionally save the widget state to the notebook metadata.
+        The notebook can be changed on the event loop while it is being written, so a
+        copy of its current state is taken to be written by the thread.
+        """
+        self._save_json = self.snapshot()
+        super()._save(path, cb)
 
-        Args:
-            path: An path at which to save the file
+    def snapshot(self) -> dict[str, Any]:
+        """Return a copy of the notebook's JSON which can be written in a thread."""
+        return _copy_json(self._json_to_save())
 
-        """
+    def _json_to_save(self) -> dict[str, Any]:
+        """Add the widget state to the notebook metadata, and return its JSON."""
         if self.app.config.save_widget_state:
             self.json.setdefault("metadata", {})["widgets"] = {
                 "application/vnd.jupyter.widget-state+json": {
@@ -286,21 +337,30 @@ class BaseNotebook(KernelTab, metaclass=ABCMeta):
                     },
                 }
             }
-        with path.open("w") as open_file:
-            try:
-                write_nb(nb=from_dict(self.json), fp=open_file)
-            except AssertionError:
-                try:
-                    # Jupytext requires a filename if we don't give it a format
-                    write_nb(nb=from_dict(self.json), fp=path)
-                except Exception:
-                    # Jupytext requires a format if the path has no extension
-                    # We just use ipynb as the default format
-                    write_nb(
-                        nb=from_dict(self.json),
-                        fp=open_file,
-                        fmt="ipynb",
-                    )
+        return self.json
+
+    def write_file(self, path: Path) -> None:
+        """Write the notebook's JSON to the current notebook's file.
+
+        Additionally save the widget state to the notebook metadata. If the notebook
+        is being saved in the background, the copy taken when the save started is
+        written.
+
+        Args:
+            path: An path at which to save the file
+
+        """
+        json, self._save_json = self._save_json, None
+        if json is None:
+            json = self._json_to_save()
+        if path.suffix != ".ipynb" and path.suffix in NOTEBOOK_EXTENSIONS:
+            # Jupytext is used to write text-based notebook formats
+            write_text(json, path, self._cell_texts)
+        else:
+            store = None
+            if size := self.app.config.external_output_size:
+                store = OutputStore(path.parent / OUTPUT_STORE_DIR, size)
+            write_ipynb(json, path, self._cell_fragments, store)
 
     def run_cell(
         self,
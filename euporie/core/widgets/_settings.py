@@ -43,6 +43,23 @@ add_setting(
     """,
 )
 
+add_setting(
+    name="stream_update_interval",
+    group="euporie.core.widgets.cell_outputs",
+    flags=["--stream-update-interval"],
+    type_=float,
+    help_="Minimum time between redraws of stream outputs",
+    default=0.05,
+    schema={
+        "minimum": 0.0,
+    },
+    description="""
+        The minimum time in seconds between successive redraws of a cell's text
+        stream output. Rapidly updating streams (such as progress bars) are redrawn
+        at most this often. Use ``0`` to redraw streams on every update.
+    """,
+)
+
 # euporie,core.widgets.file_browser:FileBrowser
 
 add_setting(
@@ -753,9 +753,21 @@ class Cell:
         # Clear the output if we were previously asked to
         if self.clear_outputs_on_output:
             self.remove_outputs()
-        self.json.setdefault("outputs", []).append(output_json)
-        # Add the new output to the output area
-        self.output_area.add_output(output_json)
+        outputs = self.json.setdefault("outputs", [])
+        # Merge consecutive outputs from the same stream, dropping overwritten text
+        if (
+            output_json.get("output_type") == "stream"
+            and outputs
+            and outputs[-1].get("output_type") == "stream"
+            and outputs[-1].get("name") == output_json.get("name")
+            and self.output_area.json
+            and self.output_area.json[-1] is outputs[-1]
+        ):
+            self.output_area.extend_stream(outputs[-1], output_json.get("text", ""))
+        else:
+            outputs.append(output_json)
+            # Add the new output to the output area
+            self.output_area.add_output(output_json)
         # Tell the page this cell has been updated
         self.refresh()
 
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import re
+import time
 import weakref
 from abc import ABCMeta, abstractmethod
 from functools import cache
@@ -10,7 +13,9 @@ from pathlib import PurePath
 from typing import TYPE_CHECKING
 
 from prompt_toolkit.cache import SimpleCache
+from prompt_toolkit.filters import Condition
 from prompt_toolkit.layout.containers import (
+    ConditionalContainer,
     DynamicContainer,
     to_container,
 )
@@ -18,6 +23,7 @@ from prompt_toolkit.layout.containers import (
 from euporie.core.app.current import get_app
 from euporie.core.convert.registry import find_route
 from euporie.core.layout.containers import HSplit
+from euporie.core.nbformat import load_payload
 from euporie.core.widgets.display import Display
 from euporie.core.widgets.layout import Box
 from euporie.core.widgets.tree import JsonView
@@ -45,6 +51,55 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# Matches text on a line which has been overwritten following a carriage return
+_OVERWRITTEN_RE = re.compile(r"^[^\n]*\r(?=[^\r\n])", flags=re.MULTILINE)
+# Matches ANSI escape sequences which move the cursor up
+_CURSOR_UP_RE = re.compile(r"\x1b\[\d*A")
+# Matches ANSI escape sequences which set graphic attributes (e.g. colours)
+_SGR_RE = re.compile(r"\x1b\[[\d;:]*m")
+
+
+def merge_stream_text(text: str, new: str) -> str:
+    """Append text to a stream, removing any text overwritten by carriage returns.
+
+    Only the final line of the existing text is re-processed, as any previous lines
+    will already have been collapsed.
+
+    Args:
+        text: The existing stream text
+        new: The text to append to the stream
+
+    Returns:
+        The combined stream text
+
+    """
+    head, newline, tail = text.rpartition("\n")
+    tail += new
+    if "\r" in tail:
+        # Graphic attributes set by overwritten text still apply to following text
+        tail = _OVERWRITTEN_RE.sub(
+            lambda match: "".join(_SGR_RE.findall(match.group(0))), tail
+        )
+    return head + newline + tail
+
+
+def _sgr_state(text: str) -> str:
+    """Return the ANSI escape sequences setting the graphic attributes at a text's end.
+
+    Args:
+        text: Text which may contain ANSI escape sequences
+
+    Returns:
+        The escape sequences which have been applied since the last reset
+
+    """
+    codes: list[str] = []
+    for code in _SGR_RE.findall(text):
+        if code[2:-1].split(";", 1)[0] in {"", "0"}:
+            codes.clear()
+        codes.append(code)
+    return "".join(codes)
+
 
 class CellOutputElement(metaclass=ABCMeta):
     """Base class for the various types of cell outputs (display data or widgets)."""
@@ -204,6 +259,109 @@ class CellOutputDataElement(CellOutputElement):
         return self.container
 
 
+class CellOutputStreamElement(CellOutputElement):
+    """A cell output element which displays text streams.
+
+    The final incomplete line of the stream is displayed separately from the
+    preceding text, so that repeated re-writes of the line (e.g. by progress bars)
+    only require the last line to be re-rendered.
+    """
+
+    def __init__(
+        self,
+        mime: str,
+        data: str,
+        metadata: dict,
+        parent: OutputParent | None,
+    ) -> None:
+        """Create a new stream output element instance.
+
+        Args:
+            mime: The mime-type of the stream: ``stream/stdout`` or ``stream/stderr``
+            data: The stream text to display
+            metadata: Any metadata relating to the data
+            parent: The cell the output-element is attached to
+        """
+        self.parent = parent
+        self._data = data
+        self._text = self._sgr = ""
+        self._text, self._line = self._split(data)
+        self.text = CellOutputDataElement(mime, self._text, metadata, parent)
+        self.line = CellOutputDataElement(mime, self._line, metadata, parent)
+        self.container = HSplit(
+            [
+                ConditionalContainer(
+                    self.text, filter=Condition(lambda: bool(self._text))
+                ),
+                ConditionalContainer(
+                    self.line, filter=Condition(lambda: bool(self._line))
+                ),
+            ]
+        )
+
+    def _split(self, data: str) -> tuple[str, str]:
+        """Split stream text into complete lines and the final incomplete line.
+
+        Graphic attributes set by the complete lines are re-applied at the start of
+        the final line, so it is displayed as it would be in the full text.
+        """
+        text, newline, line = data.rpartition("\n")
+        # Cursor movements between lines cannot be rendered separately
+        if "\x1b[" in line and _CURSOR_UP_RE.search(line):
+            return data, ""
+        text += newline
+        if text != self._text:
+            self._sgr = _sgr_state(text) if "\x1b[" in text else ""
+        if line and self._sgr:
+            line = self._sgr + line
+        return text, line
+
+    @property
+    def data(self) -> str:
+        """Return the stream text."""
+        return self._data
+
+    @data.setter
+    def data(self, value: str) -> None:
+        """Set the stream text, only updating the parts which have changed."""
+        self._data = value
+        text, line = self._split(value)
+        if text != self._text:
+            self._text = text
+            self.text.data = text
+        if line != self._line:
+            self._line = line
+            self.line.data = line
+
+    @property
+    def elements(self) -> list[CellOutputDataElement]:
+        """Return the visible data elements."""
+        return [
+            element
+            for element, value in ((self.text, self._text), (self.line, self._line))
+            if value
+        ]
+
+    @property
+    def width(self) -> int:
+        """Return the current width of the output's content."""
+        return max((element.width for element in self.elements), default=0)
+
+    def scroll_left(self) -> None:
+        """Scroll the output left."""
+        for element in self.elements:
+            element.scroll_left()
+
+    def scroll_right(self, max: int | None = None) -> None:
+        """Scroll the output right."""
+        for element in self.elements:
+            element.scroll_right(max)
+
+    def __pt_container__(self) -> AnyContainer:
+        """Return the stream container."""
+        return self.container
+
+
 class CellOutputWidgetElement(CellOutputElement):
     """A cell output element which displays ipywidgets."""
 
@@ -276,6 +434,7 @@ class CellOutputJsonElement(CellOutputElement):
 MIME_RENDERERS: dict[str, type[CellOutputElement]] = {
     "application/vnd.jupyter.widget-view+json": CellOutputWidgetElement,
     "application/json": CellOutputJsonElement,
+    "stream/std*": CellOutputStreamElement,
     "*": CellOutputDataElement,
 }
 
@@ -283,6 +442,7 @@ MIME_ORDER = [
     "application/vnd.jupyter.widget-view+json",
     "application/json",
     "image/*",
+    "application/vnd.dataresource+json",
     "text/html",
     "text/markdown",
     "text/x-markdown",
@@ -331,7 +491,11 @@ class CellOutput:
         """
         # Select the first mime-type to render
         self.parent = parent
-        self.json = json
+        self.source = json
+        # The output area which displays this output
+        self.area: CellOutputArea | None = None
+        # Keep a copy for display, so the original does not get modified
+        self.json = dict(json)
         self._selected_mime: str | None = None
         self._elements: dict[str, CellOutputElement] = {}
 
@@ -376,10 +540,27 @@ class CellOutput:
         data = self.data
         for mime_type, element in list(self._elements.items()):
             if mime_type in data:
-                element.data = data[mime_type]
+                element.data = load_payload(data[mime_type])
             else:
                 del self._elements[mime_type]
 
+    def update_display(self, output_json: dict[str, Any]) -> None:
+        """Replace the output's data in-place with that of a display update.
+
+        Args:
+            output_json: The JSON of the updated display data output
+        """
+        for target in (self.source, self.json):
+            target["data"] = output_json.get("data", {})
+            target["metadata"] = output_json.get("metadata", {})
+        if self.area is not None:
+            self.area.invalidate(self.source)
+        if self._selected_mime not in self.json["data"]:
+            self._selected_mime = None
+        self.update()
+        if self.parent is not None:
+            self.parent.refresh()
+
     def make_element(self, mime: str) -> CellOutputElement:
         """Create a container for the cell output mime-type if it doesn't exist.
 
@@ -395,11 +576,13 @@ class CellOutput:
                 try:
                     element = OutputElement(
                         mime=mime,
-                        data=data[mime],
+                        # Large outputs are only read from the notebook file once
+                        # they are displayed
+                        data=load_payload(data[mime]),
                         metadata=self.json.get("metadata", {}).get(mime, {}),
                         parent=self.parent,
                     )
-                except (NotImplementedError, KeyError):
+                except (NotImplementedError, KeyError, OSError):
                     self.selected_mime = mime = list(data.keys())[-1]
                     continue
                 else:
@@ -454,10 +637,16 @@ class CellOutputArea:
 
         """
         self._json: list[dict[str, Any]] = []
+        self._keys: dict[int, tuple[dict[str, Any], int]] = {}
         self.parent = parent
         self.style = style
         self.display_json: list[dict[str, Any]] = []
         self.rendered_outputs: list[CellOutput] = []
+        # The output JSON objects from which each rendered output was built
+        self.output_sources: list[list[dict[str, Any]]] = []
+        # Times at which stream outputs were last updated, and pending updates
+        self._last_updates: dict[CellOutput, float] = {}
+        self._pending_updates: set[CellOutput] = set()
         self.container = HSplit([], style=lambda: self.style)
         self.children = self.container.children
         self.json = json
@@ -469,42 +658,160 @@ class CellOutputArea:
 
     @json.setter
     def json(self, value: Any) -> None:
-        """Set the cell output area JSON data."""
-        # Reset if we have lost existing outputs
-        if any(old_output_json not in value for old_output_json in self._json):
+        """Set the cell output area JSON data.
+
+        Outputs are compared using a cached content hash, falling back to comparing
+        their JSON when hashes match. If the new outputs extend the existing ones,
+        only the additional outputs are rendered; otherwise the output area is
+        rebuilt, re-using the rendered outputs which are unchanged.
+        """
+        old_keys = [self._output_key(output_json) for output_json in self._json]
+        new_keys = [self._output_key(output_json) for output_json in value]
+        # Forget content hashes for outputs we no longer hold
+        keep = {id(output_json) for output_json in value}
+        for ident in [ident for ident in self._keys if ident not in keep]:
+            del self._keys[ident]
+
+        n_old = len(old_keys)
+        if new_keys[:n_old] == old_keys and value[:n_old] == self._json:
+            if len(new_keys) == n_old:
+                return
+            for output_json in value[n_old:]:
+                self.add_output(output_json, refresh=False)
+        else:
+            # Collect rendered outputs which can be re-used
+            pool: dict[int, list[CellOutput]] = {}
+            for sources, output in zip(self.output_sources, self.rendered_outputs):
+                if len(sources) == 1:
+                    pool.setdefault(self._output_key(sources[0]), []).append(output)
             self.reset()
-        # Add any new outputs we do not already have
-        for new_output_json in value:
-            if new_output_json not in self._json:
-                self.add_output(new_output_json, refresh=False)
+            for output_json in value:
+                self.add_output(output_json, refresh=False, pool=pool)
         get_app().invalidate()
 
-    def add_output(self, output_json: dict[str, Any], refresh: bool = True) -> None:
-        """Add a new output to the output area."""
+    def _output_key(self, output_json: dict[str, Any]) -> int:
+        """Return a content hash for an output's JSON, cached by object identity.
+
+        Outputs which are modified in-place must be passed to :py:meth:`invalidate`
+        so their hash is re-calculated.
+        """
+        ident = id(output_json)
+        if (cached := self._keys.get(ident)) is not None and cached[0] is output_json:
+            return cached[1]
+        key = hash(json.dumps(output_json, sort_keys=True, default=repr))
+        self._keys[ident] = (output_json, key)
+        return key
+
+    def extend_stream(self, output_json: dict[str, Any], text: str) -> None:
+        """Append text in-place to the last output in the output area.
+
+        Args:
+            output_json: The JSON of the stream output to extend, which must be the
+                last output in the output area
+            text: The text to append to the stream
+        """
+        output_json["text"] = merge_stream_text(output_json.get("text", ""), text)
+        self.invalidate(output_json)
+        for display_json, output, sources in zip(
+            self.display_json, self.rendered_outputs, self.output_sources
+        ):
+            if sources[-1] is output_json:
+                display_json["text"] = merge_stream_text(display_json["text"], text)
+                self._throttle_update(output)
+                break
+        get_app().invalidate()
+
+    def invalidate(self, output_json: dict[str, Any]) -> None:
+        """Forget the cached content hash of an output which was modified in-place."""
+        self._keys.pop(id(output_json), None)
+
+    def add_output(
+        self,
+        output_json: dict[str, Any],
+        refresh: bool = True,
+        pool: dict[int, list[CellOutput]] | None = None,
+    ) -> None:
+        """Add a new output to the output area.
+
+        Args:
+            output_json: The JSON of the output to add
+            refresh: Whether to invalidate the application after adding the output
+            pool: Previously rendered outputs, keyed by content hash, which may be
+                re-used instead of creating a new output
+        """
         # Update json
         self._json.append(output_json)
         # Update display json
         add_output = True
         if name := output_json.get("name"):
-            for existing_output, rendered_output in zip(
-                self.display_json, self.rendered_outputs
+            for existing_output, rendered_output, sources in zip(
+                self.display_json, self.rendered_outputs, self.output_sources
             ):
                 if name == existing_output.get("name"):
-                    existing_output["text"] += output_json.get("text", "")
-                    rendered_output.update()
+                    existing_output["text"] = merge_stream_text(
+                        existing_output["text"], output_json.get("text", "")
+                    )
+                    sources.append(output_json)
+                    self._throttle_update(rendered_output)
                     add_output = False
                     break
         if add_output:
-            # Add a copy to the display json so the original does not get modified
-            output_json_copy = dict(output_json)
-            self.display_json.append(output_json_copy)
-            # Create an output container with the copy
-            output = CellOutput(output_json_copy, self.parent)
+            reusable = pool.get(self._output_key(output_json), []) if pool else []
+            # Hashes can collide, so the content of matching outputs is also compared
+            for output in reusable:
+                if output.source == output_json:
+                    # Re-use an existing rendered output with identical content
+                    reusable.remove(output)
+                    output.source = output_json
+                    break
+            else:
+                output = CellOutput(output_json, self.parent)
+            output.area = self
+            self.display_json.append(output.json)
             self.rendered_outputs.append(output)
+            self.output_sources.append([output_json])
             self.children.append(to_container(output))
+            # Index the output by its display ID so it can be updated in-place
+            if self.parent is not None and (
+                display_id := (output_json.get("transient") or {}).get("display_id")
+            ):
+                self.parent.kernel_tab.register_display(display_id, output)
         if refresh:
             get_app().invalidate()
 
+    def _throttle_update(self, output: CellOutput) -> None:
+        """Update a stream output, limiting the rate at which it is redrawn.
+
+        Streams may be updated many times per second (e.g. by progress bars), so
+        updates occurring within the configured interval of the previous update are
+        deferred, and only the latest state of the stream is rendered.
+        """
+        app = get_app()
+        interval = app.config.stream_update_interval
+        loop = app.loop
+        now = time.monotonic()
+        last = self._last_updates.get(output)
+        if interval <= 0 or loop is None or last is None or now - last >= interval:
+            self._last_updates[output] = now
+            output.update()
+            return
+
+        if output in self._pending_updates:
+            return
+        self._pending_updates.add(output)
+
+        def _update() -> None:
+            self._pending_updates.discard(output)
+            if output in self.rendered_outputs:
+                self._last_updates[output] = time.monotonic()
+                output.update()
+                if self.parent is not None:
+                    self.parent.refresh()
+                else:
+                    app.invalidate()
+
+        loop.call_soon_threadsafe(loop.call_later, interval - (now - last), _update)
+
     def update(self) -> None:
         """Update all existing outputs."""
         for output in self.rendered_outputs:
@@ -516,6 +823,9 @@ class CellOutputArea:
         self._json.clear()
         self.display_json.clear()
         self.rendered_outputs.clear()
+        self.output_sources.clear()
+        self._last_updates.clear()
+        self._pending_updates.clear()
         self.children.clear()
 
     def scroll_left(self) -> None:
@@ -544,8 +854,15 @@ class CellOutputArea:
         app = get_app()
         config = app.config
         for cell_output in self.rendered_outputs:
-            if isinstance(cell_output.element, CellOutputDataElement):
-                control = cell_output.element.container.control
+            element = cell_output.element
+            if isinstance(element, CellOutputStreamElement):
+                elements = element.elements
+            elif isinstance(element, CellOutputDataElement):
+                elements = [element]
+            else:
+                continue
+            for data_element in elements:
+                control = data_element.container.control
                 for line in control.get_lines(
                     control.datum,
                     width=88,
@@ -553,6 +870,8 @@ class CellOutputArea:
                     fg=(cp := app.color_palette).fg.base_hex,
                     bg=cp.bg.base_hex,
                     wrap_lines=config.wrap_cell_outputs,
+                    # Every row of large tables must be included in the copied text
+                    virtual_rows=False,
                 ):
                     outputs.append(to_plain_text(line))
         return "\n".join(outputs)
@@ -572,6 +572,28 @@ class SaveAsDialog(FileDialog):
 
     title = "Select a Path to Save"
 
+    def load(
+        self,
+        text: str = "",
+        tab: Tab | None = None,
+        error: str = "",
+        cb: Callable | None = None,
+        save: Callable[[Path], None] | None = None,
+    ) -> None:
+        """Load the dialog body.
+
+        Args:
+            text: The initial file name
+            tab: The tab to save
+            error: An error message to display
+            cb: A function to call once the tab has been saved
+            save: A function used to save the tab to the selected path, instead of
+                saving the tab at the path
+
+        """
+        super().load(text=text, tab=tab, error=error, cb=cb)
+        self.save = save
+
     def validate(
         self, buffer: Buffer, tab: Tab | None, cb: Callable | None = None
     ) -> None:
@@ -589,7 +611,10 @@ class SaveAsDialog(FileDialog):
             if path.is_dir():
                 self.file_browser.control.dir = path
             else:
-                tab.save(path=path)
+                if self.save is not None:
+                    self.save(path)
+                else:
+                    tab.save(path=path)
                 self.hide()
                 if callable(cb):
                     cb()
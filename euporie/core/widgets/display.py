@@ -147,8 +147,24 @@ class DisplayControl(UIControl):
         fg: str,
         bg: str,
         wrap_lines: bool = False,
+        virtual_rows: bool = True,
     ) -> list[StyleAndTextTuples]:
-        """Render the lines to display in the control."""
+        """Render the lines to display in the control.
+
+        Args:
+            datum: The data to render
+            width: The width at which to render the data
+            height: The height at which to render the data
+            fg: The foreground color to use
+            bg: The background color to use
+            wrap_lines: Whether to wrap lines which are too long
+            virtual_rows: Whether the rows of large tables may be rendered when they
+                are displayed, rather than all at once
+
+        Returns:
+            The rendered lines
+
+        """
         ft = datum.convert(
             to="ft",
             cols=width,
@@ -158,17 +174,26 @@ class DisplayControl(UIControl):
             extend=not self.dont_extend_width(),
             # Use as extra cache key to force re-rendering when wrap_lines changes
             wrap_lines=wrap_lines,
+            # Render rows of large tables in the background when they are displayed
+            # in full-screen apps. Other apps draw their output once, so every row
+            # must be rendered up front
+            virtual_rows=virtual_rows and get_app().full_screen,
         )
         if width and height:
             key = Datum.add_size(datum, Size(height, width))
             ft = [(f"[Graphic_{key}]", ""), *ft]
         lines = list(split_lines(ft))
         if wrap_lines and width:
+            from euporie.core.ft.html import has_virtual_rows, wrap_virtual_rows
+
             lines = [
                 wrapped_line
                 for line in lines
-                for wrapped_line in split_lines(
-                    wrap(line, width, truncate_long_words=False)
+                for wrapped_line in (
+                    # Placeholders for table rows must be split at fixed positions
+                    wrap_virtual_rows(line, width)
+                    if has_virtual_rows(line)
+                    else split_lines(wrap(line, width, truncate_long_words=False))
                 )
             ]
         # Ensure we have enough lines to fill the requested height
@@ -272,8 +297,25 @@ class DisplayControl(UIControl):
         loading: bool,
         cursor_position: Point,
         color_palette: ColorPalette,
+        render_rows: bool = True,
     ) -> UIContent:
-        """Create a cacheable UIContent."""
+        """Create a cacheable UIContent.
+
+        Args:
+            datum: The data being displayed
+            width: The width of the control
+            height: The height of the control
+            loading: Whether the data is being loaded
+            cursor_position: The position of the cursor
+            color_palette: The current color palette
+            render_rows: Whether rows of virtualized tables should be rendered
+
+        Returns:
+            The content to display in the control
+
+        """
+        from euporie.core.ft.html import render_virtual_rows
+
         if self.loading:
             lines = [
                 cast("StyleAndTextTuples", []),
@@ -293,7 +335,7 @@ class DisplayControl(UIControl):
                 line = lines[i]
             except IndexError:
                 return []
-            return line
+            return render_virtual_rows(line) if render_rows else line
 
         return UIContent(
             get_line=get_line,
@@ -323,11 +365,15 @@ class DisplayControl(UIControl):
         if render:
             self.render()
         content = self._content_cache[
-            self.datum, width, height, self.loading, self.cursor_position, cp
+            self.datum, width, height, self.loading, self.cursor_position, cp, True
         ]
 
-        # Check for graphics in content
-        self.graphic_processor.load(content)
+        # Check for graphics in content, without rendering every row of large tables
+        self.graphic_processor.load(
+            self._content_cache[
+                self.datum, width, height, self.loading, self.cursor_position, cp, False
+            ]
+        )
 
         return content
 
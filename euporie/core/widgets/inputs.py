@@ -53,6 +53,7 @@ from euporie.core.app.current import get_app
 from euporie.core.commands import add_cmd
 from euporie.core.diagnostics import Report
 from euporie.core.filters import buffer_is_code, scrollable
+from euporie.core.format import format_text
 from euporie.core.key_binding.registry import (
     load_registered_bindings,
     register_bindings,
@@ -361,10 +362,8 @@ class KernelInput(TextArea):
 
     def reformat(self) -> None:
         """Reformat the cell's input."""
-        original_text = new_text = self.buffer.text
-        language = self.language
-        for formatter in self.formatters:
-            new_text = formatter._format(original_text, language)
+        original_text = self.buffer.text
+        new_text = format_text(original_text, self.language, self.formatters)
         # Do not trigger a text-changed event if the reformatting results in no change
         if new_text != original_text:
             self.buffer.text = new_text
@@ -29,8 +29,12 @@ from euporie.notebook.filters import (
 )
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from prompt_toolkit.key_binding.key_bindings import NotImplementedOrNone
 
+    from euporie.notebook.tabs.notebook import Notebook
+
 # euporie.notebook.tabs.log
 
 
@@ -573,9 +577,7 @@ def _reformat_cells() -> None:
     from euporie.notebook.tabs.notebook import Notebook
 
     if isinstance(nb := get_app().tab, Notebook):
-        for cell in nb.cells:
-            if cell.cell_type == "code":
-                cell.input_box.reformat()
+        nb.format_cells([cell for cell in nb.cells if cell.cell_type == "code"])
 
 
 @add_cmd(aliases=["fmt"], filter=notebook_has_focus & ~buffer_has_focus)
@@ -587,6 +589,48 @@ def _reformat_notebook() -> None:
         nb.reformat()
 
 
+def _write_with_inline_outputs(nb: Notebook, target: Path) -> None:
+    """Write a copy of a notebook with all output data stored in the file."""
+    import asyncio
+
+    from euporie.core.nbformat import NOTEBOOK_EXTENSIONS, write_ipynb, write_text
+
+    app = get_app()
+    if nb.path is not None and target.absolute() == nb.path.absolute():
+        if dialog := app.get_dialog("msgbox"):
+            dialog.show(
+                title="Cannot save copy",
+                message="A copy of the notebook cannot replace the open notebook",
+            )
+        return
+    # Output data moved to an output store is written to the file without
+    # modifying the notebook, so it is stored externally again on the next save
+    write = (
+        write_text
+        if target.suffix != ".ipynb" and target.suffix in NOTEBOOK_EXTENSIONS
+        else write_ipynb
+    )
+    app.create_background_task(asyncio.to_thread(write, nb.snapshot(), target))
+
+
+@add_cmd(filter=notebook_has_focus)
+def _save_with_inline_outputs(path: str = "") -> None:
+    """Save a copy of the notebook with all output data stored in the notebook file."""
+    from functools import partial
+
+    from upath import UPath
+
+    from euporie.notebook.tabs.notebook import Notebook
+
+    app = get_app()
+    if not isinstance(nb := app.tab, Notebook):
+        return
+    if path:
+        _write_with_inline_outputs(nb, UPath(path))
+    elif dialog := app.get_dialog("save-as"):
+        dialog.show(tab=nb, save=partial(_write_with_inline_outputs, nb))
+
+
 @add_cmd(
     filter=cell_has_focus & ~buffer_has_focus,
 )
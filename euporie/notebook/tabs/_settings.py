@@ -15,6 +15,41 @@ add_setting(
     """,
 )
 
+add_setting(
+    name="autosave_delay",
+    group="euporie.notebook.tabs.notebook",
+    flags=["--autosave-delay"],
+    type_=float,
+    help_="Automatically save notebooks after this many seconds without changes",
+    default=0.0,
+    schema={
+        "minimum": 0.0,
+    },
+    description="""
+        When set to a positive number, notebooks with unsaved changes are saved
+        automatically in the background once they have not been changed for this
+        many seconds. Only cells which have changed since the last save are encoded
+        again. Untitled notebooks are not saved automatically. Use ``0`` to disable
+        automatic saving.
+    """,
+)
+
+add_setting(
+    name="progressive_open",
+    group="euporie.notebook.tabs.notebook",
+    flags=["--progressive-open"],
+    type_=bool,
+    help_="Display cells while notebook files are still being read",
+    default=False,
+    description="""
+        When set, ``.ipynb`` files are parsed in a background thread when they are
+        opened, and cells are displayed as soon as they have been read. This allows
+        the start of large notebooks to be viewed and scrolled through before the
+        whole file has been parsed. Notebooks cannot be saved until they have been
+        read completely.
+    """,
+)
+
 add_setting(
     name="show_side_bar",
     group="euporie.notebook.widgets.side_bar",
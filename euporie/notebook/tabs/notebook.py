@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 from collections import deque
 from copy import deepcopy
 from functools import partial
@@ -23,6 +25,7 @@ from euporie.core.filters import (
     multiple_cells_selected,
     replace_mode,
 )
+from euporie.core.format import format_texts
 from euporie.core.key_binding.registry import (
     load_registered_bindings,
     register_bindings,
@@ -32,13 +35,19 @@ from euporie.core.layout.decor import Line, Pattern
 from euporie.core.layout.mouse import MouseHandlerWrapper
 from euporie.core.layout.scroll import ScrollingContainer
 from euporie.core.margins import MarginContainer, ScrollbarMargin
-from euporie.core.nbformat import NOTEBOOK_EXTENSIONS, new_code_cell
+from euporie.core.nbformat import (
+    NOTEBOOK_EXTENSIONS,
+    iter_read,
+    new_code_cell,
+    new_notebook,
+)
+from euporie.core.path import UntitledPath
 from euporie.core.style import KERNEL_STATUS_REPR
 from euporie.core.tabs.notebook import BaseNotebook
 from euporie.core.widgets.cell import Cell
 
 if TYPE_CHECKING:
-    from collections.abc import MutableSequence, Sequence
+    from collections.abc import Callable, MutableSequence, Sequence
     from pathlib import Path
     from typing import Any
 
@@ -54,6 +63,9 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+# The minimum time to wait before retrying a failed automatic save, in seconds
+_AUTOSAVE_RETRY_DELAY = 60.0
+
 
 class Notebook(BaseNotebook):
     """Interactive notebooks.
@@ -69,6 +81,14 @@ class Notebook(BaseNotebook):
     allow_stdin = True
     bg_init = True
 
+    _dirty = False
+    # The times at which the notebook was last changed and last started being saved
+    _changed = 0.0
+    _save_started = 0.0
+    _autosave_pending = False
+    _autosaving = False
+    _autosave_failed = False
+
     def __init__(
         self,
         app: BaseApp,
@@ -97,6 +117,77 @@ class Notebook(BaseNotebook):
 
     # Tab stuff
 
+    @property
+    def dirty(self) -> bool:
+        """Whether the notebook has changes which have not been saved."""
+        return self._dirty
+
+    @dirty.setter
+    def dirty(self, value: bool) -> None:
+        """Mark the notebook as changed, scheduling an automatic save if enabled."""
+        if value:
+            self._changed = time.monotonic()
+            self._schedule_autosave()
+        else:
+            self._autosaving = self._autosave_failed = False
+            if self._changed > self._save_started:
+                # Changes were made while the notebook was being saved
+                return
+        self._dirty = value
+
+    def _schedule_autosave(self, delay: float | None = None) -> None:
+        """Save the notebook once it has not been changed for the autosave delay."""
+        if delay is None:
+            delay = self.app.config.autosave_delay
+        loop = self.app.loop
+        if delay <= 0 or loop is None or self._autosave_pending:
+            return
+        self._autosave_pending = True
+        loop.call_soon_threadsafe(loop.call_later, delay, self._autosave)
+
+    def _autosave(self) -> None:
+        """Save the notebook in the background if it has been idle for long enough."""
+        self._autosave_pending = False
+        if (
+            not self.dirty
+            or self not in self.app.tabs
+            or self.path is None
+            or isinstance(self.path, UntitledPath)
+        ):
+            return
+        delay = self.app.config.autosave_delay
+        remaining = self._changed + delay - time.monotonic()
+        if self.saving or remaining > 0:
+            self._schedule_autosave(remaining if remaining > 0 else delay)
+        else:
+            log.debug("Autosaving %s", self.path)
+            self._autosaving = True
+            self._save()
+
+    def save_failed(self, cb: Callable | None = None) -> None:
+        """Retry failed automatic saves later, rather than prompting the user."""
+        if not self._autosaving:
+            super().save_failed(cb)
+            return
+        self._autosaving = False
+        self._autosave_failed = True
+        delay = max(self.app.config.autosave_delay, _AUTOSAVE_RETRY_DELAY)
+        log.warning("Autosave of %s failed, retrying in %ds", self.path, delay)
+        self.app.invalidate()
+        self._schedule_autosave(delay)
+
+    def save(self, path: Path | None = None, cb: Callable | None = None) -> None:
+        """Save the notebook, unless it is still being read from its file."""
+        if not self.loaded:
+            log.warning("%s cannot be saved until it has finished loading", self.path)
+            return
+        super().save(path, cb)
+
+    def write_file(self, path: Path) -> None:
+        """Write the notebook to a file, recording when the save started."""
+        self._save_started = time.monotonic()
+        super().write_file(path)
+
     def _statusbar_kernel_handler(self, event: MouseEvent) -> NotImplementedOrNone:
         """Event handler for kernel name field in statusbar."""
         if event.event_type == MouseEventType.MOUSE_UP:
@@ -108,7 +199,15 @@ class Notebook(BaseNotebook):
     def __pt_status__(self) -> StatusBarFields | None:
         """Generate the formatted text for the statusbar."""
         fields: tuple[list[AnyFormattedText], list[AnyFormattedText]] = (
-            ["Saving…" if self.saving else ""],
+            [
+                "Saving…"
+                if self.saving
+                else "Autosave failed"
+                if self._autosave_failed
+                else ""
+                if self.loaded
+                else "Loading…"
+            ],
             [
                 [
                     (
@@ -162,19 +261,63 @@ class Notebook(BaseNotebook):
         """Trigger loading of the main notebook container."""
 
         async def _load() -> None:
-            # Load notebook file
-            self.load()
-            # Load and focus container
-            prev = self.container
-            self.container = self._load_container()
-            # Update the focus if the old container had focus
-            if self.app.layout.has_focus(prev):
-                self.focus()
+            if (
+                self.app.config.progressive_open
+                and self.path is not None
+                and self.path.suffix == ".ipynb"
+                and self.path.exists()
+            ):
+                await self._load_progressively()
+            else:
+                # Read the notebook file in a thread, so several notebooks can be
+                # loaded at once without blocking the user interface
+                await asyncio.to_thread(self.load)
+                self._show_container()
 
         self.app.create_background_task(_load())
 
         return self.container
 
+    def _show_container(self) -> None:
+        """Replace the placeholder container with the notebook's main container."""
+        prev = self.container
+        self.container = self._load_container()
+        # Update the focus if the old container had focus
+        if self.app.layout.has_focus(prev):
+            self.focus()
+
+    async def _load_progressively(self) -> None:
+        """Read the notebook file in a thread, displaying cells as they are parsed."""
+        assert self.path is not None
+        self.json = nb = new_notebook()
+        cells = nb["cells"]
+        try:
+            with self.path.open() as f:
+                parts = iter_read(f, as_version=4)
+                while (part := await asyncio.to_thread(next, parts, None)) is not None:
+                    cells.extend(part.pop("cells", []))
+                    nb.update(part)
+                    if not hasattr(self, "page"):
+                        if cells:
+                            self._show_container()
+                    else:
+                        self.page.refresh_children = True
+                        self.app.invalidate()
+        except Exception:
+            log.exception("Error reading %s progressively", self.path)
+            # Discard any cells which were displayed and read the whole file again
+            self._rendered_cells = {}
+            self.load()
+            if hasattr(self, "page"):
+                self.refresh(scroll=False)
+        else:
+            self.finish_loading()
+        if hasattr(self, "page"):
+            self.page.refresh_children = True
+            self.app.invalidate()
+        else:
+            self._show_container()
+
     def _load_container(self) -> AnyContainer:
         """Actually load the main notebook container."""
         self.page = ScrollingContainer(
@@ -552,9 +695,48 @@ class Notebook(BaseNotebook):
 
     def reformat(self) -> None:
         """Reformat all code cells in the notebooks."""
-        for cell in self.rendered_cells():
-            if cell.cell_type == "code":
-                cell.input_box.reformat()
+        self.format_cells(
+            [cell for cell in self.rendered_cells() if cell.cell_type == "code"]
+        )
+
+    def format_cells(
+        self,
+        cells: Sequence[Cell],
+        callback: Callable[[], None] | None = None,
+        wait: bool = False,
+    ) -> None:
+        """Reformat the inputs of multiple cells concurrently.
+
+        Formatters are run in the background, and each cell's input is updated once all
+        cells have been formatted, unless it has been edited in the mean time.
+
+        Args:
+            cells: The cells to format
+            callback: A function to call after the cells' inputs have been updated
+            wait: If :py:const:`True`, block until formatting is complete
+        """
+        inputs = [(cell.input_box, cell.input_box.buffer.text) for cell in cells]
+
+        def _apply(results: list[str]) -> None:
+            for (input_box, text), new_text in zip(inputs, results):
+                if new_text != text and input_box.buffer.text == text:
+                    input_box.buffer.text = new_text
+            if callable(callback):
+                callback()
+
+        def _apply_threadsafe(results: list[str]) -> None:
+            # Update the cells in the main thread
+            if (loop := self.app.loop) is not None and not wait:
+                loop.call_soon_threadsafe(_apply, results)
+            else:
+                _apply(results)
+
+        format_texts(
+            [(text, input_box.language) for input_box, text in inputs],
+            self.formatters,
+            callback=_apply_threadsafe,
+            wait=wait,
+        )
 
     def run_selected_cells(
         self,
@@ -588,12 +770,25 @@ class Notebook(BaseNotebook):
     def run_all(self, wait: bool = False) -> None:
         """Run all cells."""
         if self.kernel:
-            log.debug("Running all cells (wait=%s)", wait)
-            for cell in self.rendered_cells():
-                if cell.json.get("cell_type") == "code":
+            cells = [
+                cell
+                for cell in self.rendered_cells()
+                if cell.json.get("cell_type") == "code"
+            ]
+
+            def _run() -> None:
+                log.debug("Running all cells (wait=%s)", wait)
+                for cell in cells:
                     log.debug("Running cell %s", cell.id)
                     cell.run_or_render(wait=wait)
-            log.debug("All cells run")
+                log.debug("All cells run")
+
+            if self.app.config.autoformat:
+                # Format all cells together in the background before running them, so
+                # each cell's formatting result is cached when it is run
+                self.format_cells(cells, callback=_run, wait=wait)
+            else:
+                _run()
 
     # ################################# Key Bindings ##################################
 
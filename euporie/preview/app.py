@@ -72,6 +72,11 @@ class PreviewApp(BaseApp):
         """Return the tab to use for a file path."""
         return PreviewNotebook
 
+    def open_files(self) -> None:
+        """Open all files immediately, so the app does not exit between files."""
+        for i, file in enumerate(self.config.files):
+            self.open_file(file, tab_class=PreviewNotebook, focus=i == 0)
+
     def exit(
         self,
         result: _AppResult | None = None,
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING, cast
 
@@ -30,7 +31,6 @@ from euporie.core.key_binding.registry import (
 from euporie.core.path import parse_path
 
 if TYPE_CHECKING:
-    import asyncio
     from collections.abc import Callable, Iterable
     from pathlib import Path
     from typing import Any
@@ -199,10 +199,12 @@ class WebViewControl(UIControl):
 
     def render(self, force: bool = False) -> None:
         """Render the HTML DOM in a thread."""
-        dom = self.dom
 
         async def _render() -> None:
             assert self.url is not None
+            # Load the page in a worker thread so a slow server does not block the
+            # event loop used for other conversions
+            dom = await asyncio.to_thread(lambda: self.dom)
             # Potentially redirect url
             self.url = parse_path(self.url)
             self.lines = list(split_lines(await dom._render(self.width, self.height)))
@@ -251,7 +253,7 @@ class WebViewControl(UIControl):
         assets_loaded: bool,
     ) -> UIContent:
         """Create a cacheable UIContent."""
-        dom = self._dom_cache[url,]
+        dom = None if loading else self._dom_cache[url,]
         if self.loading:
             lines = [
                 cast("StyleAndTextTuples", []),
@@ -270,7 +272,7 @@ class WebViewControl(UIControl):
                 line = []
 
             # Overlay fixed lines onto this line
-            if not loading and dom.fixed:
+            if dom is not None and dom.fixed:
                 visible_line = max(0, i - self.window.vertical_scroll)
                 fixed_lines = list(split_lines(dom.fixed_mask))
                 if visible_line < len(fixed_lines):
@@ -309,7 +311,8 @@ class WebViewControl(UIControl):
             width,
             height,
             self.cursor_position,
-            self.dom.render_count,
+            # Do not block on loading the page while it is loading in the background
+            0 if self.loading else self.dom.render_count,
         ]
 
         # Check for graphics in content
@@ -381,7 +384,7 @@ class WebViewControl(UIControl):
                 self.width,
                 self.height,
                 self.cursor_position,
-                self.dom.render_count,
+                0 if self.loading else self.dom.render_count,
             ]
             line = content.get_line(mouse_event.position.y)
         except IndexError:
@@ -452,7 +455,7 @@ class WebViewControl(UIControl):
         """
         yield self.rendered
         yield self.on_cursor_position_changed
-        if dom := self.dom:
+        if not self.loading and (dom := self.dom):
             yield dom.on_update
 
     # ################################### Commands ####################################
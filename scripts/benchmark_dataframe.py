@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Measure the time taken to render DataFrames as formatted text.
+
+DataFrames are rendered from their HTML representation, both directly as tables and
+using the HTML engine. Requires :py:mod:`pandas` to be installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from euporie.core.convert.datum import Datum
+from euporie.core.convert.formats.ft import dataframe_html_to_ft, html_to_ft
+
+
+def main() -> None:
+    """Render DataFrames of various sizes and report the time taken."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size",
+        action="append",
+        metavar="ROWSxCOLS",
+        help="The shape of a DataFrame to render (default: 100x20 and 10000x50)",
+    )
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument(
+        "--html-max-cells",
+        type=int,
+        default=20_000,
+        help="Only render DataFrames with up to this many cells using the HTML engine",
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    # Warm up imports and caches which are shared between conversions
+    markup = pd.DataFrame(rng.random((2, 2))).to_html()
+    for converter in (dataframe_html_to_ft, html_to_ft):
+        asyncio.run(converter(Datum(markup, format="html"), cols=args.width))
+
+    for size in args.size or ["100x20", "10000x50"]:
+        rows, cols = map(int, size.split("x"))
+        markup = pd.DataFrame(rng.random((rows, cols))).to_html()
+        converters = [("direct", dataframe_html_to_ft)]
+        if rows * cols <= args.html_max_cells:
+            converters.append(("html", html_to_ft))
+        for name, converter in converters:
+            datum = Datum(markup, format="html")
+            start = time.perf_counter()
+            asyncio.run(converter(datum, cols=args.width))
+            elapsed = time.perf_counter() - start
+            print(f"{rows:>6} x {cols:<3} {name:>6}: {elapsed:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
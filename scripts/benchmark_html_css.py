@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""Benchmark CSS rule matching when rendering a large styled DataFrame as HTML.
+
+Requires :py:mod:`pandas` and :py:mod:`jinja2` to be installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from euporie.core.ft.html import HTML
+
+
+def main() -> None:
+    """Render a styled DataFrame with one CSS rule per cell and report timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=250)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.DataFrame(np.arange(args.rows * args.cols).reshape(args.rows, args.cols))
+    # Give each cell a distinct style, so pandas generates a separate
+    # ``#T_xxx_rowN_colM`` rule for every cell
+    markup = df.style.map(lambda v: f"background-color: #{v % 4096:03x}").to_html()
+    print(
+        f"{args.rows * args.cols} cells, {markup.count('{')} CSS rules, "
+        f"{len(markup)} characters of HTML"
+    )
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        HTML(markup, width=args.width).render(args.width, None)
+        timings.append(time.perf_counter() - start)
+    print(
+        f"Render time: best {min(timings):.3f}s, mean {sum(timings) / len(timings):.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
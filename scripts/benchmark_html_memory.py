@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Measure the memory used by the DOM of a large HTML table.
+
+Requires :py:mod:`pandas` to be installed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from euporie.core.ft.html import HTML
+
+
+def main() -> None:
+    """Render a large DataFrame as HTML and report the size of its DOM."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--cols", type=int, default=10)
+    parser.add_argument("--width", type=int, default=200)
+    args = parser.parse_args()
+
+    df = pd.DataFrame(np.random.default_rng(0).random((args.rows, args.cols)))
+    markup = df.to_html()
+    # Warm up caches which are shared between DOMs
+    HTML(markup, width=args.width).render(args.width, None)
+
+    gc.collect()
+    tracemalloc.start()
+    dom = HTML(markup, width=args.width)
+    dom.process_dom()
+    gc.collect()
+    parsed, _ = tracemalloc.get_traced_memory()
+    dom.render(args.width, None)
+    gc.collect()
+    rendered, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = sum(1 for _ in dom.soup.descendents)
+    print(f"{args.rows * args.cols} cells, {nodes} DOM nodes")
+    print(f"Parsed DOM: {parsed / 2**20:.1f} MiB ({parsed / nodes:.0f} B / node)")
+    print(f"Rendered DOM: {rendered / 2**20:.1f} MiB ({rendered / nodes:.0f} B / node)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""Measure the time and peak memory used to load and save large notebook files.
+
+Synthetic notebooks containing source code, stream outputs, HTML tables and base64
+encoded images are generated, then loaded and saved in fresh processes using euporie's
+reader and writer and, if it is installed, :py:mod:`nbformat`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import multiprocessing
+import random
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+def make_notebook(path: Path, size: int) -> None:
+    """Write a synthetic notebook of approximately ``size`` bytes to ``path``."""
+    rng = random.Random(0)  # noqa: S311
+    cells = []
+    total = i = 0
+    while total < size:
+        image = base64.b64encode(rng.randbytes(60_000)).decode()
+        html = [f"<tr><td>{j}</td><td>{rng.random()}</td></tr>\n" for j in range(200)]
+        cells.append(
+            {
+                "cell_type": "markdown",
+                "id": f"markdown-{i}",
+                "metadata": {},
+                "source": ["# Title\n", "Some *text*"],
+            }
+        )
+        cells.append(
+            {
+                "cell_type": "code",
+                "id": f"code-{i}",
+                "execution_count": i,
+                "metadata": {"trusted": True},
+                "source": [f"x_{i} = {j}\n" for j in range(10)],
+                "outputs": [
+                    {
+                        "output_type": "stream",
+                        "name": "stdout",
+                        "text": [f"line {j}\n" for j in range(50)],
+                    },
+                    {
+                        "output_type": "display_data",
+                        "metadata": {},
+                        "data": {"image/png": image, "text/plain": ["<Figure>"]},
+                        "transient": {"display_id": f"display-{i}"},
+                    },
+                    {
+                        "output_type": "execute_result",
+                        "execution_count": i,
+                        "metadata": {},
+                        "data": {"text/html": html, "text/plain": ["<DataFrame>"]},
+                    },
+                ],
+            }
+        )
+        total += len(image) + sum(map(len, html)) + 2_000
+        i += 1
+    nb = {
+        "nbformat": 4,
+        "nbformat_minor": 5,
+        "metadata": {"kernelspec": {"name": "python3", "display_name": "Python 3"}},
+        "cells": cells,
+    }
+    with path.open("w") as f:
+        json.dump(nb, f, indent=1)
+
+
+def _load(loader: str, path: Path) -> tuple[float, int, float]:
+    """Load and save a notebook.
+
+    Returns the time taken to load the notebook, the increase in peak RSS while it was
+    loaded, and the time taken to save it.
+    """
+    if loader == "euporie":
+        from euporie.core.nbformat import read, write_ipynb
+    else:
+        from nbformat import read, write
+
+        write_ipynb = write
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with path.open() as f:
+        nb = read(f, as_version=4)
+    elapsed = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    write_ipynb(nb, path.with_suffix(".saved.ipynb"))
+    saved = time.perf_counter() - start
+    # ``ru_maxrss`` is given in KiB on Linux
+    return elapsed, (after - before) * 1024, saved
+
+
+def main() -> None:
+    """Load & save notebooks of various sizes and report the time and memory used."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size",
+        type=int,
+        action="append",
+        metavar="MB",
+        help="The size of a notebook to test in MiB (default: 10, 100 and 500)",
+    )
+    args = parser.parse_args()
+
+    loaders = ["euporie"]
+    try:
+        import nbformat  # noqa: F401
+    except ModuleNotFoundError:
+        pass
+    else:
+        loaders.append("nbformat")
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.size or [10, 100, 500]:
+            path = Path(tmp) / f"{size}.ipynb"
+            # Generate the notebook in another process, as peak RSS is inherited by
+            # new processes
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                executor.submit(make_notebook, path, size * 2**20).result()
+            for loader in loaders:
+                # Load each notebook in a new process so peak memory use is isolated
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    elapsed, peak, saved = executor.submit(_load, loader, path).result()
+                print(
+                    f"{size:>4} MiB {loader:>8}: "
+                    f"load {elapsed:7.2f}s, peak RSS +{peak / 2**20:7.1f} MiB, "
+                    f"save {saved:7.2f}s"
+                )
+                path.with_suffix(".saved.ipynb").unlink()
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Test the base application."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from euporie.core.app.app import BaseApp
+
+
+class _App:
+    open_files = BaseApp.open_files
+
+    def __init__(self, files: list[str], loop: asyncio.AbstractEventLoop) -> None:
+        self.config = SimpleNamespace(files=files)
+        self.loop = loop
+        self.ready = {file: threading.Event() for file in files}
+        self.opened: list[tuple[str, bool]] = []
+
+    def get_file_tab(self, path: str) -> type:
+        self.ready[path].wait(5)
+        return object
+
+    def open_file(self, path: str, tab_class: type, focus: bool) -> None:
+        self.opened.append((path, focus))
+
+    def invalidate(self) -> None:
+        pass
+
+
+async def test_open_files() -> None:
+    """The first file is opened without waiting for the others to be looked up."""
+    app = _App(["a", "b", "c"], asyncio.get_running_loop())
+    app.ready["a"].set()
+    app.ready["c"].set()
+    app.open_files()
+    assert app.opened == [("a", True)]
+    # Tabs are added in order as they become ready
+    await asyncio.sleep(0.05)
+    assert app.opened == [("a", True)]
+    app.ready["b"].set()
+    for _ in range(100):
+        if len(app.opened) == 3:
+            break
+        await asyncio.sleep(0.01)
+    assert app.opened == [("a", True), ("b", False), ("c", False)]
@@ -0,0 +1,49 @@
+"""Test the cache helpers."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING
+
+from euporie.core import cache
+from euporie.core.cache import cache_dir, prune_cache_dir
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_prune_cache_dir(tmp_path: Path) -> None:
+    """The least recently used files are removed from cache directories."""
+    for i in range(5):
+        path = tmp_path / str(i)
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (i, i))
+    # Using a file marks it as recently used
+    (tmp_path / "0").touch()
+    prune_cache_dir(tmp_path, 30)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["0", "3", "4"]
+    # Missing directories are ignored
+    prune_cache_dir(tmp_path / "missing", 0)
+
+
+def test_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Cache directories are located in the user's cache directory."""
+    monkeypatch.setattr(cache, "_cache_root", lambda: tmp_path)
+    monkeypatch.setattr(cache, "_PRUNED", set())
+    pruned: list[tuple[Path, int]] = []
+    done = threading.Event()
+
+    def _prune(path: Path, max_size: int) -> None:
+        pruned.append((path, max_size))
+        done.set()
+
+    monkeypatch.setattr(cache, "prune_cache_dir", _prune)
+    assert cache_dir("a") == tmp_path / "a"
+    assert cache_dir("b", 100) == tmp_path / "b"
+    assert cache_dir("b", 100) == tmp_path / "b"
+    # Directories are pruned in the background, once per session
+    assert done.wait(5)
+    assert pruned == [(tmp_path / "b", 100)]
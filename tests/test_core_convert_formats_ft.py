@@ -0,0 +1,152 @@
+"""Test cases for :py:mod:`euporie.convert.formats.ft` module."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from prompt_toolkit.cache import SimpleCache
+from prompt_toolkit.formatted_text.utils import to_plain_text
+
+from euporie.core import cache
+from euporie.core.convert.datum import Datum
+from euporie.core.convert.formats import ft
+from euporie.core.convert.formats.ft import html_to_ft, markdown_to_ft
+from euporie.core.convert.formats.html import markdown_to_html_markdown_it
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    from prompt_toolkit.formatted_text import StyleAndTextTuples
+
+MARKDOWN = """# Heading
+
+A paragraph which is long enough to wrap when it is rendered at a narrow width.
+
+- item one
+- item two
+
+> A quote
+
+```python
+print("code")
+```
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+***
+### Heading three
+Final paragraph.
+"""
+
+
+@pytest.fixture(autouse=True)
+def markdown_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Path:
+    """Use a temporary directory and an empty memory cache for markdown blocks."""
+    monkeypatch.setattr(cache, "_cache_root", lambda: tmp_path)
+    monkeypatch.setattr(ft, "_markdown_blocks", SimpleCache(maxsize=100))
+    monkeypatch.setattr(ft, "_MARKDOWN_SAVE_DELAY", 0)
+    return tmp_path / "markdown"
+
+
+async def _saved() -> None:
+    """Wait for rendered markdown blocks to be saved to the disk cache."""
+    await asyncio.gather(
+        *(
+            task
+            for block in ft._markdown_blocks._data.values()
+            if (task := block._save_task) is not None
+        ),
+        return_exceptions=True,
+    )
+
+
+async def test_markdown_blocks_match_html() -> None:
+    """Markdown rendered block by block matches markdown rendered via HTML."""
+    datum = Datum(MARKDOWN, format="markdown")
+    html_datum = Datum(
+        await markdown_to_html_markdown_it(datum), format="html", source=datum
+    )
+    for cols in (30, 60):
+        assert to_plain_text(await markdown_to_ft(datum, cols=cols)) == to_plain_text(
+            await html_to_ft(html_datum, cols=cols)
+        )
+
+
+async def test_markdown_unchanged_blocks_reused() -> None:
+    """Only blocks which have changed are rendered again."""
+    cache = ft._markdown_blocks
+    await markdown_to_ft(Datum(MARKDOWN, format="markdown"), cols=40)
+    blocks = set(cache._data.values())
+    assert len(blocks) == 9
+
+    edited = MARKDOWN.replace("A quote", "An edited quote")
+    result = await markdown_to_ft(Datum(edited, format="markdown"), cols=40)
+    assert "An edited quote" in to_plain_text(result)
+    assert len(set(cache._data.values()) - blocks) == 1
+
+
+async def test_markdown_shared_blocks_concurrent_sizes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Documents sharing blocks can render them at different sizes concurrently."""
+    datum = Datum(MARKDOWN, format="markdown")
+    expected = [
+        to_plain_text(await markdown_to_ft(datum, cols=cols)) for cols in (30, 60)
+    ]
+    ft._markdown_blocks.clear()
+
+    # Render blocks from scratch, yielding to the other document while rendering
+    from euporie.core.ft.html import HTML
+
+    render = HTML._render
+
+    async def _render(self: HTML, *args: Any) -> StyleAndTextTuples:
+        await asyncio.sleep(0)
+        return await render(self, *args)
+
+    monkeypatch.setattr(HTML, "_render", _render)
+    monkeypatch.setattr(ft._MarkdownBlock, "load", lambda self, size: False)
+    results = await asyncio.gather(
+        markdown_to_ft(Datum(MARKDOWN, format="markdown"), cols=30),
+        markdown_to_ft(Datum(MARKDOWN, format="markdown"), cols=60),
+    )
+    assert [to_plain_text(result) for result in results] == expected
+
+
+async def test_markdown_disk_cache(
+    monkeypatch: pytest.MonkeyPatch, markdown_cache: Path
+) -> None:
+    """Rendered markdown blocks are loaded from disk when they are not in memory."""
+    datum = Datum(MARKDOWN, format="markdown")
+    result = await markdown_to_ft(datum, cols=40)
+    await _saved()
+    assert len(list(markdown_cache.iterdir())) == 9  # noqa: ASYNC240
+
+    # Blocks are not laid out again when loaded from the disk cache
+    monkeypatch.setattr(ft, "_markdown_blocks", SimpleCache(maxsize=100))
+    monkeypatch.delattr(ft._MarkdownBlock, "html")
+    assert await markdown_to_ft(datum, cols=40) == result
+
+
+async def test_markdown_disk_cache_resize(
+    monkeypatch: pytest.MonkeyPatch, markdown_cache: Path
+) -> None:
+    """Markdown blocks are not saved to disk at each size while being resized."""
+    monkeypatch.setattr(ft, "_MARKDOWN_SAVE_DELAY", 60)
+    datum = Datum(MARKDOWN, format="markdown")
+    tasks = []
+    for cols in range(30, 40):
+        await markdown_to_ft(datum, cols=cols)
+        tasks += [block._save_task for block in ft._markdown_blocks._data.values()]
+    await asyncio.sleep(0)
+    # Only the blocks' renderings at the final size are waiting to be saved
+    pending = [task for task in tasks if task is not None and not task.cancelled()]
+    assert len(pending) == 9
+    assert not markdown_cache.exists()  # noqa: ASYNC240
+    for task in pending:
+        task.cancel()
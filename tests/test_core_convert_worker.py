@@ -0,0 +1,57 @@
+"""Test rendering HTML in a worker process."""
+
+from __future__ import annotations
+
+import base64
+from io import BytesIO
+from typing import TYPE_CHECKING
+
+from PIL import Image
+from prompt_toolkit.application.current import get_app_session
+from prompt_toolkit.formatted_text.utils import to_plain_text
+
+from euporie.core.app.dummy import DummyApp
+from euporie.core.convert.worker import HTMLWorker
+from euporie.core.ft.html import HTML
+
+if TYPE_CHECKING:
+    import pytest
+
+
+async def test_worker_render() -> None:
+    """HTML is rendered in the worker the same as in the main process."""
+    markup = "<h1>Title</h1><p>Some <b>bold</b> text</p><ul><li>a</li><li>b</li></ul>"
+    worker = HTMLWorker.get()
+    try:
+        result = await worker.render("test-worker-html", markup, cols=30)
+        assert result is not None
+        local = HTML(markup, width=30, collapse_root_margin=True).render(30, None)
+        assert to_plain_text(result) == to_plain_text(local)
+        # Graphics must be rendered in the main process
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), color="red").save(buffer, format="PNG")
+        data = base64.b64encode(buffer.getvalue()).decode()
+        image = f'<img src="data:image/png;base64,{data}">'
+        assert await worker.render("test-worker-image", image, cols=30) is None
+        assert ("test-worker-image",) in worker.local
+    finally:
+        worker.close()
+    assert HTMLWorker._instance is None
+
+
+async def test_worker_render_matches_terminal(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The worker uses the main process's terminal cell size."""
+    app = DummyApp()
+    monkeypatch.setattr(DummyApp, "cell_size_px", (5, 10))
+    monkeypatch.setattr(get_app_session(), "app", app)
+    markup = '<div style="width: 100px; border: 1px solid">a</div>'
+    worker = HTMLWorker.get()
+    try:
+        result = await worker.render("test-worker-px", markup, cols=40)
+        assert result is not None
+        local = HTML(markup, width=40, collapse_root_margin=True).render(40, None)
+        assert to_plain_text(result) == to_plain_text(local)
+        # The 100px wide box is 20 cells wide, plus its borders
+        assert to_plain_text(result).splitlines()[1].rstrip() == f"┃a{' ' * 19}┃"
+    finally:
+        worker.close()
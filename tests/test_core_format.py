@@ -0,0 +1,51 @@
+"""Test code formatting."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from euporie.core.format import Formatter, format_text, format_texts
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+
+class _UpperFormatter(Formatter):
+    """A formatter which counts how many times it is run."""
+
+    calls = 0
+
+    @property
+    def cache_key(self) -> Hashable | None:
+        return ("upper", id(self))
+
+    def format(self, text: str) -> str:
+        self.calls += 1
+        return text.upper()
+
+
+def test_format_texts_cached() -> None:
+    """Formatting results are cached by formatter and source."""
+    formatter = _UpperFormatter(languages={"python"})
+    inputs = [("a = 1", "python"), ("b = 2", "python"), ("c = 3", "r")]
+    assert format_texts(inputs, [formatter], wait=True) == ["A = 1", "B = 2", "c = 3"]
+    assert formatter.calls == 2
+    # Unchanged inputs are not re-formatted
+    assert format_texts(inputs, [formatter], wait=True) == ["A = 1", "B = 2", "c = 3"]
+    assert formatter.calls == 2
+    # Formatted output is not re-formatted
+    assert format_text("A = 1", "python", [formatter]) == "A = 1"
+    assert formatter.calls == 2
+    assert format_text("d = 4", "python", [formatter]) == "D = 4"
+    assert formatter.calls == 3
+
+
+def test_format_text_chains_formatters() -> None:
+    """Each formatter is applied to the output of the previous formatter."""
+
+    class _StripFormatter(_UpperFormatter):
+        def format(self, text: str) -> str:
+            return text.strip()
+
+    formatters = [_StripFormatter(), _UpperFormatter()]
+    assert format_text("  x  ", "python", formatters) == "X"
@@ -0,0 +1,49 @@
+"""Test the HTTP filesystem."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from euporie.core import cache
+from euporie.core.fsspec import HTTPFileSystem
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_http_cache_revalidation(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Responses are cached on disk and re-validated using their ETag."""
+    monkeypatch.setattr(cache, "_cache_root", lambda: tmp_path)
+    requests: list[str | None] = []
+
+    async def handler(request: web.Request) -> web.Response:
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b"body { color: red }", headers={"ETag": '"v1"'})
+
+    async def main() -> list[bytes]:
+        app = web.Application()
+        app.router.add_get("/style.css", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}/style.css"
+        fs = HTTPFileSystem(asynchronous=True, skip_instance_cache=True)
+        try:
+            return [await fs._cat_file(url), await fs._cat_file(url)]
+        finally:
+            await (await fs.set_session()).close()
+            await runner.cleanup()
+
+    assert asyncio.run(main()) == [b"body { color: red }"] * 2
+    assert requests == [None, '"v1"']
@@ -0,0 +1,163 @@
+"""Test direct rendering of DataFrame representations."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from prompt_toolkit.formatted_text.utils import to_plain_text
+
+from euporie.core.convert.datum import Datum
+from euporie.core.convert.formats.ft import dataframe_html_to_ft
+from euporie.core.ft import dataframe
+from euporie.core.ft.dataframe import (
+    parse_data_resource,
+    parse_html,
+    render_table_data,
+)
+
+if TYPE_CHECKING:
+    import pytest
+
+DATAFRAME_HTML = """<div>
+<style scoped>
+    .dataframe tbody tr th {
+        vertical-align: top;
+    }
+</style>
+<table border="1" class="dataframe">
+  <thead>
+    <tr style="text-align: right;">
+      <th></th>
+      <th>a</th>
+      <th>name</th>
+    </tr>
+  </thead>
+  <tbody>
+    <tr>
+      <th>0</th>
+      <td>1.5</td>
+      <td>x &amp; y</td>
+    </tr>
+    <tr>
+      <th>1</th>
+      <td>NaN</td>
+      <td>zz</td>
+    </tr>
+    <tr>
+      <th>2</th>
+      <td>10.25</td>
+      <td>w</td>
+    </tr>
+  </tbody>
+</table>
+<p>3 rows × 2 columns</p>
+</div>"""
+
+MULTIINDEX_HTML = """<table border="1" class="dataframe">
+  <thead>
+    <tr style="text-align: right;">
+      <th></th>
+      <th></th>
+      <th>x</th>
+    </tr>
+  </thead>
+  <tbody>
+    <tr>
+      <th rowspan="2" valign="top">a</th>
+      <th>1</th>
+      <td>1.5</td>
+    </tr>
+    <tr>
+      <th>2</th>
+      <td>2.0</td>
+    </tr>
+    <tr>
+      <th>b</th>
+      <th>1</th>
+      <td>3.0</td>
+    </tr>
+  </tbody>
+</table>"""
+
+
+def test_dataframe_html() -> None:
+    """DataFrame HTML is drawn as a table with numeric columns right-aligned."""
+    data = parse_html(DATAFRAME_HTML)
+    assert data is not None
+    assert data.numeric == [True, False]
+    assert to_plain_text(render_table_data(data)).splitlines() == [
+        "        a  name ",
+        " 0    1.5 x & y ",
+        " 1    NaN zz    ",
+        " 2  10.25 w     ",
+        "",
+        "3 rows × 2 columns",
+    ]
+
+
+def test_other_html_rejected() -> None:
+    """HTML other than plain DataFrame representations is not parsed."""
+    assert parse_html("<table><tr><td>a</td></tr></table>") is None
+    assert parse_html(DATAFRAME_HTML.replace("zz", "<b>zz</b>")) is None
+    assert parse_html(DATAFRAME_HTML.replace(".dataframe tbody", "body")) is None
+
+
+def test_row_spans_match_table(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Rows drawn directly line up with rows drawn as tables."""
+    data = parse_html(MULTIINDEX_HTML)
+    assert data is not None
+    direct = to_plain_text(render_table_data(data, width=40))
+    monkeypatch.setattr(dataframe, "_draw_row", lambda *args: None)
+    assert to_plain_text(render_table_data(data, width=40)) == direct
+    assert direct.splitlines()[1:] == [
+        " a  1  1.5 ",
+        "    2  2.0 ",
+        " b  1  3.0 ",
+    ]
+
+
+def test_data_resource() -> None:
+    """Tabular data-resource JSON is drawn with index columns first."""
+    data = parse_data_resource(
+        {
+            "schema": {
+                "fields": [
+                    {"name": "index", "type": "integer"},
+                    {"name": "a", "type": "number"},
+                    {"name": "b", "type": "string"},
+                ],
+                "primaryKey": ["index"],
+            },
+            "data": [
+                {"index": 0, "a": 1.5, "b": "x"},
+                {"index": 1, "a": None, "b": "yy"},
+            ],
+        }
+    )
+    assert to_plain_text(render_table_data(data)).splitlines() == [
+        "      a  b ",
+        " 0  1.5 x  ",
+        " 1  NaN yy ",
+    ]
+
+
+async def test_dataframe_html_converter(caplog: pytest.LogCaptureFixture) -> None:
+    """Other HTML is passed on to the HTML engine without raising an error."""
+    assert await dataframe_html_to_ft(Datum("<p>a</p>", format="html")) is None
+    with caplog.at_level(logging.DEBUG, logger="euporie.core.convert.datum"):
+        result = await Datum("<p>a</p>", format="html").convert_async("ft", cols=10)
+    assert to_plain_text(result).strip() == "a"
+    assert not caplog.records
+
+
+async def test_dataframe_html_width() -> None:
+    """DataFrames are only fitted to the available width when lines are wrapped."""
+    datum = Datum(DATAFRAME_HTML, format="html")
+    data = parse_html(DATAFRAME_HTML)
+    assert data is not None
+    wrapped = await dataframe_html_to_ft(datum, cols=12, wrap_lines=True)
+    assert wrapped == render_table_data(data, 12)
+    unwrapped = await dataframe_html_to_ft(datum, cols=12, wrap_lines=False)
+    assert unwrapped == render_table_data(data)
+    assert wrapped != unwrapped
@@ -2,10 +2,22 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from prompt_toolkit.formatted_text.base import to_formatted_text
-from prompt_toolkit.formatted_text.utils import to_plain_text
+from prompt_toolkit.formatted_text.utils import split_lines, to_plain_text
+
+from euporie.core.async_utils import get_or_create_loop, run_coro_sync
+from euporie.core.ft import html
+from euporie.core.ft.html import (
+    HTML,
+    has_virtual_rows,
+    render_virtual_rows,
+    wrap_virtual_rows,
+)
 
-from euporie.core.ft.html import HTML
+if TYPE_CHECKING:
+    import pytest
 
 
 def test_inline_whitespace() -> None:
@@ -127,3 +139,219 @@ def test_inline_block_wrapping() -> None:
     ft = to_formatted_text(HTML(data, width=4))
     result = [x.strip() for x in to_plain_text(ft).splitlines()]
     assert result == ["A B", "X", "Y C", "D"]
+
+
+def test_css_rule_index() -> None:
+    """CSS rules are matched by ID, class, element name, and universal selectors."""
+    data = """
+    <style>
+    #x { color: #ff0000 }
+    p.a { color: #00ff00; font-weight: bold }
+    .b, p { color: #0000ff; font-style: italic }
+    * { text-decoration: underline }
+    [data-y] { color: #ffff00 }
+    </style>
+    <p id="x" class="a b">1</p><p class="b">2</p><p>3</p><p data-y="1">4</p><div>5</div>
+    """
+    dom = HTML(data, width=10)
+    dom.render(10, None)
+    themes = [
+        node.theme.theme for node in dom.soup.descendents if node.name in {"p", "div"}
+    ]
+    assert themes[0]["color"] == "#ff0000"
+    assert themes[0]["font_weight"] == "bold"
+    assert themes[0]["font_style"] == "italic"
+    assert themes[1]["color"] == "#0000ff"
+    assert themes[2]["color"] == "#0000ff"
+    assert themes[3]["color"] == "#ffff00"
+    assert themes[4]["color"] == "default"
+    assert all(theme["text_decoration"] == "underline" for theme in themes)
+
+
+def test_compiled_style_sheets_shared() -> None:
+    """Identical style sheets are only parsed once, and are not modified by DOMs."""
+    from euporie.core.ft.html import compile_style_sheet
+
+    style = (
+        "<style>p { color: #ff0000 } "
+        "@media (min-width: 20em) { p { color: #00ff00 } }</style>"
+    )
+    compile_style_sheet.cache_clear()
+    narrow = HTML(f"{style}<style>p {{ font-weight: bold }}</style><p>a</p>", width=10)
+    narrow.render(10, None)
+    wide = HTML(f"{style}<p>a</p>", width=30)
+    wide.render(30, None)
+    assert compile_style_sheet.cache_info().hits == 1
+
+    [narrow_p] = [node for node in narrow.soup.descendents if node.name == "p"]
+    [wide_p] = [node for node in wide.soup.descendents if node.name == "p"]
+    # Media queries are evaluated against each DOM
+    assert narrow_p.theme.theme["color"] == "#ff0000"
+    assert wide_p.theme.theme["color"] == "#00ff00"
+    # Rules merged into one DOM's CSS do not leak into the shared style sheet
+    assert narrow_p.theme.theme["font_weight"] == "bold"
+    assert wide_p.theme.theme["font_weight"] == "normal"
+
+
+def test_rerender_at_new_width() -> None:
+    """Re-rendering a DOM at a new width matches a fresh rendering at that width."""
+    data = (
+        '<div style="padding: 0 10%">' + "word " * 20 + "</div>"
+        "<ul><li>a</li><li>b</li></ul>"
+        "<table><tr><td>a a a a a a</td><td>b b b</td></tr></table>"
+    )
+    dom = HTML(data, width=40)
+    first = to_plain_text(dom.render(40, None))
+    for width in (20, 30, 40):
+        assert to_plain_text(dom.render(width, None)) == to_plain_text(
+            HTML(data, width=width).render(width, None)
+        )
+    # Renderings at a previous width are re-used
+    [li, *_] = [node for node in dom.soup.descendents if node.name == "li"]
+    assert li.renderings
+    assert to_plain_text(dom.render(40, None)) == first
+
+
+def test_word_measurements_cached_per_document() -> None:
+    """Measured words, which can reference a document's nodes, are not shared."""
+    data = '<p>Some <a href="x">linked text</a> here</p>'
+    doms = [HTML(data, width=20, mouse_handler=lambda node, event: None) for _ in "ab"]
+    for dom in doms:
+        dom.render(20, None)
+    for dom in doms:
+        assert dom._words._data
+        for words in dom._words._data.values():
+            assert isinstance(words, tuple)
+            for word, _width, _height in words:
+                for _style, _text, *handler in word:
+                    assert not handler or handler[0].args[0].dom is dom
+
+
+def test_pseudo_elements_created_on_demand() -> None:
+    """Pseudo-elements are only added when a CSS rule could generate content."""
+    dom = HTML("<p>a <b>b</b></p><p class='x'>c</p>", width=20)
+    dom.render(20, None)
+    assert not any(node.name.startswith("::b") for node in dom.soup.descendents)
+
+    dom = HTML(
+        "<style>.x::before { content: '>' }</style><p>a</p><p class='x'>b</p>",
+        width=20,
+    )
+    assert to_plain_text(dom.render(20, None)).split() == ["a", ">b"]
+    [before] = [node for node in dom.soup.descendents if node.name == "::before"]
+    assert before.parent is not None
+    assert before.parent.attrs["class"] == "x"
+    # Identical themes are shared between elements
+    p1, p2 = [node for node in dom.soup.descendents if node.name == "p"]
+    assert p1.theme.inherited_theme is p2.theme.inherited_theme
+
+
+def _render_virtual_rows(dom: HTML) -> None:
+    """Render every deferred row of a DOM's virtualized tables."""
+    loop = get_or_create_loop("convert")
+    for table in dom.virtual_tables.values():
+        for index in range(html._VIRTUAL_TABLE_SAMPLE_ROWS, len(table.rows) - 1):
+            run_coro_sync(table.render_row(index), loop)
+
+
+def test_virtual_table_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Rows of large tables are rendered when they are displayed."""
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_ROWS", 20)
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_SAMPLE_ROWS", 5)
+    data = (
+        "<table><thead><tr><th>n</th><th>word</th></tr></thead><tbody>"
+        + "".join(f"<tr><td>{i}</td><td>{'ab' * (i % 7)}</td></tr>" for i in range(50))
+        + "</tbody></table>"
+    )
+    expected = to_plain_text(HTML(data, width=40).render(40, None))
+
+    dom = HTML(data, width=40, virtual_rows=True)
+    lines = list(split_lines(to_formatted_text(dom.render(40, None))))
+    assert any(has_virtual_rows(line) for line in lines)
+    # Deferred rows have not been rendered yet
+    [table] = dom.virtual_tables.values()
+    assert not any(td.renderings for td in table.rows[30].contents)
+    _render_virtual_rows(dom)
+    rendered = "\n".join(to_plain_text(render_virtual_rows(line)) for line in lines)
+    assert rendered == expected
+
+
+def test_virtual_table_rows_wrapped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Wrapped placeholders are replaced with the matching parts of their rows."""
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_ROWS", 20)
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_SAMPLE_ROWS", 5)
+    data = (
+        '<table border="1"><tr><th>n</th><th>word</th></tr>'
+        + "".join(f"<tr><td>{i}</td><td>{'ab' * (i % 7)}</td></tr>" for i in range(50))
+        + "</table>"
+    )
+    expected = [
+        to_plain_text(wrapped)
+        for line in split_lines(
+            to_formatted_text(HTML(data, width=40).render(40, None))
+        )
+        for wrapped in wrap_virtual_rows(line, 7)
+    ]
+
+    dom = HTML(data, width=40, virtual_rows=True)
+    lines = split_lines(to_formatted_text(dom.render(40, None)))
+    _render_virtual_rows(dom)
+    rendered = [
+        to_plain_text(render_virtual_rows(wrapped))
+        for line in lines
+        for wrapped in wrap_virtual_rows(line, 7)
+    ]
+    assert rendered == expected
+
+
+def test_virtual_table_tall_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Deferred rows taller than the first rows of a table are not truncated."""
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_ROWS", 20)
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_SAMPLE_ROWS", 5)
+    rows = [f"<tr><td>{i}</td><td>short</td></tr>" for i in range(50)]
+    rows[30] = "<tr><td>30</td><td>some long text which wraps</td></tr>"
+    rows[40] = "<tr><td>40</td><td>a<br>b<br>c</td></tr>"
+    data = f"<table>{''.join(rows)}</table>"
+    dom = HTML(data, width=20, virtual_rows=True)
+    lines = list(split_lines(to_formatted_text(dom.render(20, None))))
+    assert any(has_virtual_rows(line) for line in lines)
+    _render_virtual_rows(dom)
+    rendered = [to_plain_text(render_virtual_rows(line)).strip() for line in lines]
+    assert rendered[30:36] == ["30some", "long", "text", "which", "wraps", "31short"]
+    assert rendered[44:48] == ["40a", "b", "c", "41short"]
+
+
+def test_virtual_table_rows_background(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Deferred rows can be rendered without blocking."""
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_ROWS", 20)
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_SAMPLE_ROWS", 5)
+    data = (
+        "<table>"
+        + "".join(f"<tr><td>{i}</td><td>x</td></tr>" for i in range(50))
+        + "</table>"
+    )
+    dom = HTML(data, width=20, virtual_rows=True)
+    lines = list(split_lines(to_formatted_text(dom.render(20, None))))
+    [table] = dom.virtual_tables.values()
+    # The first deferred row is rendered up front to measure borders, so use the next
+    line = lines[6]
+    assert has_virtual_rows(line)
+    # The placeholder is left blank until the row has been rendered
+    assert not to_plain_text(render_virtual_rows(line)).strip()
+    assert 6 in table._pending
+    # Wait for the row to finish rendering in the background
+    run_coro_sync(table.render_row(6), get_or_create_loop("convert"))
+    assert to_plain_text(render_virtual_rows(line)).split() == ["6", "x"]
+
+
+async def test_shared_themes_cleared_on_reset() -> None:
+    """Shared themes are discarded when the DOM is reset after loading assets."""
+    dom = HTML("<p>a</p><p>b</p>", width=20, defer_assets=True)
+    await dom.load_assets()
+    p1, p2 = [node for node in dom.soup.descendents if node.name == "p"]
+    assert p1.theme.theme is p2.theme.theme
+    assert dom._themes
+    await dom.load_assets()
+    assert not dom._themes
+    # Nodes store their attributes in slots
+    assert "parent" not in p1.__dict__
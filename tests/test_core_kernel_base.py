@@ -0,0 +1,56 @@
+"""Test the base kernel functionality."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any
+
+from prompt_toolkit.utils import Event
+
+from euporie.core.kernel.base import ExecutionTiming
+
+
+def test_execution_timing_marks_stages_once() -> None:
+    """Only the first time a stage is reached is recorded."""
+    metadata: dict[tuple[str, ...], Any] = {}
+    timing = ExecutionTiming("1 + 1", set_metadata=metadata.__setitem__)
+    timing.mark("request_sent")
+    timing.mark("busy")
+    first = timing.times["busy"]
+    timing.mark("busy")
+    assert timing.times["busy"] == first
+    assert timing.elapsed("busy") == first - timing.times["request_sent"]
+    assert timing.elapsed("idle") is None
+    assert ("execution", "euporie.client", "busy") in metadata
+
+
+async def test_execution_timing_first_paint() -> None:
+    """The first paint is recorded on the first render after the first output."""
+
+    class _App:
+        def __init__(self) -> None:
+            self.loop = asyncio.get_running_loop()
+            self.after_render: Event[_App] = Event(self)
+
+    app = _App()
+    timing = ExecutionTiming("print(1)")
+    timing.mark("request_sent")
+    # Outputs are received on the kernel's thread
+    thread = threading.Thread(target=timing.mark_output, args=(app,))
+    thread.start()
+    thread.join()
+    timing.mark_output(app)  # type: ignore [arg-type]
+    assert "first_output" in timing.times
+    await asyncio.sleep(0)
+    assert "first_paint" not in timing.times
+
+    # Handlers added after the timing's handler are still called
+    calls = []
+    app.after_render += calls.append
+    app.after_render.fire()
+    assert "first_paint" in timing.times
+    assert calls == [app]
+    # The render handler is removed once the first paint is recorded
+    await asyncio.sleep(0)
+    assert app.after_render._handlers == [calls.append]
@@ -0,0 +1,63 @@
+"""Test the Jupyter kernel."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+from euporie.core import cache
+from euporie.core.kernel.jupyter import JupyterKernel
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_kernelspec_cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Kernelspecs are cached until the kernelspec directories change."""
+    monkeypatch.setenv("JUPYTER_PATH", str(tmp_path / "data"))
+    monkeypatch.setattr(cache, "_cache_root", lambda: tmp_path / "cache")
+    monkeypatch.setattr(JupyterKernel, "_spec_cache", None)
+
+    def _add_spec(name: str, display_name: str) -> Path:
+        path = tmp_path / "data" / "kernels" / name / "kernel.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"argv": ["x"], "display_name": display_name}))
+        return path
+
+    def _names() -> set[str]:
+        return {info.display_name for info in JupyterKernel.variants()}
+
+    spec_path = _add_spec("a", "A")
+    assert "A" in _names()
+    # Kernelspecs are cached in euporie's cache directory
+    assert len(list((tmp_path / "cache" / "kernelspecs").glob("*.json"))) == 1
+
+    # Cached results are re-used from memory and from disk
+    calls = 0
+    get_all_specs = JupyterKernel._spec_manager.get_all_specs
+
+    def _get_all_specs() -> dict:
+        nonlocal calls
+        calls += 1
+        return get_all_specs()
+
+    monkeypatch.setattr(JupyterKernel._spec_manager, "get_all_specs", _get_all_specs)
+    assert "A" in _names()
+    monkeypatch.setattr(JupyterKernel, "_spec_cache", None)
+    assert "A" in _names()
+    assert calls == 0
+
+    # Adding a kernelspec invalidates the cache
+    _add_spec("b", "B")
+    os.utime(spec_path.parent.parent, ns=(0, 0))
+    assert {"A", "B"} <= _names()
+    assert calls == 1
+
+    # Modifying a kernelspec invalidates the cache
+    spec_path.write_text(json.dumps({"argv": ["x"], "display_name": "C"}))
+    os.utime(spec_path, ns=(0, 0))
+    assert "C" in _names()
+    assert calls == 2
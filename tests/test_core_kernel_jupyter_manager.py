@@ -0,0 +1,108 @@
+"""Test the Jupyter kernel pool."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+from euporie.core import async_utils
+from euporie.core.kernel import jupyter_manager
+from euporie.core.kernel.jupyter_manager import KernelPool
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any
+
+    import pytest
+
+
+class _Client:
+    async def _async_wait_for_ready(self, timeout: float = 0) -> None:
+        await asyncio.sleep(0)
+
+    def stop_channels(self) -> None:
+        pass
+
+
+class _Manager:
+    def __init__(self, kernel_name: str) -> None:
+        self.kernel_name = kernel_name
+        self.connection_file = ""
+        self.has_kernel = False
+
+    async def start_kernel(self, **kwargs: Any) -> None:
+        self.has_kernel = True
+
+    def client(self) -> _Client:
+        return _Client()
+
+    async def is_alive(self) -> bool:
+        return self.has_kernel
+
+    async def shutdown_kernel(self, now: bool = False) -> None:
+        self.has_kernel = False
+
+    def cleanup_connection_file(self) -> None:
+        pass
+
+
+def test_kernel_pool(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Kernels are handed out from the pool and replenished in the background."""
+    monkeypatch.setattr(jupyter_manager, "EuporieKernelManager", _Manager)
+    monkeypatch.setenv("JUPYTER_RUNTIME_DIR", str(tmp_path))
+    sizes = {"python3": 2}
+
+    async def _test() -> None:
+        pool = KernelPool(asyncio.get_running_loop())
+        # Nothing is ready in an empty pool, but the pool gets filled
+        assert await pool.take("python3", sizes) is None
+        assert pool.starting["python3"] == 2
+        await asyncio.gather(*pool.tasks)
+        assert len(pool.idle["python3"]) == 2
+        # Kernels for kernelspecs without a pool size are not started
+        assert await pool.take("ir", sizes) is None
+        assert not pool.tasks
+        # Taking a kernel triggers a replacement to be started
+        km = await pool.take("python3", sizes)
+        assert km is not None
+        assert km.has_kernel
+        assert len(pool.idle["python3"]) == 1
+        assert pool.starting["python3"] == 1
+        # Dead kernels are not handed out
+        for idle_km in pool.idle["python3"]:
+            idle_km.has_kernel = False
+        await asyncio.gather(*pool.tasks)
+        km = await pool.take("python3", sizes)
+        assert km is not None
+        assert km.has_kernel
+        # Shutting down the pool stops all idle kernels
+        idle = [*pool.idle["python3"]]
+        await pool.shutdown()
+        assert not any(km.has_kernel for km in idle)
+        assert not pool.idle
+
+    asyncio.run(_test())
+
+
+def test_kernel_pool_prefill(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Pools can be filled before a kernel is needed, and closed from outside."""
+    monkeypatch.setattr(jupyter_manager, "EuporieKernelManager", _Manager)
+    monkeypatch.setenv("JUPYTER_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.setattr(KernelPool, "_instances", {})
+    loop = asyncio.new_event_loop()
+    monkeypatch.setattr(async_utils, "get_or_create_loop", lambda name: loop)
+    try:
+        KernelPool.prefill({"python3": 1, "*": 2}, "ir")
+        pool = KernelPool.get(loop)
+        loop.run_until_complete(asyncio.sleep(0))
+        loop.run_until_complete(asyncio.gather(*pool.tasks))
+        assert {name: len(kms) for name, kms in pool.idle.items()} == {
+            "ir": 2,
+            "python3": 1,
+        }
+        idle = [km for kms in pool.idle.values() for km in kms]
+        KernelPool.close_all()
+        assert not any(km.has_kernel for km in idle)
+        assert pool.closed
+    finally:
+        loop.close()
@@ -0,0 +1,369 @@
+"""Test the fast notebook format implementation."""
+
+from __future__ import annotations
+
+import base64
+import copy
+import json
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import pytest
+
+from euporie.core import cache, nbformat
+from euporie.core.nbformat import (
+    OUTPUT_STORE_DIR,
+    LazyPayload,
+    NotebookNode,
+    OutputStore,
+    StoredPayload,
+    dump_ipynb,
+    iter_read,
+    load_payload,
+    read,
+    write_ipynb,
+    write_text,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+NOTEBOOK = {
+    "nbformat": 4,
+    "nbformat_minor": 5,
+    "metadata": {"signature": "abc", "kernelspec": {"name": "python3"}},
+    "cells": [
+        {
+            "cell_type": "markdown",
+            "id": "a",
+            "metadata": {},
+            "source": ["# Title\n", "Text"],
+        },
+        {
+            "cell_type": "code",
+            "id": "b",
+            "execution_count": 1,
+            "metadata": {"trusted": True},
+            "source": ["x = 1\n", "x"],
+            "outputs": [
+                {"output_type": "stream", "name": "stdout", "text": ["a\n", "b\n"]},
+                {
+                    "output_type": "display_data",
+                    "metadata": {},
+                    "data": {
+                        "text/html": ["<b>\n", "</b>"],
+                        "application/json": ["a", "b"],
+                    },
+                    "transient": {"display_id": "c"},
+                },
+            ],
+        },
+    ],
+}
+
+
+def test_read() -> None:
+    """Notebooks are read as nodes with multi-line strings rejoined."""
+    nb = read(StringIO(json.dumps(NOTEBOOK)), as_version=4)
+    assert isinstance(nb, NotebookNode)
+    assert isinstance(nb.metadata.kernelspec, NotebookNode)
+    assert nb.metadata == {"kernelspec": {"name": "python3"}}
+
+    markdown, code = nb.cells
+    assert markdown.source == "# Title\nText"
+    assert code.source == "x = 1\nx"
+    assert code.metadata == {}
+
+    stream, display = code.outputs
+    assert stream.text == "a\nb\n"
+    assert display.data == {"text/html": "<b>\n</b>", "application/json": ["a", "b"]}
+    assert "transient" not in display
+
+
+def test_read_lazy_payloads(tmp_path: Path) -> None:
+    """Large output values are only read from the file when they are needed."""
+    image = base64.b64encode(bytes(range(256)) * 400).decode() + "\n"
+    html = '<img alt="\\"x\\"">' * 10_000
+    nb = copy.deepcopy(NOTEBOOK)
+    outputs = nb["cells"][1]["outputs"]
+    outputs[1]["data"].update(
+        {"image/png": image, "text/x-html": html, "text/plain": "x"}
+    )
+    nb["metadata"]["widgets"] = {"state": {"data": {"image/png": image}}}
+    path = tmp_path / "test.ipynb"
+    path.write_text(text := json.dumps(nb, indent=1))
+
+    with path.open() as f:
+        loaded = read(f, as_version=4)
+    data = loaded.cells[1].outputs[1].data
+    assert isinstance(payload := data["image/png"], LazyPayload)
+    assert load_payload(payload) == image
+    assert load_payload(data["text/x-html"]) == html
+    assert data["text/plain"] == "x"
+    # Values outside of output mime-bundles are loaded immediately
+    assert loaded.metadata.widgets == {"state": {"data": {"image/png": image}}}
+
+    # Values can still be read after the file is replaced
+    replacement = tmp_path / "new.ipynb"
+    replacement.write_text(json.dumps(NOTEBOOK))
+    replacement.replace(path)
+    assert payload.load() == image
+
+    # Values cannot be read if the file is modified in-place
+    path.write_text(text)
+    with path.open() as f:
+        payload = read(f, as_version=4).cells[1].outputs[1].data["image/png"]
+    with path.open("a") as f:
+        f.write("\n")
+    with pytest.raises(OSError, match="modified"):
+        payload.load()
+
+
+def test_iter_read(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Notebooks can be read in parts, with cells yielded as they are parsed."""
+    monkeypatch.setattr(nbformat, "_CHUNK_SIZE", 7)
+    image = base64.b64encode(bytes(range(256)) * 400).decode()
+    nb = copy.deepcopy(NOTEBOOK)
+    nb["cells"][1]["outputs"][1]["data"]["image/png"] = image
+    nb["cells"] *= 3
+    path = tmp_path / "test.ipynb"
+
+    # Cells are streamed whether or not they are the first key in the file
+    for sort_keys in (True, False):
+        path.write_text(json.dumps(nb, indent=1, sort_keys=sort_keys))
+        with path.open() as f:
+            parts = list(iter_read(f, as_version=4))
+        assert len(parts) > 2
+        *batches, rest = parts
+        assert "cells" not in rest
+        rest.cells = [cell for batch in batches for cell in batch.cells]
+        assert isinstance(rest.cells[3].outputs[1].data["image/png"], LazyPayload)
+        expected, actual = StringIO(), StringIO()
+        with path.open() as f:
+            dump_ipynb(read(f, as_version=4), expected)
+        dump_ipynb(rest, actual)
+        assert actual.getvalue() == expected.getvalue()
+
+    # Files which cannot be streamed are read whole
+    path.write_text("[]")
+    whole = NotebookNode(cells=[])
+    monkeypatch.setattr(nbformat, "read", lambda fp, as_version: whole)
+    with path.open() as f:
+        assert list(iter_read(f, as_version=4)) == [whole]
+
+
+def test_iter_read_many_cells(tmp_path: Path) -> None:
+    """Notebooks with many cells are read progressively without losing cells."""
+    nb = copy.deepcopy(NOTEBOOK)
+    nb["cells"] = [
+        {"cell_type": "code", "id": str(i), "metadata": {}, "source": str(i)}
+        for i in range(20_000)
+    ]
+    path = tmp_path / "test.ipynb"
+    path.write_text(json.dumps(nb))
+    with path.open() as f:
+        *batches, rest = iter_read(f, as_version=4)
+    cells = [cell for batch in batches for cell in batch.cells]
+    assert [cell.source for cell in cells] == [str(i) for i in range(20_000)]
+    assert rest.nbformat == 4
+
+
+def test_dump_ipynb() -> None:
+    """Notebooks are written in the same way as by :py:mod:`nbformat`."""
+    from nbformat import from_dict, writes
+
+    nb = read(StringIO(json.dumps(NOTEBOOK)), as_version=4)
+    nb.metadata["language"] = "ü"
+    nb.metadata["empty"] = {}
+    nb.cells[1].outputs.append(
+        {"output_type": "error", "ename": "E", "evalue": "", "traceback": []}
+    )
+    expected = writes(from_dict(copy.deepcopy(nb))) + "\n"
+
+    out = StringIO()
+    dump_ipynb(nb, out)
+    assert out.getvalue() == expected
+    # The notebook is not modified when it is written
+    assert nb.cells[1].source == "x = 1\nx"
+
+
+def test_write_ipynb(tmp_path: Path) -> None:
+    """Notebook files are replaced only once the new file has been written."""
+    path = tmp_path / "test.ipynb"
+    path.write_text("original")
+    path.chmod(0o640)
+
+    nb = read(StringIO(json.dumps(NOTEBOOK)), as_version=4)
+    write_ipynb(nb, path)
+    assert json.loads(path.read_text())["cells"][0]["source"] == ["# Title\n", "Text"]
+    assert path.stat().st_mode & 0o777 == 0o640
+
+    path.write_text("original")
+    nb.metadata["invalid"] = object()
+    with pytest.raises(TypeError):
+        write_ipynb(nb, path)
+    assert path.read_text() == "original"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_dump_ipynb_fragments(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Only cells which have changed since the last save are encoded again."""
+    nb = read(StringIO(json.dumps(NOTEBOOK)), as_version=4)
+    encoded = []
+    encode_cell = nbformat._encode_cell
+    monkeypatch.setattr(
+        nbformat,
+        "_encode_cell",
+        lambda cell, store: encoded.append(cell) or encode_cell(cell, store),
+    )
+    fragments: dict = {}
+
+    def dump() -> str:
+        out = StringIO()
+        dump_ipynb(nb, out, fragments)
+        return out.getvalue()
+
+    dump()
+    assert len(encoded) == 2
+    encoded.clear()
+    dump()
+    assert not encoded
+
+    nb.cells[1].outputs[0]["text"] += "c\n"
+    nb.cells[1].execution_count = True
+    text = dump()
+    assert encoded == [nb.cells[1]]
+    out = StringIO()
+    dump_ipynb(nb, out)
+    assert text == out.getvalue()
+    assert len(fragments) == 2
+
+
+def test_output_store(tmp_path: Path) -> None:
+    """Large output values can be stored outside of notebook files."""
+    html = '<p>"data"</p>\n' * 100
+    nb = read(StringIO(json.dumps(NOTEBOOK)), as_version=4)
+    nb.cells[1].outputs[1].data["text/html"] = html
+    store = OutputStore(tmp_path / OUTPUT_STORE_DIR, 1000)
+    for name in ("a.ipynb", "b.ipynb"):
+        write_ipynb(nb, tmp_path / name, store=store)
+    assert nb.cells[1].outputs[1].data["text/html"] == html
+
+    # Values are stored once, and referenced in the output metadata
+    blobs = list(store.path.iterdir())
+    assert len(blobs) == 1
+    assert blobs[0].read_text() == html
+    output = json.loads((tmp_path / "a.ipynb").read_text())["cells"][1]["outputs"][1]
+    assert output["data"] == {"text/html": [], "application/json": ["a", "b"]}
+    assert output["metadata"] == {
+        "euporie": {"external_data": {"text/html": blobs[0].name}}
+    }
+
+    with (tmp_path / "a.ipynb").open() as f:
+        loaded = read(f, as_version=4)
+    output = loaded.cells[1].outputs[1]
+    assert isinstance(output.data["text/html"], StoredPayload)
+    assert load_payload(output.data["text/html"]) == html
+    assert output.metadata == {}
+
+    # Stored values are re-inlined when saved without a store
+    write_ipynb(loaded, tmp_path / "export.ipynb")
+    with (tmp_path / "export.ipynb").open() as f:
+        assert read(f, as_version=4) == nb
+
+    # References to missing values are kept
+    blobs[0].unlink()
+    with (tmp_path / "a.ipynb").open() as f:
+        loaded = read(f, as_version=4)
+    output = loaded.cells[1].outputs[1]
+    assert output.data["text/html"] == ""
+    assert "external_data" in output.metadata["euporie"]
+
+
+def test_output_store_streams(tmp_path: Path) -> None:
+    """Large stream outputs can be stored outside of notebook files."""
+    log = "progress\n" * 200
+    nb = read(StringIO(json.dumps(NOTEBOOK)), as_version=4)
+    nb.cells[1].outputs[0].text = log
+    store = OutputStore(tmp_path / OUTPUT_STORE_DIR, 1000)
+    write_ipynb(nb, tmp_path / "a.ipynb", store=store)
+    assert nb.cells[1].outputs[0].text == log
+
+    # Stream text is stored, and referenced in the cell metadata
+    [blob] = store.path.iterdir()
+    assert blob.read_text() == log
+    cell = json.loads((tmp_path / "a.ipynb").read_text())["cells"][1]
+    assert cell["outputs"][0] == {"output_type": "stream", "name": "stdout", "text": []}
+    assert cell["metadata"] == {"euporie": {"external_streams": {"0": blob.name}}}
+
+    # Stored text is resolved when the notebook is read
+    with (tmp_path / "a.ipynb").open() as f:
+        loaded = read(f, as_version=4)
+    assert loaded.cells[1].outputs[0].text == log
+    assert loaded.cells[1].metadata == {}
+    with (tmp_path / "a.ipynb").open() as f:
+        *batches, _rest = iter_read(f, as_version=4)
+    assert [cell for batch in batches for cell in batch.cells] == loaded.cells
+
+    # Stored text is re-inlined when saved without a store
+    write_ipynb(loaded, tmp_path / "export.ipynb")
+    cell = json.loads((tmp_path / "export.ipynb").read_text())["cells"][1]
+    assert "".join(cell["outputs"][0]["text"]) == log
+    assert "euporie" not in cell["metadata"]
+
+    # References to missing text are kept
+    blob.unlink()
+    with (tmp_path / "a.ipynb").open() as f:
+        loaded = read(f, as_version=4)
+    assert loaded.cells[1].outputs[0].text == ""
+    assert "external_streams" in loaded.cells[1].metadata["euporie"]
+
+
+def test_text_notebooks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Text-based notebooks are cached when read, and unchanged cells re-used."""
+    pytest.importorskip("jupytext")
+    import jupytext
+
+    monkeypatch.setattr(cache, "_cache_root", lambda: tmp_path / "cache")
+    path = tmp_path / "notebook.py"
+    path.write_text("# %%\nx = 1\n\n\n# %%\ndef f():\n    pass\n\n\n# %%\nf()\n")
+    with path.open() as f:
+        nb = read(f, as_version=4)
+    assert [cell.source for cell in nb.cells] == ["x = 1", "def f():\n    pass", "f()"]
+    assert len(list((tmp_path / "cache" / "jupytext").iterdir())) == 1
+
+    # Unchanged files are loaded from the cache
+    reads = jupytext.reads
+    monkeypatch.setattr(jupytext, "reads", None)
+    with path.open() as f:
+        cached = read(f, as_version=4)
+    assert cached == nb
+    assert type(cached) is type(nb) is NotebookNode
+    assert type(cached.cells[0]) is type(nb.cells[0]) is NotebookNode
+    monkeypatch.setattr(jupytext, "reads", reads)
+
+    # Files written with a cache of converted cells match those written without
+    cell_texts: dict = {}
+    write_text(nb, tmp_path / "a.py")
+    write_text(nb, tmp_path / "b.py", cell_texts)
+    assert cell_texts
+    nb.cells[2].source = "f()\nf()"
+    write_text(nb, tmp_path / "a.py")
+    write_text(nb, tmp_path / "b.py", cell_texts)
+    assert (tmp_path / "a.py").read_text() == (tmp_path / "b.py").read_text()
+    assert "f()\nf()\n" in (tmp_path / "b.py").read_text()
+
+    # Unsupported metadata keys are still reported when cached cells are re-used
+    nb.cells[0].metadata["unsupported key"] = 1
+    for _ in range(2):
+        with pytest.warns(UserWarning, match="unsupported key"):
+            write_text(nb, tmp_path / "b.py", cell_texts)
+
+
+def test_jupytext_version_guard(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The internals of jupytext are only patched for supported versions."""
+    pytest.importorskip("jupytext")
+    import jupytext
+
+    monkeypatch.setattr(jupytext, "__version__", "99.0.0")
+    assert nbformat._cache_jupytext_conversions.__wrapped__() is False
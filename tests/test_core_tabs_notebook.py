@@ -0,0 +1,105 @@
+"""Test the base notebook tab."""
+
+from __future__ import annotations
+
+import json
+import threading
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+from euporie.core.tabs.base import Tab
+from euporie.core.tabs.kernel import KernelTab
+from euporie.core.tabs.notebook import BaseNotebook
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+    from prompt_toolkit.layout.containers import AnyContainer
+
+
+class _Notebook(BaseNotebook):
+    cell = None  # type: ignore [assignment]
+
+    def load_container(self) -> AnyContainer:
+        raise NotImplementedError
+
+
+def _notebook() -> _Notebook:
+    """Create a notebook tab with only the state needed for loading."""
+    nb = _Notebook.__new__(_Notebook)
+    nb.path = None
+    nb.json = {"cells": []}
+    nb.loaded = False
+    nb._really_init_kernel = None
+    nb._load_lock = threading.Lock()
+    return nb
+
+
+def test_kernel_started_after_loading(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Kernels requested while a notebook is loading start once it has loaded."""
+    started: list[bool] = []
+
+    def init_kernel(self: _Notebook, *args: object) -> None:
+        started.append(self.loaded)
+
+    monkeypatch.setattr(KernelTab, "init_kernel", init_kernel)
+
+    nb = _notebook()
+    nb.init_kernel()
+    assert started == []
+    nb.load()
+    assert started == [True]
+    assert nb.json["cells"]
+
+    # Kernels requested after loading start immediately
+    nb.init_kernel()
+    assert started == [True, True]
+
+    # The kernel is started exactly once when the notebook file is read in a thread
+    for _ in range(50):
+        started.clear()
+        nb = _notebook()
+        barrier = threading.Barrier(2)
+
+        def _load(nb: _Notebook = nb, barrier: threading.Barrier = barrier) -> None:
+            barrier.wait()
+            nb.load()
+
+        thread = threading.Thread(target=_load)
+        thread.start()
+        barrier.wait()
+        nb.init_kernel()
+        thread.join()
+        assert started == [True]
+
+
+def test_background_save_writes_snapshot(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Background saves write the notebook as it was when the save started."""
+    monkeypatch.setattr(Tab, "_save", lambda self, path=None, cb=None: None)
+    nb = _notebook()
+    nb.app = SimpleNamespace(  # type: ignore [assignment]
+        config=SimpleNamespace(save_widget_state=False, external_output_size=0)
+    )
+    nb._cell_fragments = {}
+    nb.json = {
+        "nbformat": 4,
+        "nbformat_minor": 5,
+        "metadata": {},
+        "cells": [{"cell_type": "code", "id": "a", "metadata": {}, "source": "1"}],
+    }
+    nb._save()
+
+    # The notebook is changed on the event loop while it is written in a thread
+    nb.json["cells"][0]["metadata"]["new"] = True
+    nb.json["cells"].append({"cell_type": "code", "id": "b", "metadata": {}})
+    path = tmp_path / "test.ipynb"
+    nb.write_file(path)
+    [cell] = json.loads(path.read_text())["cells"]
+    assert cell["metadata"] == {}
+
+    # Saves which are not made in the background write the current notebook
+    nb.write_file(path)
+    assert len(json.loads(path.read_text())["cells"]) == 2
@@ -0,0 +1,264 @@
+"""Test the cell output area widget."""
+
+from __future__ import annotations
+
+import gc
+from typing import TYPE_CHECKING
+
+from prompt_toolkit.application.current import set_app
+from prompt_toolkit.formatted_text.utils import split_lines
+
+from euporie.core.app.dummy import DummyApp
+from euporie.core.convert.datum import Datum
+from euporie.core.tabs.kernel import KernelTab
+from euporie.core.widgets.cell_outputs import (
+    CellOutputArea,
+    CellOutputStreamElement,
+    merge_stream_text,
+)
+
+if TYPE_CHECKING:
+    from weakref import WeakSet
+
+    import pytest
+
+    from euporie.core.widgets.cell_outputs import CellOutput
+
+
+def _stream(text: str, name: str = "stdout") -> dict:
+    return {"output_type": "stream", "name": name, "text": text}
+
+
+def _display(text: str) -> dict:
+    return {"output_type": "display_data", "data": {"text/plain": text}}
+
+
+class _KernelTab:
+    register_display = KernelTab.register_display
+    update_display = KernelTab.update_display
+
+    def __init__(self) -> None:
+        self.displays: dict[str, WeakSet[CellOutput]] = {}
+        self._displays_limit = 64
+        self.dirty = False
+
+
+class _Parent:
+    def __init__(self) -> None:
+        self.kernel_tab = _KernelTab()
+        self.refreshes = 0
+
+    def refresh(self, now: bool = True) -> None:
+        self.refreshes += 1
+
+
+def test_json_setter_appends_new_outputs() -> None:
+    """Existing rendered outputs are kept when new outputs are appended."""
+    with set_app(DummyApp()):
+        first = _display("a")
+        area = CellOutputArea([first], parent=None)
+        rendered = area.rendered_outputs[0]
+        area.json = [first, _display("b")]
+        assert len(area.rendered_outputs) == 2
+        assert area.rendered_outputs[0] is rendered
+
+
+def test_json_setter_reuses_unchanged_outputs() -> None:
+    """Unchanged outputs are re-used when the output area is rebuilt."""
+    with set_app(DummyApp()):
+        area = CellOutputArea([_display("a"), _display("b")], parent=None)
+        kept = area.rendered_outputs[1]
+        # New but equal JSON objects are matched by content
+        area.json = [_display("c"), _display("b")]
+        assert len(area.rendered_outputs) == 2
+        assert area.rendered_outputs[1] is kept
+        assert area.rendered_outputs[0].json["data"]["text/plain"] == "c"
+
+
+def test_json_setter_hash_collisions(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Outputs with colliding content hashes are compared by content."""
+    monkeypatch.setattr(CellOutputArea, "_output_key", lambda self, output_json: 0)
+    with set_app(DummyApp()):
+        area = CellOutputArea([_display("a")], parent=None)
+        area.json = [_display("b")]
+        assert area.rendered_outputs[0].json["data"]["text/plain"] == "b"
+        area.json = [_display("b"), _display("c")]
+        assert [
+            output.json["data"]["text/plain"] for output in area.rendered_outputs
+        ] == [
+            "b",
+            "c",
+        ]
+
+
+def test_json_setter_after_update_display() -> None:
+    """Outputs updated in-place are matched by their new content."""
+    with set_app(DummyApp()):
+        parent = _Parent()
+        output_json = {**_display("0%"), "transient": {"display_id": "progress"}}
+        area = CellOutputArea([output_json], parent=parent)  # type: ignore [arg-type]
+        parent.kernel_tab.update_display(
+            {**_display("50%"), "transient": {"display_id": "progress"}}
+        )
+        output = area.rendered_outputs[0]
+        area.json = [
+            {
+                **_display("50%"),
+                "metadata": {},
+                "transient": {"display_id": "progress"},
+            }
+        ]
+        assert area.rendered_outputs[0] is output
+        area.json = [{**_display("0%"), "transient": {"display_id": "progress"}}]
+        assert area.rendered_outputs[0] is not output
+        assert area.rendered_outputs[0].element.data == "0%"
+
+
+def test_json_setter_duplicate_outputs() -> None:
+    """Identical outputs are all displayed."""
+    with set_app(DummyApp()):
+        area = CellOutputArea([_display("a"), _display("a")], parent=None)
+        assert len(area.rendered_outputs) == 2
+
+
+def test_json_setter_merges_streams() -> None:
+    """Stream outputs with the same name are merged into a single output."""
+    with set_app(DummyApp()):
+        outputs = [_stream("a\n"), _stream("b\n")]
+        area = CellOutputArea(outputs, parent=None)
+        assert len(area.rendered_outputs) == 1
+        assert area.display_json[0]["text"] == "a\nb\n"
+        # The original output JSON is not modified
+        assert outputs[0]["text"] == "a\n"
+        area.json = [_stream("c\n")]
+        assert area.display_json[0]["text"] == "c\n"
+
+
+def test_update_display() -> None:
+    """Outputs are updated in-place by display ID."""
+    with set_app(DummyApp()):
+        parent = _Parent()
+        output_json = {**_display("0%"), "transient": {"display_id": "progress"}}
+        area = CellOutputArea([], parent=parent)  # type: ignore [arg-type]
+        area.add_output(output_json)
+        output = area.rendered_outputs[0]
+        element = output.element
+
+        parent.kernel_tab.update_display(
+            {**_display("50%"), "transient": {"display_id": "progress"}}
+        )
+        assert len(area.rendered_outputs) == 1
+        # The original output JSON and the display are both updated
+        assert output_json["data"] == {"text/plain": "50%"}
+        assert output.element is element
+        assert element.data == "50%"
+        assert parent.refreshes == 1
+        # The notebook is marked as changed so the update is saved
+        assert parent.kernel_tab.dirty
+
+
+def test_update_display_prunes_removed_outputs() -> None:
+    """Display IDs are forgotten once all of their outputs have been removed."""
+    with set_app(DummyApp()):
+        parent = _Parent()
+        kernel_tab = parent.kernel_tab
+        area = CellOutputArea([], parent=parent)  # type: ignore [arg-type]
+        for i in range(64):
+            area.json = [{**_display(""), "transient": {"display_id": str(i)}}]
+        gc.collect()
+        area.json = [{**_display(""), "transient": {"display_id": "64"}}]
+        assert set(kernel_tab.displays) <= {"63", "64"}
+
+        area.json = []
+        gc.collect()
+        kernel_tab.update_display({**_display(""), "transient": {"display_id": "64"}})
+        assert "64" not in kernel_tab.displays
+        assert not kernel_tab.dirty
+
+
+def test_merge_stream_text() -> None:
+    """Text overwritten by carriage returns is removed when streams are merged."""
+    assert merge_stream_text("a\n", "b\n") == "a\nb\n"
+    assert merge_stream_text("a\n 10%", "\r 20%") == "a\n 20%"
+    # A trailing carriage return is kept until more text arrives
+    assert merge_stream_text("a\n 10%", "\r") == "a\n 10%\r"
+    assert merge_stream_text("a\n 10%\r", " 20%\r 30%\n") == "a\n 30%\n"
+    # Graphic attributes set by overwritten text are kept
+    assert merge_stream_text("a\n\x1b[1m 10%", "\r 20%") == "a\n\x1b[1m 20%"
+    # Windows line endings are not collapsed
+    assert merge_stream_text("a\r", "\nb") == "a\r\nb"
+
+
+def test_stream_live_line() -> None:
+    """The final line of a stream is rendered separately from preceding lines."""
+    with set_app(DummyApp()):
+        area = CellOutputArea([_stream("a\nb\n 10%")], parent=None)
+        element = area.rendered_outputs[0].element
+        assert isinstance(element, CellOutputStreamElement)
+        text_datum = element.text.container.datum
+        area.add_output(_stream("\r 20%"))
+        assert area.display_json[0]["text"] == "a\nb\n 20%"
+        # Only the final line is updated
+        assert element.text.container.datum is text_datum
+        assert element.line.data == " 20%"
+
+
+def test_extend_stream() -> None:
+    """Streams extended in-place stay in sync with the displayed outputs."""
+    with set_app(DummyApp()):
+        outputs = [_stream("a\n 10%")]
+        area = CellOutputArea(outputs, parent=None)
+        rendered = area.rendered_outputs[0]
+        area.extend_stream(outputs[-1], "\r 20%")
+        assert area.json == outputs == [_stream("a\n 20%")]
+        assert area.display_json[0]["text"] == "a\n 20%"
+        # The output is matched by its new content
+        area.json = [_stream("a\n 20%")]
+        assert area.rendered_outputs == [rendered]
+
+
+def _render_lines(text: str) -> list[list[tuple[str, str]]]:
+    """Render ANSI text, returning the style of each character on each line."""
+    ft = Datum(text, format="ansi").convert("ft", cols=80)
+    return [
+        [(style, char) for style, frag, *_ in line for char in frag]
+        for line in split_lines(ft)
+    ]
+
+
+def test_stream_live_line_keeps_colours() -> None:
+    """A stream's final line is displayed with colours set by preceding lines."""
+    with set_app(DummyApp()):
+        outputs = [_stream("\x1b[32mLoading\n\x1b[1m 10%")]
+        area = CellOutputArea(outputs, parent=None)
+        element = area.rendered_outputs[0].element
+        assert isinstance(element, CellOutputStreamElement)
+        for text in ("\r 50%", "\r100%\x1b[0m\n\x1b[31mDone\nmore", " output"):
+            area.extend_stream(outputs[-1], text)
+            full = outputs[-1]["text"]
+            assert element.line.data
+            assert _render_lines(element.text.data) + _render_lines(
+                element.line.data
+            ) == _render_lines(full)
+
+
+def test_to_plain_text_renders_virtual_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Deferred rows of large tables are included when outputs are copied."""
+    from euporie.core.ft import html
+
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_ROWS", 20)
+    monkeypatch.setattr(html, "_VIRTUAL_TABLE_SAMPLE_ROWS", 5)
+    table = (
+        "<table>"
+        + "".join(f"<tr><td>row</td><td>x{i}</td></tr>" for i in range(50))
+        + "</table>"
+    )
+    with set_app(DummyApp()):
+        area = CellOutputArea(
+            [{"output_type": "display_data", "data": {"text/html": table}}],
+            parent=None,
+        )
+        text = area.to_plain_text()
+    assert [line.strip() for line in text.splitlines() if line.strip()] == [
+        f"rowx{i}" for i in range(50)
+    ]
@@ -0,0 +1,191 @@
+"""Test saving notebooks in the notebook editor."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+import pytest
+from upath import UPath
+
+from euporie.core.path import UntitledPath
+from euporie.notebook.tabs import _commands, notebook
+from euporie.notebook.tabs.notebook import Notebook
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+
+class _Loop:
+    def __init__(self) -> None:
+        self.scheduled: list[tuple[float, Callable[[], None]]] = []
+
+    def call_soon_threadsafe(self, func: Callable, *args: object) -> None:
+        func(*args)
+
+    def call_later(self, delay: float, func: Callable[[], None]) -> None:
+        self.scheduled.append((delay, func))
+
+    def run(self) -> float:
+        """Run the next scheduled callback, returning its delay."""
+        delay, func = self.scheduled.pop(0)
+        func()
+        return delay
+
+
+class _App:
+    def __init__(self) -> None:
+        self.config = SimpleNamespace(autosave_delay=5.0)
+        self.loop = _Loop()
+        self.tabs: list[Notebook] = []
+        self.dialogs: list[Notebook | None] = []
+        self.dialog_kwargs: list[dict[str, Any]] = []
+
+    def invalidate(self) -> None:
+        pass
+
+    def get_dialog(self, name: str) -> _App:
+        return self
+
+    def show(self, tab: Notebook | None = None, **kwargs: Any) -> None:
+        self.dialogs.append(tab)
+        self.dialog_kwargs.append(kwargs)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def _notebook(
+    monkeypatch: pytest.MonkeyPatch, path: Path | None = None
+) -> tuple[Notebook, _App, _Clock, list[float]]:
+    """Create a notebook tab with only the state needed for automatic saving."""
+    clock = _Clock()
+    monkeypatch.setattr(notebook, "time", clock)
+    app = _App()
+    nb = Notebook.__new__(Notebook)
+    nb.app = app  # type: ignore [assignment]
+    nb.path = Path("notebook.ipynb") if path is None else path
+    nb.saving = False
+    app.tabs.append(nb)
+    saves: list[float] = []
+    nb._save = lambda *args, **kwargs: saves.append(clock.now)  # type: ignore [method-assign]
+    return nb, app, clock, saves
+
+
+def test_autosave_debounced(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Notebooks are saved once they have stopped changing."""
+    nb, app, clock, saves = _notebook(monkeypatch)
+    nb.dirty = True
+    clock.now = 3
+    nb.dirty = True
+    assert len(app.loop.scheduled) == 1
+    clock.now = 5
+    # The notebook changed recently, so the save is put off
+    app.loop.run()
+    assert not saves
+    assert app.loop.scheduled[0][0] == 3
+    clock.now = 8
+    app.loop.run()
+    assert saves == [8]
+    assert not app.loop.scheduled
+
+
+def test_edit_during_save_keeps_dirty(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changes made while a notebook is being saved are not marked as saved."""
+    nb, _app, clock, _saves = _notebook(monkeypatch)
+    nb.dirty = True
+    clock.now = 1
+    nb._save_started = clock.now
+    clock.now = 2
+    nb.dirty = True
+    # The save which started before the change completes
+    nb.dirty = False
+    assert nb.dirty
+    clock.now = 3
+    nb._save_started = clock.now
+    nb.dirty = False
+    assert not nb.dirty
+
+
+def test_autosave_skips_untitled(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Untitled notebooks are not saved automatically."""
+    path = UPath("untitled:/untitled-1.ipynb")
+    assert isinstance(path, UntitledPath)
+    nb, app, clock, saves = _notebook(monkeypatch, path)
+    nb.dirty = True
+    clock.now = 10
+    app.loop.run()
+    assert not saves
+    assert not app.loop.scheduled
+
+
+def test_autosave_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Failed automatic saves are retried later without prompting the user."""
+    nb, app, clock, saves = _notebook(monkeypatch)
+    nb.dirty = True
+    clock.now = 5
+    app.loop.run()
+    assert saves == [5]
+    nb.save_failed()
+    assert not app.dialogs
+    assert nb._autosave_failed
+    assert app.loop.run() == notebook._AUTOSAVE_RETRY_DELAY
+    assert saves == [5, 5]
+    # A successful save clears the failure
+    nb._save_started = clock.now
+    nb.dirty = False
+    assert not nb._autosave_failed
+    # Failed manual saves still prompt the user for a new location
+    nb.save_failed()
+    assert app.dialogs == [nb]
+
+
+def test_save_with_inline_outputs(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Copies of notebooks are saved in the target's format, not over the notebook."""
+    pytest.importorskip("jupytext")
+    path = tmp_path / "notebook.py"
+    path.write_text("# %%\nx = 1\n")
+    nb, app, _clock, _saves = _notebook(monkeypatch, path)
+    nb.json = {
+        "nbformat": 4,
+        "nbformat_minor": 5,
+        "metadata": {},
+        "cells": [{"cell_type": "code", "id": "a", "metadata": {}, "source": "x = 1"}],
+    }
+    app.config.save_widget_state = False
+    app.tab = nb  # type: ignore [attr-defined]
+    tasks: list[Any] = []
+    app.create_background_task = tasks.append  # type: ignore [attr-defined]
+    monkeypatch.setattr(_commands, "get_app", lambda: app)
+
+    # The user is asked where to save the copy if no path is given
+    _commands._save_with_inline_outputs()
+    assert app.dialogs == [nb]
+    save = app.dialog_kwargs[0]["save"]
+
+    # The open notebook is not replaced
+    save(path)
+    assert app.dialogs == [nb, None]
+    assert not tasks
+    assert path.read_text() == "# %%\nx = 1\n"
+
+    # Copies are written in text-based formats with jupytext
+    save(tmp_path / "copy.py")
+    _commands._save_with_inline_outputs(str(tmp_path / "copy.ipynb"))
+    for task in tasks:
+        asyncio.run(task)
+    assert "x = 1" in (tmp_path / "copy.py").read_text()
+    assert "cells" not in (tmp_path / "copy.py").read_text()
+    copy = json.loads((tmp_path / "copy.ipynb").read_text())
+    assert copy["cells"][0]["source"] == ["x = 1"]